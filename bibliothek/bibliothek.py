@@ -19,27 +19,42 @@
 # along with bibliothek.  If not, see <http://www.gnu.org/licenses/>.
 """Bibliothek."""
 
-import json
+import importlib
 import os
+import shlex
 import sys
 
+from typing import Dict, List, Optional, TextIO
+
 os.environ.setdefault("DJANGO_SETTINGS_MODULE", "bibliothek.settings")
 
+
+def get_command(argv: List[str]) -> Optional[str]:
+    """Get the command, the first argument not being an option or its value."""
+    args = iter(argv)
+    for arg in args:
+        if arg == "--format":
+            next(args, None)
+        elif not arg.startswith("-"):
+            return arg
+    return None
+
+
+command = get_command(sys.argv[1:])
+
+# forward the command to the daemon if one is running
+if __name__ == "__main__" and command != "daemon":
+    from bibliothek.daemon import forward
+
+    returncode = forward(sys.argv[1:])
+    if returncode is not None:
+        sys.exit(returncode)
+
 import django  # noqa: E402
 
 django.setup()
 
 import bibliothek.argparse  # noqa: E402
-import bindings.argparse  # noqa: E402
-import books.argparse  # noqa: E402
-import genres.argparse  # noqa: E402
-import journals.argparse  # noqa: E402
-import magazines.argparse  # noqa: E402
-import papers.argparse  # noqa: E402
-import persons.argparse  # noqa: E402
-import publishers.argparse  # noqa: E402
-import series.argparse  # noqa: E402
-import shelves.argparse  # noqa: E402
 
 from argparse import (  # noqa: E402
     ArgumentDefaultsHelpFormatter,
@@ -57,10 +72,24 @@ from bibliothek import (  # noqa: E402
     settings,
     stdout,
 )
-from bibliothek.utils import lookahead  # noqa: E402
-from datetime import date, datetime  # noqa: E402
+from datetime import datetime  # noqa: E402
 from django.utils.translation import gettext_lazy as _  # noqa: E402
-from typing import TextIO  # noqa: E402
+
+# Modules adding the parsers of the commands of the apps.
+COMMANDS = {
+    "info": "bibliothek.argparse",
+    "binding": "bindings.argparse",
+    "book": "books.argparse",
+    "genre": "genres.argparse",
+    "journal": "journals.argparse",
+    "magazine": "magazines.argparse",
+    "paper": "papers.argparse",
+    "person": "persons.argparse",
+    "publisher": "publishers.argparse",
+    "series": "series.argparse",
+    "acquisition": "shelves.argparse",
+    "read": "shelves.argparse",
+}
 
 
 class ArgFormatter(ArgumentDefaultsHelpFormatter, RawTextHelpFormatter):
@@ -71,156 +100,229 @@ class ArgFormatter(ArgumentDefaultsHelpFormatter, RawTextHelpFormatter):
 
 def init():
     """Init."""
-    from django.core.management import execute_from_command_line
+    from bibliothek.db import migrate
 
     if not settings.APP_DATA_DIR.exists():
         settings.APP_DATA_DIR.mkdir(parents=True, exist_ok=True)
-    execute_from_command_line(["", "migrate", "--noinput", "-v0"])
-
-
-def _import(args):
-    from books.models import Book, Edition
-    from magazines.models import Issue, Magazine
-    from papers.models import Paper
-    from shelves.models import Acquisition, Read
-
-    with open(args.path, "r", encoding="utf-8") as f:
-        data = json.loads(f.read())
-
-    for b in data["books"] if "books" in data else []:
-        book, created = Book.from_dict(b)
-
-        for e in b["editions"] if "editions" in b else []:
-            edition, created = Edition.from_dict(e, book)
-
-            for a in e["acquisitions"] if "acquisitions" in e else []:
-                Acquisition.from_dict(a, edition)
-
-            for r in e["reads"] if "reads" in e else []:
-                Read.from_dict(a, edition)
+    migrate()
+
+
+def _export(args: Namespace, file: Optional[TextIO] = None):
+    from bibliothek.exporter import export_json, read_watermark, write_watermark
+    from django.conf import settings
+    from django.utils import timezone
+
+    file = sys.stdout if file is None else file
+
+    def progress(counts: Dict[str, int]):
+        if sys.stderr.isatty():
+            sys.stderr.write(
+                "\r"
+                + _(
+                    "Exported %(books)d books, %(magazines)d magazines and "
+                    + "%(papers)d papers."
+                )
+                % counts
+            )
+
+    watermark_path = settings.APP_DATA_DIR / "export-watermark"
+    since = args.since
+    if since is True:
+        since = read_watermark(watermark_path)
+
+    watermark = timezone.now()
+    export_json(args.PATH, progress, args.chunk_size, since)
+    write_watermark(watermark_path, watermark)
+    if args.PATH is not sys.stdout:
+        args.PATH.close()
+    if sys.stderr.isatty():
+        sys.stderr.write("\n")
+
+
+def _import(args: Namespace, file: Optional[TextIO] = None):
+    from bibliothek.importer import import_json
+
+    file = sys.stdout if file is None else file
+
+    def progress(counts: Dict[str, int]):
+        if sys.stderr.isatty():
+            sys.stderr.write(
+                "\r"
+                + _(
+                    "Imported %(books)d books, %(magazines)d magazines and "
+                    + "%(papers)d papers."
+                )
+                % counts
+            )
+
+    with args.PATH as f:
+        counts = import_json(f, progress, args.chunk_size if args.bulk else None)
+    if sys.stderr.isatty():
+        sys.stderr.write("\n")
+    stdout.write(
+        _(
+            "Successfully imported %(books)d books, %(magazines)d magazines and "
+            + "%(papers)d papers."
+        )
+        % counts,
+        "",
+        file=file,
+    )
 
-    for m in data["magazines"] if "magazines" in data else []:
-        magazine, created = Magazine.from_dict(m)
 
-        for i in b["issues"] if "issues" in m else []:
-            issue, created = Issue.from_dict(i, magazine)
+def _reading_list(args: Namespace, file: Optional[TextIO] = None):
+    from bibliothek.reading import reading_list
 
-            for a in i["acquisitions"] if "acquisitions" in i else []:
-                Acquisition.from_dict(a, issue)
+    file = sys.stdout if file is None else file
 
-            for r in i["reads"] if "reads" in i else []:
-                Read.from_dict(a, issue)
+    types = {
+        "books.edition": "Book",
+        "magazines.issue": "Issue",
+        "papers.paper": "Paper",
+    }
 
-    for p in data["papers"] if "papers" in data else []:
-        paper, created = Paper.from_dict(p)
+    stdout.table_writer(args.format, [0.1, 0.15, 0.85, 1.0], file).write_table(
+        [_("Type"), _("Id"), _("Title"), _("Acquisition")],
+        (
+            [types[label], obj.id, str(obj), acquired if acquired else ""]
+            for label, obj, acquired in reading_list(args.limit or None)
+        ),
+    )
 
-        for a in p["acquisitions"] if "acquisitions" in p else []:
-            Acquisition.from_dict(a, paper)
 
-        for r in p["reads"] if "reads" in p else []:
-            Read.from_dict(a, paper)
+def _statistics(args: Namespace, file: Optional[TextIO] = None):
+    from bibliothek.statistics import statistics
 
+    file = sys.stdout if file is None else file
 
-def _reading_list(args: Namespace, file: TextIO = sys.stdout):
-    from books.models import Edition
-    from magazines.models import Issue
-    from papers.models import Paper
-    from shelves.models import Acquisition
+    year = args.year if args.year else datetime.now().year
+    stats = statistics(year)
 
-    reading_list = list()
-    for acquisition in Acquisition.objects.all():
-        if acquisition.content_object.reads.count() == 0:
-            reading_list.append((acquisition.content_object, acquisition.date))
-    reading_list = sorted(set(reading_list), key=lambda x: x[1] if x[1] else date.min)
-    if args.limit:
-        reading_list = reading_list[: args.limit]
+    positions = [0.50, 0.66, 0.82, 1.0]
+    stdout.write(
+        [_("Type"), _("Count"), _("Read"), _("Read %(year)d" % {"year": year})],
+        "=",
+        positions,
+        file=file,
+    )
+    for label, name in [
+        ("books.book", _("Books")),
+        ("books.edition", _("Editions")),
+        ("magazines.magazine", _("Magazines")),
+        ("magazines.issue", _("Issues")),
+        ("papers.paper", _("Papers")),
+    ]:
+        stdout.write([name, *stats["totals"][label]], positions=positions, file=file)
 
-    positions = [0.1, 0.15, 0.85, 1.0]
     stdout.write(
-        [_("Type"), _("Id"), _("Title"), _("Acquisition")],
+        [_("Year"), _("Editions read"), _("Issues read"), _("Papers read")],
         "=",
         positions,
         file=file,
     )
+    for y, counts in stats["years"].items():
+        stdout.write(
+            [
+                y,
+                counts["books.edition"],
+                counts["magazines.issue"],
+                counts["papers.paper"],
+            ],
+            positions=positions,
+            file=file,
+        )
+
+    positions = [0.50, 0.75, 1.0]
+    stdout.write([_("Genre"), _("Books"), _("Read")], "=", positions, file=file)
+    for row in stats["genres"]:
+        stdout.write(list(row), positions=positions, file=file)
 
-    for item, has_next in lookahead(reading_list):
-        stype = ""
-        if isinstance(item[0], Paper):
-            stype = "Paper"
-        elif isinstance(item[0], Edition):
-            stype = "Book"
-        elif isinstance(item[0], Issue):
-            stype = "Issue"
+    stdout.write(
+        [_("Language"), _("Editions and papers"), _("Read")], "=", positions, file=file
+    )
+    for row in stats["languages"]:
+        stdout.write(list(row), positions=positions, file=file)
+
+    stdout.write([_("Year"), _("Acquisitions"), _("Spent")], "=", positions, file=file)
+    for y, count, price in stats["spending"]:
         stdout.write(
-            [stype, item[0].id, str(item[0]), item[1] if item[1] else ""],
-            "_" if has_next else "=",
-            positions,
+            [y if y else _("Unknown"), count, f"{price:.2f}"],
+            positions=positions,
             file=file,
         )
 
 
-def _statistics(args: Namespace, file: TextIO = sys.stdout):
-    positions = [0.50, 0.66, 0.82, 1.0]
+def _daemon(args: Namespace, file: Optional[TextIO] = None):
+    import signal
 
-    from books.models import Book, Edition
-    from magazines.models import Magazine, Issue
-    from papers.models import Paper
+    from bibliothek import daemon
 
-    stdout.write(
-        [
-            _("Type"),
-            _("Count"),
-            _("Read"),
-            _("Read %(year)d" % {"year": datetime.now().year}),
-        ],
-        "=",
-        positions,
-        file=file,
-    )
-    stdout.write(
-        [
-            _("Books"),
-            Book.objects.count(),
-            Book.objects.filter(editions__reads__isnull=False).count(),
-            Book.objects.filter(
-                editions__reads__finished__year=datetime.now().year
-            ).count(),
-        ],
-        positions=positions,
-        file=file,
-    )
-    stdout.write(
-        [
-            _("Editions"),
-            Edition.objects.count(),
-            Edition.objects.filter(reads__isnull=False).count(),
-            Edition.objects.filter(reads__finished__year=datetime.now().year).count(),
-        ],
-        positions=positions,
-        file=file,
-    )
+    file = sys.stdout if file is None else file
 
-    stdout.write(
-        [_("Magazines"), Magazine.objects.count(), 0, 0], positions=positions, file=file
-    )
-    stdout.write(
-        [_("Issues"), Issue.objects.count(), 0, 0], positions=positions, file=file
+    if args.stop:
+        if not daemon.stop():
+            stdout.write(_("No daemon is running."), "", file=file)
+        return
+
+    # stop cleanly on SIGTERM, removing the socket
+    signal.signal(signal.SIGTERM, lambda signum, frame: sys.exit(0))
+    try:
+        daemon.serve(main)
+    except KeyboardInterrupt:
+        pass
+
+
+def _batch(args: Namespace, file: Optional[TextIO] = None):
+    from bibliothek.batch import run
+
+    file = sys.stdout if file is None else file
+
+    def progress(count: int):
+        if sys.stderr.isatty():
+            sys.stderr.write("\r" + _("Ran %(count)d commands.") % {"count": count})
+
+    with args.PATH as f:
+        results = run(
+            create_parser(),
+            f,
+            args.chunk_size,
+            file if args.verbose else None,
+            ["batch", "daemon"],
+            progress,
+        )
+    if sys.stderr.isatty():
+        sys.stderr.write("\n")
+
+    stdout.TableWriter([0.07, 0.6, 1.0], file=file).write_table(
+        [_("Line"), _("Command"), _("Result")],
+        (
+            [
+                line,
+                " ".join([shlex.quote(a) for a in argv]),
+                error if error else _("OK"),
+            ]
+            for line, argv, error in results
+        ),
     )
+
+    failed = len([error for line, argv, error in results if error])
     stdout.write(
-        [
-            _("Papers"),
-            Paper.objects.count(),
-            Paper.objects.filter(reads__isnull=False).count(),
-            Paper.objects.filter(reads__finished__year=datetime.now().year).count(),
-        ],
-        positions=positions,
+        _("Successfully ran %(ok)d of %(count)d commands.")
+        % {"ok": len(results) - failed, "count": len(results)},
+        "",
         file=file,
     )
+    if failed:
+        sys.exit(1)
 
 
-if __name__ == "__main__":
-    init()
+def create_parser(command: Optional[str] = None) -> ArgumentParser:
+    """Create the parser for the command line arguments.
 
+    Args:
+        * command: if given only the parsers of the module with this command are
+          added from the apps
+    """
     parser = ArgumentParser(prog=__app_name__, formatter_class=ArgFormatter)
     parser.add_argument(
         "-V",
@@ -241,40 +343,50 @@ if __name__ == "__main__":
         },
     )
 
-    subparser = parser.add_subparsers(dest="subparser", metavar="COMMAND")
-
-    # create the parser for the "info" subcommand
-    bibliothek.argparse.add_subparser(subparser)
-
-    # create the parser for the "binding" subcommand
-    bindings.argparse.add_subparser(subparser)
-
-    # create the parser for the "book" subcommand
-    books.argparse.add_subparser(subparser)
-
-    # create the parser for the "genre" subcommand
-    genres.argparse.add_subparser(subparser)
-
-    # create the parser for the "journal" subcommand
-    journals.argparse.add_subparser(subparser)
-
-    # create the parser for the "magazine" subcommand
-    magazines.argparse.add_subparser(subparser)
-
-    # create the parser for the "paper" subcommand
-    papers.argparse.add_subparser(subparser)
-
-    # create the parser for the "person" subcommand
-    persons.argparse.add_subparser(subparser)
-
-    # create the parser for the "publisher" subcommand
-    publishers.argparse.add_subparser(subparser)
+    parser.add_argument(
+        "--format",
+        choices=stdout.FORMATS,
+        default="table",
+        help=_("output format of the list commands"),
+    )
 
-    # create the parser for the "series" subcommand
-    series.argparse.add_subparser(subparser)
+    subparser = parser.add_subparsers(dest="subparser", metavar="COMMAND")
 
-    # create the parser for the "acquisition" and "read" subcommand
-    shelves.argparse.add_subparser(subparser)
+    # create the parsers for the commands of the apps, if a command is given only
+    # its module is imported, otherwise all are needed to list the commands
+    if command in COMMANDS:
+        modules = [COMMANDS[command]]
+    else:
+        modules = list(dict.fromkeys(COMMANDS.values()))
+    for module in modules:
+        importlib.import_module(module).add_subparser(subparser)
+
+    # create the parser for the "export" subcommand
+    export_parser = subparser.add_parser("export", help=_("export data to JSON"))
+    export_parser.set_defaults(func=_export)
+    export_parser.add_argument(
+        "PATH",
+        nargs="?",
+        type=FileType("w", encoding="utf8"),
+        default=sys.stdout,
+        help=_("JSON file to export to"),
+    )
+    export_parser.add_argument(
+        "--chunk-size",
+        type=int,
+        default=1000,
+        help=_("number of objects fetched from the database at once"),
+    )
+    export_parser.add_argument(
+        "--since",
+        nargs="?",
+        type=bibliothek.argparse.valid_datetime,
+        const=True,
+        help=_(
+            "only export changes and deletions after this timestamp, without a "
+            + "timestamp since the last export"
+        ),
+    )
 
     # create the parser for the "import" subcommand
     import_parser = subparser.add_parser("import", help=_("import data from JSON"))
@@ -282,9 +394,16 @@ if __name__ == "__main__":
     import_parser.add_argument(
         "PATH",
         type=FileType("r", encoding="utf8"),
-        default=sys.stdout,
         help=_("JSON file to import from"),
     )
+    import_parser.add_argument(
+        "--bulk",
+        action="store_true",
+        help=_("import in chunks with batched writes, one transaction per chunk"),
+    )
+    import_parser.add_argument(
+        "--chunk-size", type=int, default=1000, help=_("chunk size for bulk import")
+    )
 
     # create the parser for the "reading-list" subcommand
     reading_list_parser = subparser.add_parser(
@@ -298,9 +417,75 @@ if __name__ == "__main__":
     # create the parser for the "statistics" subcommand
     statistics_parser = subparser.add_parser("statistics", help=_("show statistics"))
     statistics_parser.set_defaults(func=_statistics)
+    statistics_parser.add_argument(
+        "--year", type=int, help=_("year of the reads, default the current year")
+    )
+
+    # create the parser for the "daemon" subcommand
+    daemon_parser = subparser.add_parser(
+        "daemon",
+        help=_(
+            "run commands in a background process keeping Django set up, other "
+            + "invocations forward their command to it while it is running"
+        ),
+    )
+    daemon_parser.set_defaults(func=_daemon)
+    daemon_parser.add_argument(
+        "--stop", action="store_true", help=_("stop the running daemon")
+    )
 
-    args = parser.parse_args()
+    # create the parser for the "batch" subcommand
+    batch_parser = subparser.add_parser(
+        "batch",
+        help=_(
+            "run commands read from a file, one per line, either shell quoted or "
+            + "as JSON array"
+        ),
+    )
+    batch_parser.set_defaults(func=_batch)
+    batch_parser.add_argument(
+        "PATH",
+        type=FileType("r", encoding="utf8"),
+        help=_("file to read the commands from, - for stdin"),
+    )
+    batch_parser.add_argument(
+        "--chunk-size",
+        type=int,
+        default=1000,
+        help=_("number of commands run in one transaction"),
+    )
+    batch_parser.add_argument(
+        "-v",
+        "--verbose",
+        action="store_true",
+        help=_("show the output of the commands"),
+    )
+
+    return parser
+
+
+def main(argv: List[str], file: Optional[TextIO] = None):
+    """Parse the command line arguments and run the command.
+
+    Args:
+        * argv: command line arguments
+        * file: file to write to, default sys.stdout
+    """
+    file = sys.stdout if file is None else file
+    parser = create_parser(get_command(argv))
+    args = parser.parse_args(argv)
     if args.subparser:
-        args.func(args)
+        args.func(args, file)
     else:
-        parser.print_usage()
+        parser.print_usage(file)
+
+
+if __name__ == "__main__":
+    init()
+    try:
+        main(sys.argv[1:])
+        sys.stdout.flush()
+    except BrokenPipeError:
+        # the reader, e.g. head, closed the pipe, silence the flush at exit
+        os.dup2(os.open(os.devnull, os.O_WRONLY), sys.stdout.fileno())
+        sys.exit(1)
@@ -29,3 +29,7 @@ class BibliothekConfig(AppConfig):
     name = "bibliothek"
     verbose_name = _("Library")
     verbose_name_plural = _("Libraries")
+
+    def ready(self):
+        """Ready."""
+        from . import signals  # noqa: F401
@@ -21,30 +21,22 @@
 import sys
 
 from argparse import _SubParsersAction, ArgumentTypeError, Namespace
-from bibliothek import stdout
-from books.models import Edition
+from bibliothek import lookup, stdout
 from datetime import datetime, date
 from django.utils.translation import gettext_lazy as _
-from magazines.models import Issue
-from papers.models import Paper
 from typing import Optional, TextIO
 
 
-def _info(args: Namespace, file: TextIO = sys.stdout):
-    edition = Edition.get(args.obj)
-    paper = Paper.get(args.obj)
-    issue = Issue.get(args.obj)
+def _info(args: Namespace, file: Optional[TextIO] = None):
+    file = sys.stdout if file is None else file
+    objs = lookup.resolve(args.obj)
 
-    if edition is None and paper is None and issue is None:
+    if len(objs) == 0:
         return
-    elif edition is not None and paper is None and issue is None:
-        edition.print(file)
-    elif edition is None and paper is not None and issue is None:
-        paper.print(file)
-    elif edition is None and paper is None and issue is not None:
-        issue.print(file)
+    elif len(objs) == 1:
+        objs[0].print(file)
     else:
-        stdout.write(["More than one found."], after="=")
+        stdout.write(["More than one found."], after="=", file=file)
 
 
 def add_subparser(parser: _SubParsersAction):
@@ -62,3 +54,11 @@ def valid_date(s: str) -> Optional[date]:
         return datetime.strptime(s, "%Y-%m-%d").date()
     except ValueError:
         raise ArgumentTypeError(f'Not a valid date: "{s}".')
+
+
+def valid_datetime(s: str) -> datetime:
+    """Argparse validation for datetime.datetime."""
+    try:
+        return datetime.fromisoformat(s)
+    except ValueError:
+        raise ArgumentTypeError(f'Not a valid timestamp: "{s}".')
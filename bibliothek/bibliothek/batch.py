@@ -0,0 +1,138 @@
+# -*- coding: utf-8 -*-
+# vim: ft=python fileencoding=utf-8 sts=4 sw=4 et:
+# Copyright (C) 2016-2022 J. Nathanael Philipp (jnphilipp) <nathanael@philipp.land>
+#
+# This file is part of bibliothek.
+#
+# bibliothek is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# bibliothek is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with bibliothek.  If not, see <http://www.gnu.org/licenses/>.
+"""Bibliothek Django app batch.
+
+Runs many commands in one process. The commands are read one per line, either
+as they would be typed in a shell or as JSON arrays of the arguments, and are
+parsed with the same parser as the CLI. The commands are run in chunks, each
+chunk in a single transaction, and each command in a savepoint, so a failing
+command does not undo the others.
+"""
+
+import json
+import shlex
+
+from argparse import ArgumentParser
+from contextlib import redirect_stderr, redirect_stdout
+from django.db import transaction
+from io import StringIO
+from itertools import islice
+from typing import (
+    Callable,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Sequence,
+    TextIO,
+    Tuple,
+)
+
+
+def parse(line: str) -> Optional[List[str]]:
+    """Parse a line into the arguments of a command.
+
+    Returns None for empty lines and comments.
+    """
+    if line.lstrip().startswith("["):
+        argv = json.loads(line)
+        if not isinstance(argv, list) or not all(isinstance(a, str) for a in argv):
+            raise ValueError("Not a JSON array of strings.")
+        return argv
+    argv = shlex.split(line, comments=True)
+    return argv if argv else None
+
+
+def run(
+    parser: ArgumentParser,
+    lines: Iterable[str],
+    chunk_size: int = 1000,
+    file: Optional[TextIO] = None,
+    exclude: Sequence[str] = (),
+    progress: Optional[Callable[[int], None]] = None,
+) -> List[Tuple[int, List[str], Optional[str]]]:
+    """Run the commands.
+
+    Returns for each command the line number, the arguments and the error message
+    if it failed.
+
+    Args:
+        * parser: parser for the arguments
+        * lines: commands, one per line
+        * chunk_size: number of commands per transaction
+        * file: file the commands write to, if None their output is discarded
+        * exclude: commands not allowed in a batch
+        * progress: called after each chunk with the number of commands run
+    """
+    assert chunk_size > 0
+
+    results: List[Tuple[int, List[str], Optional[str]]] = []
+    commands = _commands(lines)
+    while True:
+        chunk = list(islice(commands, chunk_size))
+        if not chunk:
+            break
+        with transaction.atomic():
+            for i, argv, error in chunk:
+                if error is None:
+                    error = _run(parser, argv, file, exclude)
+                results.append((i, argv, error))
+        if progress is not None:
+            progress(len(results))
+    return results
+
+
+def _commands(lines: Iterable[str]) -> Iterator[Tuple[int, List[str], Optional[str]]]:
+    for i, line in enumerate(lines, start=1):
+        try:
+            argv = parse(line)
+        except ValueError as e:
+            yield i, [], str(e)
+            continue
+        if argv is not None:
+            yield i, argv, None
+
+
+def _run(
+    parser: ArgumentParser,
+    argv: List[str],
+    file: Optional[TextIO],
+    exclude: Sequence[str],
+) -> Optional[str]:
+    out = StringIO() if file is None else file
+    err = StringIO()
+    with redirect_stdout(out), redirect_stderr(err):
+        try:
+            args = parser.parse_args(argv)
+        except SystemExit as e:
+            if e.code:
+                lines = err.getvalue().strip().splitlines()
+                return lines[-1].split("error: ", 1)[-1] if lines else str(e.code)
+            return None
+        if not args.subparser:
+            return "No command given."
+        elif args.subparser in exclude:
+            return f'Command "{args.subparser}" is not allowed in a batch.'
+
+        try:
+            with transaction.atomic():
+                args.func(args, out)
+        except Exception as e:
+            return str(e) or type(e).__name__
+    return None
@@ -0,0 +1,259 @@
+# -*- coding: utf-8 -*-
+# vim: ft=python fileencoding=utf-8 sts=4 sw=4 et:
+# Copyright (C) 2016-2022 J. Nathanael Philipp (jnphilipp) <nathanael@philipp.land>
+#
+# This file is part of bibliothek.
+#
+# bibliothek is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# bibliothek is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with bibliothek.  If not, see <http://www.gnu.org/licenses/>.
+"""Bibliothek Django app daemon.
+
+Every invocation of the CLI sets up Django and connects to the DB before it does
+anything. The daemon does this once and then runs the commands sent to it over a
+Unix socket in `APP_CACHE_DIR`. The client only forwards argv and the working
+directory and writes out what the daemon sends back, so it does not need Django.
+
+Messages from the daemon are frames of one byte for the channel, `o` stdout, `e`
+stderr or `x` exit code, four bytes for the length of the data and the data.
+Commands reading from stdin, i. e. `-` as path, are not forwarded but run by the
+client itself.
+
+Caches of the daemon process, like whether the full-text index exists, are reset
+when another process changed the DB, e. g. migrated it.
+"""
+
+import json
+import io
+import os
+import socket
+import struct
+import sys
+import traceback
+
+from bibliothek import settings
+from contextlib import redirect_stderr, redirect_stdout
+from pathlib import Path
+from typing import Any, BinaryIO, Callable, List, Optional, TextIO
+
+_db_version: Any = None
+
+
+def socket_path() -> Path:
+    """Path of the socket the daemon listens on."""
+    return settings.APP_CACHE_DIR / "daemon.sock"
+
+
+def forward(
+    argv: List[str],
+    path: Optional[Path] = None,
+    stdout: Optional[BinaryIO] = None,
+    stderr: Optional[BinaryIO] = None,
+) -> Optional[int]:
+    """Run a command in the daemon.
+
+    Commands reading from stdin, i. e. with `-` as an argument, are not forwarded,
+    as the daemon would read its own stdin.
+
+    Returns the exit code of the command, None if no daemon is running or the
+    command was not forwarded.
+
+    Args:
+        * argv: command line arguments
+        * path: socket path, default `socket_path()`
+        * stdout: file to write the output to, default sys.stdout
+        * stderr: file to write the errors to, default sys.stderr
+    """
+    if "-" in argv:
+        return None
+    sock = _connect(path or socket_path())
+    if sock is None:
+        return None
+
+    stdout = stdout or sys.stdout.buffer
+    stderr = stderr or sys.stderr.buffer
+    with sock, sock.makefile("rb") as f:
+        sock.sendall(
+            json.dumps({"argv": argv, "cwd": os.getcwd()}).encode("utf8") + b"\n"
+        )
+        while True:
+            header = f.read(5)
+            if len(header) < 5:
+                break
+            channel, length = struct.unpack(">cI", header)
+            data = f.read(length)
+            if channel == b"o":
+                stdout.write(data)
+                stdout.flush()
+            elif channel == b"e":
+                stderr.write(data)
+                stderr.flush()
+            elif channel == b"x":
+                return int(data)
+    stderr.write(b"Lost connection to the daemon.\n")
+    return 1
+
+
+def serve(
+    main: Callable[[List[str], TextIO], None],
+    path: Optional[Path] = None,
+):
+    """Run commands sent by clients until stopped.
+
+    Args:
+        * main: function parsing and running a command, gets argv and the file to
+          write to
+        * path: socket path, default `socket_path()`
+    """
+    path = path or socket_path()
+    if path.exists():
+        sock = _connect(path)
+        if sock is not None:
+            sock.close()
+            raise RuntimeError(f"A daemon is already listening on {path}.")
+        path.unlink()
+    path.parent.mkdir(parents=True, exist_ok=True)
+
+    server = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    umask = os.umask(0o077)
+    try:
+        server.bind(str(path))
+    finally:
+        os.umask(umask)
+    server.listen()
+    try:
+        while True:
+            conn, _ = server.accept()
+            with conn:
+                if not handle(conn, main):
+                    break
+    finally:
+        server.close()
+        if path.exists():
+            path.unlink()
+
+
+def stop(path: Optional[Path] = None) -> bool:
+    """Stop the daemon, returns False if none is running.
+
+    Args:
+        * path: socket path, default `socket_path()`
+    """
+    sock = _connect(path or socket_path())
+    if sock is None:
+        return False
+    with sock, sock.makefile("rb") as f:
+        sock.sendall(json.dumps({"stop": True}).encode("utf8") + b"\n")
+        f.read()
+    return True
+
+
+def handle(conn: socket.socket, main: Callable[[List[str], TextIO], None]) -> bool:
+    """Handle a single request, returns False if the daemon should stop.
+
+    Args:
+        * conn: connection to the client
+        * main: function parsing and running a command, gets argv and the file to
+          write to
+    """
+    with conn.makefile("rb") as f:
+        line = f.readline()
+    if not line:
+        return True
+    request = json.loads(line)
+    if request.get("stop"):
+        _send(conn, b"x", b"0")
+        return False
+
+    out = _Channel(conn, b"o", 8192)
+    err = _Channel(conn, b"e")
+    code = 0
+    cwd = os.getcwd()
+    try:
+        os.chdir(request["cwd"])
+        with redirect_stdout(out), redirect_stderr(err):
+            try:
+                _reset_caches()
+                main(request["argv"], out)
+            except SystemExit as e:
+                if isinstance(e.code, int) or e.code is None:
+                    code = e.code or 0
+                else:
+                    err.write(f"{e.code}\n")
+                    code = 1
+            except Exception:
+                traceback.print_exc()
+                code = 1
+        out.flush()
+        err.flush()
+        _send(conn, b"x", str(code).encode("utf8"))
+    except OSError:
+        # the client went away
+        pass
+    finally:
+        os.chdir(cwd)
+    return True
+
+
+def _reset_caches():
+    """Reset the caches of the process if another process changed the DB."""
+    global _db_version
+
+    from bibliothek import db, fts, statistics
+
+    version = (db.data_version(), db.stored_fingerprint())
+    if version != _db_version:
+        fts.clear_cache()
+        statistics.clear_cache()
+        _db_version = version
+
+
+class _Channel(io.TextIOBase):
+    """Text file sending what is written to it as frames over the connection."""
+
+    def __init__(self, conn: socket.socket, channel: bytes, size: int = 0):
+        self.conn = conn
+        self.channel = channel
+        self.size = size
+        self.chunks: List[str] = []
+        self.length = 0
+
+    def flush(self):
+        if self.chunks:
+            data = "".join(self.chunks).encode("utf8")
+            self.chunks = []
+            self.length = 0
+            _send(self.conn, self.channel, data)
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, s: str) -> int:
+        self.chunks.append(s)
+        self.length += len(s)
+        if self.length >= self.size:
+            self.flush()
+        return len(s)
+
+
+def _connect(path: Path) -> Optional[socket.socket]:
+    sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        sock.connect(str(path))
+    except OSError:
+        sock.close()
+        return None
+    return sock
+
+
+def _send(conn: socket.socket, channel: bytes, data: bytes):
+    conn.sendall(struct.pack(">cI", channel, len(data)) + data)
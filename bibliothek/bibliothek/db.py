@@ -0,0 +1,98 @@
+# -*- coding: utf-8 -*-
+# vim: ft=python fileencoding=utf-8 sts=4 sw=4 et:
+# Copyright (C) 2016-2022 J. Nathanael Philipp (jnphilipp) <nathanael@philipp.land>
+#
+# This file is part of bibliothek.
+#
+# bibliothek is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# bibliothek is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with bibliothek.  If not, see <http://www.gnu.org/licenses/>.
+"""Bibliothek Django app DB setup.
+
+Running `migrate` loads the migration graph and inspects the schema, which costs
+more than most commands. A fingerprint of the migrations is therefore stored in
+the DB, in SQLite's `user_version`, and `migrate` only runs if it changed.
+"""
+
+import hashlib
+import os
+
+from django.apps import apps
+from django.core.management import call_command
+from django.db import connection
+from pathlib import Path
+from typing import Optional, Tuple
+
+
+def data_version() -> Optional[Tuple[int, int]]:
+    """Data version of the DB connection, None if not supported by the DB.
+
+    Changes when another connection commits to the DB. The version is only
+    comparable within one connection, hence the id of the connection is included.
+    """
+    if connection.vendor != "sqlite":
+        return None
+    connection.ensure_connection()
+    with connection.cursor() as cursor:
+        cursor.execute("PRAGMA data_version")
+        return id(connection.connection), cursor.fetchone()[0]
+
+
+def fingerprint() -> int:
+    """Fingerprint of the migrations of all installed apps.
+
+    Only the names of the migration files are used, so that computing it only
+    takes a directory listing per app.
+    """
+    h = hashlib.sha1()
+    for app_config in apps.get_app_configs():
+        path = Path(app_config.path) / "migrations"
+        if not path.is_dir():
+            continue
+        names = sorted(
+            [
+                entry.name
+                for entry in os.scandir(path)
+                if entry.name.endswith(".py") and entry.name != "__init__.py"
+            ]
+        )
+        h.update(f"{app_config.label}:{','.join(names)}\n".encode("utf8"))
+    # user_version is a signed 32-bit integer and 0 is the default of a new DB.
+    return int(h.hexdigest()[:7], 16) or 1
+
+
+def migrate(force: bool = False) -> bool:
+    """Migrate the DB if the migrations changed since the last migration.
+
+    Returns True if the DB was migrated.
+
+    Args:
+        * force: migrate even if the fingerprint is unchanged
+    """
+    version = fingerprint()
+    if not force and stored_fingerprint() == version:
+        return False
+
+    call_command("migrate", interactive=False, verbosity=0)
+    if connection.vendor == "sqlite":
+        with connection.cursor() as cursor:
+            cursor.execute(f"PRAGMA user_version = {version:d}")
+    return True
+
+
+def stored_fingerprint() -> Optional[int]:
+    """Fingerprint stored at the last migration, None if not supported by the DB."""
+    if connection.vendor != "sqlite":
+        return None
+    with connection.cursor() as cursor:
+        cursor.execute("PRAGMA user_version")
+        return cursor.fetchone()[0]
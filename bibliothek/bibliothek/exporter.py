@@ -0,0 +1,249 @@
+# -*- coding: utf-8 -*-
+# vim: ft=python fileencoding=utf-8 sts=4 sw=4 et:
+# Copyright (C) 2016-2022 J. Nathanael Philipp (jnphilipp) <nathanael@philipp.land>
+#
+# This file is part of bibliothek.
+#
+# bibliothek is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# bibliothek is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with bibliothek.  If not, see <http://www.gnu.org/licenses/>.
+"""Bibliothek Django app exporter."""
+
+import json
+
+from bibliothek.models import Tombstone
+from bibliothek.pagination import iterate
+from books.models import Book, Edition
+from datetime import datetime
+from django.contrib.contenttypes.models import ContentType
+from django.db import models
+from django.db.models import Prefetch, Q
+from django.utils import timezone
+from magazines.models import Issue, Magazine
+from papers.models import Paper
+from pathlib import Path
+from shelves.models import Acquisition, Read
+from typing import Callable, Dict, Iterable, Optional, TextIO, Type
+
+BOOK_PREFETCHES = [
+    "authors__links",
+    "genres",
+    "links",
+    "series__links",
+    Prefetch(
+        "editions", queryset=Edition.objects.select_related("binding", "publisher")
+    ),
+    "editions__publisher__links",
+    "editions__languages",
+    "editions__links",
+    "editions__persons__links",
+    "editions__files",
+    "editions__acquisitions",
+    "editions__reads",
+]
+MAGAZINE_PREFETCHES = [
+    "links",
+    Prefetch("issues", queryset=Issue.objects.order_by("pk")),
+    "issues__languages",
+    "issues__links",
+    "issues__files",
+    "issues__acquisitions",
+    "issues__reads",
+]
+PAPER_PREFETCHES = [
+    "authors__links",
+    "journal__links",
+    "languages",
+    "files",
+    "links",
+    "acquisitions",
+    "reads",
+    "publisher__links",
+    "series__links",
+    "proceedings__editors__links",
+    "proceedings__languages",
+    "proceedings__files",
+    "proceedings__links",
+    "proceedings__acquisitions",
+    "proceedings__reads",
+    "proceedings__publisher__links",
+    "proceedings__series__links",
+]
+
+
+def books() -> models.query.QuerySet[Book]:
+    """Books in export order, `to_dict` also needs `BOOK_PREFETCHES`."""
+    return Book.objects.select_related("series").order_by("pk")
+
+
+def magazines() -> models.query.QuerySet[Magazine]:
+    """Magazines in export order, `to_dict` also needs `MAGAZINE_PREFETCHES`."""
+    return Magazine.objects.select_related("feed").order_by("pk")
+
+
+def papers() -> models.query.QuerySet[Paper]:
+    """Papers in export order, `to_dict` also needs `PAPER_PREFETCHES`."""
+    return Paper.objects.select_related(
+        "journal",
+        "proceedings__publisher",
+        "proceedings__series",
+        "publisher",
+        "series",
+    ).order_by("pk")
+
+
+def changed(model: Type[models.Model], since: datetime) -> Q:
+    """Filter for objects changed after `since`.
+
+    Objects count as changed if they were updated or one of their acquisitions
+    or reads was added or updated.
+    """
+    content_type = ContentType.objects.get_for_model(model)
+    return (
+        Q(updated_at__gt=since)
+        | Q(
+            pk__in=Acquisition.objects.filter(
+                content_type=content_type, updated_at__gt=since
+            ).values("object_id")
+        )
+        | Q(
+            pk__in=Read.objects.filter(
+                content_type=content_type, updated_at__gt=since
+            ).values("object_id")
+        )
+    )
+
+
+def read_watermark(path: Path) -> Optional[datetime]:
+    """Read the watermark of the last export, None if there was none."""
+    if not path.exists():
+        return None
+    return datetime.fromisoformat(path.read_text(encoding="utf8").strip())
+
+
+def write_watermark(path: Path, watermark: datetime):
+    """Store the watermark of an export."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(f"{watermark.isoformat()}\n", encoding="utf8")
+
+
+def book_to_dict(book: Book) -> Dict:
+    """Convert book with its editions to dict."""
+    data = book.to_dict()
+    data["editions"] = [edition.to_dict() for edition in book.editions.all()]
+    return data
+
+
+def magazine_to_dict(magazine: Magazine) -> Dict:
+    """Convert magazine with its issues to dict."""
+    data = magazine.to_dict()
+    data["issues"] = [issue.to_dict() for issue in magazine.issues.all()]
+    return data
+
+
+def export_json(
+    fp: TextIO,
+    progress: Optional[Callable[[Dict[str, int]], None]] = None,
+    chunk_size: int = 1000,
+    since: Optional[datetime] = None,
+) -> Dict[str, int]:
+    """Export books, magazines and papers to a JSON file.
+
+    The objects are streamed from the DB in chunks with their relations prefetched,
+    so the number of queries only depends on the number of chunks. The written file
+    can be imported again with `import_json`.
+
+    If `since` is given only books, magazines and papers changed after it are
+    exported, a book also counts as changed if one of its editions changed and a
+    magazine if one of its issues changed. Objects deleted after `since` are
+    listed under `deleted`.
+
+    Args:
+        * fp: file to write to
+        * progress: called with the number of exported objects after each export
+        * chunk_size: number of objects fetched from the DB at once
+        * since: only export changes after this timestamp
+
+    Returns the number of exported books, magazines and papers and, for a delta
+    export, the number of deleted objects.
+    """
+    counts = {"books": 0, "magazines": 0, "papers": 0}
+    book_qs = books()
+    magazine_qs = magazines()
+    paper_qs = papers()
+    if since is not None:
+        if timezone.is_naive(since):
+            since = timezone.make_aware(since)
+        counts["deleted"] = 0
+        book_qs = book_qs.filter(
+            Q(updated_at__gt=since)
+            | Q(
+                pk__in=Edition.objects.filter(changed(Edition, since)).values("book_id")
+            )
+        )
+        magazine_qs = magazine_qs.filter(
+            Q(updated_at__gt=since)
+            | Q(
+                pk__in=Issue.objects.filter(changed(Issue, since)).values("magazine_id")
+            )
+        )
+        paper_qs = paper_qs.filter(changed(Paper, since))
+
+    def _write(key: str, items: Iterable[Dict]):
+        fp.write(f"{json.dumps(key)}: [")
+        for item in items:
+            fp.write(",\n" if counts[key] else "\n")
+            fp.write(json.dumps(item))
+            counts[key] += 1
+            if progress is not None:
+                progress(counts)
+        fp.write("\n]")
+
+    fp.write("{")
+    _write(
+        "books",
+        map(
+            book_to_dict,
+            iterate(book_qs, chunk_size=chunk_size, prefetches=BOOK_PREFETCHES),
+        ),
+    )
+    fp.write(",\n")
+    _write(
+        "magazines",
+        map(
+            magazine_to_dict,
+            iterate(magazine_qs, chunk_size=chunk_size, prefetches=MAGAZINE_PREFETCHES),
+        ),
+    )
+    fp.write(",\n")
+    _write(
+        "papers",
+        (
+            p.to_dict()
+            for p in iterate(
+                paper_qs, chunk_size=chunk_size, prefetches=PAPER_PREFETCHES
+            )
+        ),
+    )
+    if since is not None:
+        fp.write(",\n")
+        _write(
+            "deleted",
+            (
+                t.to_dict()
+                for t in Tombstone.objects.filter(deleted_at__gt=since)
+                .select_related("content_type")
+                .iterator(chunk_size)
+            ),
+        )
+    fp.write("}\n")
+    return counts
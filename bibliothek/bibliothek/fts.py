@@ -0,0 +1,280 @@
+# -*- coding: utf-8 -*-
+# vim: ft=python fileencoding=utf-8 sts=4 sw=4 et:
+# Copyright (C) 2016-2022 J. Nathanael Philipp (jnphilipp) <nathanael@philipp.land>
+#
+# This file is part of bibliothek.
+#
+# bibliothek is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# bibliothek is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with bibliothek.  If not, see <http://www.gnu.org/licenses/>.
+"""Bibliothek Django app full-text search.
+
+Books, editions, papers, proceedings and issues are indexed in a SQLite FTS5
+table with the trigram tokenizer, so that a search for a substring of a title,
+a name, an ISBN or a DOI is an index lookup instead of a scan with `icontains`
+over several joins.
+"""
+
+from django.apps import apps
+from django.db import connection, models, OperationalError
+from django.db.models.expressions import RawSQL
+from typing import Dict, Iterable, List, Optional, Tuple, Type, TypeVar
+
+TABLE = "bibliothek_fts"
+V = TypeVar("V")
+INDEXED = [
+    "books.book",
+    "books.edition",
+    "magazines.issue",
+    "papers.paper",
+    "papers.proceedings",
+]
+
+_available: Dict[str, bool] = {}
+
+
+def available() -> bool:
+    """Check if the full-text index exists in the DB."""
+    if connection.vendor != "sqlite":
+        return False
+    name = str(connection.settings_dict["NAME"])
+    if name not in _available:
+        with connection.cursor() as cursor:
+            cursor.execute(
+                "SELECT COUNT(*) FROM sqlite_master WHERE type = 'table' AND name = %s",
+                [TABLE],
+            )
+            _available[name] = cursor.fetchone()[0] == 1
+    return _available[name]
+
+
+def clear_cache():
+    """Forget whether the full-text index exists, e. g. after another process
+    created or dropped it."""
+    _available.clear()
+
+
+def create() -> bool:
+    """Create the full-text index, returns False if FTS5 is not available."""
+    _available.clear()
+    if connection.vendor != "sqlite":
+        return False
+    try:
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f"CREATE VIRTUAL TABLE IF NOT EXISTS {TABLE} USING fts5("
+                + "type UNINDEXED, object_id UNINDEXED, text, tokenize = 'trigram')"
+            )
+    except OperationalError:
+        return False
+    return True
+
+
+def drop():
+    """Drop the full-text index."""
+    _available.clear()
+    if connection.vendor == "sqlite":
+        with connection.cursor() as cursor:
+            cursor.execute(f"DROP TABLE IF EXISTS {TABLE}")
+
+
+def rebuild():
+    """Rebuild the full-text index from scratch."""
+    if not available():
+        return
+    with connection.cursor() as cursor:
+        cursor.execute(f"DELETE FROM {TABLE}")
+        for label in INDEXED:
+            cursor.execute(
+                f"INSERT INTO {TABLE} (type, object_id, text) {content(label)}", []
+            )
+
+
+def delete(model: Type[models.Model], pks: Iterable[int]):
+    """Remove objects from the full-text index."""
+    if model._meta.label_lower not in INDEXED or not available():
+        return
+    with connection.cursor() as cursor:
+        for chunk in chunks(pks):
+            cursor.execute(
+                f"DELETE FROM {TABLE} WHERE type = %s AND object_id IN "
+                + f"({', '.join(['%s'] * len(chunk))})",
+                [model._meta.label_lower] + chunk,
+            )
+
+
+def update(model: Type[models.Model], pks: Iterable[int]):
+    """Update objects in the full-text index.
+
+    Objects whose indexed text includes the given objects, e. g. the books and
+    editions of a person, are updated as well.
+    """
+    if not available():
+        return
+
+    pks = list(pks)
+    if not pks:
+        return
+    if model._meta.label_lower in INDEXED:
+        delete(model, pks)
+        with connection.cursor() as cursor:
+            for chunk in chunks(pks):
+                cursor.execute(
+                    f"INSERT INTO {TABLE} (type, object_id, text) "
+                    + f"{content(model._meta.label_lower)} "
+                    + f"WHERE t.id IN ({', '.join(['%s'] * len(chunk))})",
+                    chunk,
+                )
+
+    for chunk in chunks(pks):
+        for dependent, dependent_pks in dependents(model, chunk):
+            update(dependent, dependent_pks)
+
+
+def dependents(
+    model: Type[models.Model], pks: Iterable[int]
+) -> List[Tuple[Type[models.Model], List[int]]]:
+    """Get the objects whose indexed text includes the given objects."""
+    from books.models import Book, Edition
+    from journals.models import Journal
+    from magazines.models import Issue, Magazine
+    from papers.models import Paper, Proceedings
+    from persons.models import Person
+    from series.models import Series
+
+    if model is Book:
+        return [(Edition, _pks(Edition.objects.filter(book__in=pks)))]
+    elif model is Journal:
+        return [(Paper, _pks(Paper.objects.filter(journal__in=pks)))]
+    elif model is Magazine:
+        return [(Issue, _pks(Issue.objects.filter(magazine__in=pks)))]
+    elif model is Person:
+        return [
+            (Book, _pks(Book.objects.filter(authors__in=pks))),
+            (Edition, _pks(Edition.objects.filter(persons__in=pks))),
+            (Paper, _pks(Paper.objects.filter(authors__in=pks))),
+            (Proceedings, _pks(Proceedings.objects.filter(editors__in=pks))),
+        ]
+    elif model is Series:
+        return [(Book, _pks(Book.objects.filter(series__in=pks)))]
+    return []
+
+
+def search(model: Type[models.Model], term: str) -> Optional[RawSQL]:
+    """Search the full-text index.
+
+    The term is matched as a phrase, which with the trigram tokenizer is a case
+    insensitive substring match like `icontains`.
+
+    Returns a subquery selecting the primary keys of the matching objects, None if
+    the full-text index can not be used, i. e. the term is shorter than three
+    characters or the DB has no full-text index.
+    """
+    if model._meta.label_lower not in INDEXED or len(term) < 3 or not available():
+        return None
+    return RawSQL(
+        f"SELECT object_id FROM {TABLE} WHERE type = %s AND text MATCH %s",
+        (model._meta.label_lower, '"' + term.replace('"', '""') + '"'),
+    )
+
+
+def _pks(query_set: models.query.QuerySet) -> List[int]:
+    return list(query_set.values_list("pk", flat=True).distinct())
+
+
+def chunks(values: Iterable[V], size: int = 500) -> Iterable[List[V]]:
+    """Split values into chunks, to stay below SQLite's variable limit."""
+    values = list(values)
+    for i in range(0, len(values), size):
+        yield values[i : i + size]
+
+
+def _concat(*parts: str) -> str:
+    """SQL concatenating the non-NULL parts, separated by newlines."""
+    return " || char(10) || ".join([f"coalesce({p}, '')" for p in parts])
+
+
+def _names(field: models.ManyToManyField, alias: str = "t") -> str:
+    """SQL selecting the newline separated names of the persons of a M2M field."""
+    from persons.models import Person
+
+    through = field.remote_field.through._meta.db_table
+    return (
+        f"(SELECT group_concat(p.name, char(10)) FROM {Person._meta.db_table} p "
+        + f"JOIN {through} m ON m.{field.m2m_reverse_name()} = p.id "
+        + f"WHERE m.{field.m2m_column_name()} = {alias}.id)"
+    )
+
+
+def content(label: str) -> str:
+    """SQL selecting type, primary key and indexed text of all objects of a model."""
+    from books.models import Book, Edition
+    from journals.models import Journal
+    from magazines.models import Issue, Magazine
+    from papers.models import Paper, Proceedings
+    from series.models import Series
+
+    model = apps.get_model(label)
+    table = model._meta.db_table
+    if model is Book:
+        return (
+            f"SELECT '{label}', t.id, "
+            + _concat("t.title", _names(Book._meta.get_field("authors")), "s.name")
+            + f" FROM {table} t LEFT JOIN {Series._meta.db_table} s "
+            + "ON s.id = t.series_id"
+        )
+    elif model is Edition:
+        return (
+            f"SELECT '{label}', t.id, "
+            + _concat(
+                "t.alternate_title",
+                "t.edition",
+                "t.isbn",
+                _names(Edition._meta.get_field("persons")),
+                "b.title",
+                _names(Book._meta.get_field("authors"), "b"),
+                "s.name || ' ' || printf('%%g', b.volume)",
+            )
+            + f" FROM {table} t JOIN {Book._meta.db_table} b ON b.id = t.book_id "
+            + f"LEFT JOIN {Series._meta.db_table} s ON s.id = b.series_id"
+        )
+    elif model is Issue:
+        return (
+            f"SELECT '{label}', t.id, "
+            + _concat("m.name || ' ' || t.issue")
+            + f" FROM {table} t JOIN {Magazine._meta.db_table} m "
+            + "ON m.id = t.magazine_id"
+        )
+    elif model is Paper:
+        return (
+            f"SELECT '{label}', t.id, "
+            + _concat(
+                "t.title",
+                _names(Paper._meta.get_field("authors")),
+                "j.name || ' ' || coalesce(t.volume, '')",
+                "t.doi",
+            )
+            + f" FROM {table} t LEFT JOIN {Journal._meta.db_table} j "
+            + "ON j.id = t.journal_id"
+        )
+    elif model is Proceedings:
+        return (
+            f"SELECT '{label}', t.id, "
+            + _concat(
+                "t.title",
+                "t.isbn",
+                "t.doi",
+                _names(Proceedings._meta.get_field("editors")),
+            )
+            + f" FROM {table} t"
+        )
+    raise ValueError(f"{label} is not indexed.")
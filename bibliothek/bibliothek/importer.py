@@ -0,0 +1,639 @@
+# -*- coding: utf-8 -*-
+# vim: ft=python fileencoding=utf-8 sts=4 sw=4 et:
+# Copyright (C) 2016-2022 J. Nathanael Philipp (jnphilipp) <nathanael@philipp.land>
+#
+# This file is part of bibliothek.
+#
+# bibliothek is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# bibliothek is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with bibliothek.  If not, see <http://www.gnu.org/licenses/>.
+"""Bibliothek Django app importer."""
+
+import datetime
+
+from bibliothek import fts
+from bibliothek.utils import iterjson, search_key, unique_slugs
+from bindings.models import Binding
+from books.models import Book, Edition
+from django.contrib.contenttypes.models import ContentType
+from django.db import models, transaction
+from genres.models import Genre
+from journals.models import Journal
+from languages.models import Language
+from links.models import Link
+from magazines.models import Issue, Magazine
+from papers.bibtex import parse_citation_key
+from papers.models import Paper, Proceedings
+from persons.models import Person
+from publishers.models import Publisher
+from series.models import Series
+from shelves.models import Acquisition, Read
+from typing import (
+    Callable,
+    Dict,
+    Iterable,
+    List,
+    Optional,
+    Set,
+    TextIO,
+    Tuple,
+    Type,
+    Union,
+)
+
+
+def import_json(
+    fp: TextIO,
+    progress: Optional[Callable[[Dict[str, int]], None]] = None,
+    chunk_size: Optional[int] = None,
+) -> Dict[str, int]:
+    """Import books, magazines and papers from a JSON file.
+
+    The file is parsed incrementally, every book, magazine and paper is imported as
+    soon as it has been read. If a chunk size is given the objects are imported in
+    chunks with the `BulkImporter`.
+
+    Args:
+        * fp: JSON file to import from
+        * progress: called with the number of imported objects after each import
+        * chunk_size: import in chunks of this size
+
+    Returns the number of imported books, magazines and papers.
+    """
+    if chunk_size:
+        importer = BulkImporter(chunk_size)
+        for key, data in iterjson(fp):
+            if importer.add(key, data) and progress is not None:
+                progress(importer.counts)
+        importer.flush()
+        if progress is not None:
+            progress(importer.counts)
+        return importer.counts
+
+    counts = {"books": 0, "magazines": 0, "papers": 0}
+    for key, data in iterjson(fp):
+        if key == "books":
+            book, created = Book.from_dict(data)
+            for e in data["editions"] if "editions" in data else []:
+                Edition.from_dict(e, book)
+        elif key == "magazines":
+            magazine, created = Magazine.from_dict(data)
+            for i in data["issues"] if "issues" in data else []:
+                Issue.from_dict(i, magazine)
+        elif key == "papers":
+            Paper.from_dict(data)
+        else:
+            continue
+
+        counts[key] += 1
+        if progress is not None:
+            progress(counts)
+    return counts
+
+
+class BulkImporter:
+    """Bulk importer.
+
+    Collects books, magazines and papers and writes them in chunks, each chunk in a
+    single transaction. Persons, genres, links, series, publishers, bindings,
+    languages and journals are resolved through cached name to primary key maps,
+    new rows and many-to-many relations are written with `bulk_create`.
+
+    Editions, issues and papers with a cover or files are imported through their
+    `from_dict` methods, as these need to be copied to the media directory.
+    """
+
+    def __init__(self, chunk_size: int = 1000):
+        """Init.
+
+        Args:
+            * chunk_size: number of books, magazines and papers per chunk
+        """
+        assert chunk_size > 0
+        self.chunk_size = chunk_size
+        self.counts = {"books": 0, "magazines": 0, "papers": 0}
+        self._chunk: List[Tuple[str, Dict]] = []
+        self._pks: Dict[Type[models.Model], Dict[str, int]] = {}
+
+    def add(self, key: str, data: Dict) -> bool:
+        """Add a book, magazine or paper.
+
+        Returns True if the chunk was full and has been written.
+        """
+        if key not in self.counts:
+            return False
+        self._chunk.append((key, data))
+        if len(self._chunk) >= self.chunk_size:
+            self.flush()
+            return True
+        return False
+
+    def flush(self):
+        """Write the current chunk."""
+        if not self._chunk:
+            return
+        with transaction.atomic():
+            self._import_books([d for k, d in self._chunk if k == "books"])
+            self._import_magazines([d for k, d in self._chunk if k == "magazines"])
+            self._import_papers([d for k, d in self._chunk if k == "papers"])
+        for key, data in self._chunk:
+            self.counts[key] += 1
+        self._chunk = []
+
+    def _import_books(self, books: List[Dict]):
+        if not books:
+            return
+
+        series = self._lookup(Series, [b["series"] for b in books if _has(b, "series")])
+        persons = self._lookup(Person, [a for b in books for a in _list(b, "authors")])
+        genres = self._lookup(Genre, [g for b in books for g in _list(b, "genres")])
+        links = self._lookup(Link, [li for b in books for li in _list(b, "links")])
+
+        pks = dict(
+            _values_list(Book.objects, "title", {b["title"] for b in books}, "pk")
+        )
+        new: Dict[str, Book] = {}
+        for b in books:
+            if b["title"] in pks or b["title"] in new:
+                continue
+            volume = b["volume"] if _has(b, "volume") else 0
+            new[b["title"]] = Book(
+                title=b["title"],
+                series_id=series[b["series"]["name"]] if _has(b, "series") else None,
+                volume=volume,
+                search_key=(
+                    search_key(b["series"]["name"], f"{volume:g}")
+                    if _has(b, "series")
+                    else None
+                ),
+            )
+        if new:
+            _set_slugs(Book, list(new.values()), "title")
+            Book.objects.bulk_create(new.values())
+            pks.update(_values_list(Book.objects, "title", new.keys(), "pk"))
+
+        _add_m2m(
+            Book.authors,
+            [
+                (pks[b["title"]], persons[a["name"]])
+                for b in books
+                for a in _list(b, "authors")
+            ],
+        )
+        _add_m2m(
+            Book.genres,
+            [
+                (pks[b["title"]], genres[g["name"]])
+                for b in books
+                for g in _list(b, "genres")
+            ],
+        )
+        _add_m2m(
+            Book.links,
+            [
+                (pks[b["title"]], links[li["url"]])
+                for b in books
+                for li in _list(b, "links")
+            ],
+        )
+
+        self._import_editions(
+            [(pks[b["title"]], e) for b in books for e in _list(b, "editions")]
+        )
+        fts.update(Book, {pks[b["title"]] for b in books})
+
+    def _import_editions(self, editions: List[Tuple[int, Dict]]):
+        for book_id, e in [(b, e) for b, e in editions if _has_files(e)]:
+            Edition.from_dict(e, Book.objects.get(pk=book_id))
+        editions = [(b, e) for b, e in editions if not _has_files(e)]
+        if not editions:
+            return
+
+        publishers = self._lookup(
+            Publisher, [e["publisher"] for b, e in editions if _has(e, "publisher")]
+        )
+        bindings = self._lookup(
+            Binding, [e["binding"] for b, e in editions if _has(e, "binding")]
+        )
+        languages = self._lookup(
+            Language, [la for b, e in editions for la in _list(e, "languages")]
+        )
+        links = self._lookup(
+            Link, [li for b, e in editions for li in _list(e, "links")]
+        )
+        persons = self._lookup(
+            Person, [p for b, e in editions for p in _list(e, "persons")]
+        )
+
+        def _key(book_id: int, data: Dict) -> Tuple:
+            isbn = data["isbn"].replace("-", "") if _has(data, "isbn") else None
+            return (
+                book_id,
+                data["alternate_title"] if _has(data, "alternate_title") else None,
+                data["edition"] if _has(data, "edition") else None,
+                isbn,
+                (
+                    _date(data["publishing_date"])
+                    if _has(data, "publishing_date")
+                    else None
+                ),
+            )
+
+        def _existing() -> Dict[Tuple, int]:
+            return {
+                tuple(row[:-1]): row[-1]
+                for row in _values_list(
+                    Edition.objects,
+                    "book_id",
+                    {b for b, e in editions},
+                    "alternate_title",
+                    "edition",
+                    "isbn",
+                    "publishing_date",
+                    "pk",
+                )
+            }
+
+        pks = _existing()
+        new: Dict[Tuple, Edition] = {}
+        for book_id, e in editions:
+            key = _key(book_id, e)
+            if key in pks or key in new:
+                continue
+            new[key] = Edition(
+                book_id=key[0],
+                alternate_title=key[1],
+                edition=key[2],
+                isbn=key[3],
+                publishing_date=key[4],
+                publisher_id=(
+                    publishers[e["publisher"]["name"]] if _has(e, "publisher") else None
+                ),
+                binding_id=(
+                    bindings[e["binding"]["name"]] if _has(e, "binding") else None
+                ),
+                bibtex=e["bibtex"] if _has(e, "bibtex") else None,
+            )
+        if new:
+            Edition.objects.bulk_create(new.values())
+            pks = _existing()
+
+        objs = [(pks[_key(b, e)], e) for b, e in editions]
+        _add_m2m(
+            Edition.languages,
+            [
+                (pk, languages[_name(la)])
+                for pk, e in objs
+                for la in _list(e, "languages")
+            ],
+        )
+        _add_m2m(
+            Edition.links,
+            [(pk, links[li["url"]]) for pk, e in objs for li in _list(e, "links")],
+        )
+        _add_m2m(
+            Edition.persons,
+            [(pk, persons[p["name"]]) for pk, e in objs for p in _list(e, "persons")],
+        )
+        _import_shelves(Edition, objs)
+
+    def _import_magazines(self, magazines: List[Dict]):
+        if not magazines:
+            return
+
+        links = self._lookup(
+            Link,
+            [m["feed"] for m in magazines if _has(m, "feed")]
+            + [li for m in magazines for li in _list(m, "links")],
+        )
+
+        names = {m["name"] for m in magazines}
+        pks = dict(_values_list(Magazine.objects, "name", names, "pk"))
+        new: Dict[str, Magazine] = {}
+        for m in magazines:
+            if m["name"] in pks or m["name"] in new:
+                continue
+            new[m["name"]] = Magazine(
+                name=m["name"],
+                feed_id=links[m["feed"]["url"]] if _has(m, "feed") else None,
+            )
+        if new:
+            _set_slugs(Magazine, list(new.values()), "name")
+            Magazine.objects.bulk_create(new.values())
+            pks.update(_values_list(Magazine.objects, "name", new.keys(), "pk"))
+
+        _add_m2m(
+            Magazine.links,
+            [
+                (pks[m["name"]], links[li["url"]])
+                for m in magazines
+                for li in _list(m, "links")
+            ],
+        )
+
+        self._import_issues(
+            [(pks[m["name"]], i) for m in magazines for i in _list(m, "issues")]
+        )
+
+    def _import_issues(self, issues: List[Tuple[int, Dict]]):
+        for magazine_id, i in [(m, i) for m, i in issues if _has_files(i)]:
+            Issue.from_dict(i, Magazine.objects.get(pk=magazine_id))
+        issues = [(m, i) for m, i in issues if not _has_files(i)]
+        if not issues:
+            return
+
+        languages = self._lookup(
+            Language, [la for m, i in issues for la in _list(i, "languages")]
+        )
+        links = self._lookup(Link, [li for m, i in issues for li in _list(i, "links")])
+
+        def _existing() -> Dict[Tuple[int, str], int]:
+            return {
+                (row[0], row[1]): row[2]
+                for row in _values_list(
+                    Issue.objects, "magazine_id", {m for m, i in issues}, "issue", "pk"
+                )
+            }
+
+        pks = _existing()
+        names = dict(
+            _values_list(Magazine.objects, "pk", {m for m, i in issues}, "name")
+        )
+        new: Dict[Tuple[int, str], Issue] = {}
+        for magazine_id, i in issues:
+            key = (magazine_id, i["issue"])
+            if key in pks or key in new:
+                continue
+            new[key] = Issue(
+                magazine_id=magazine_id,
+                issue=i["issue"],
+                search_key=search_key(names[magazine_id], i["issue"]),
+                publishing_date=(
+                    _date(i["publishing_date"]) if _has(i, "publishing_date") else None
+                ),
+            )
+        if new:
+            Issue.objects.bulk_create(new.values())
+            pks = _existing()
+
+        objs = [(pks[(m, i["issue"])], i) for m, i in issues]
+        _add_m2m(
+            Issue.languages,
+            [
+                (pk, languages[_name(la)])
+                for pk, i in objs
+                for la in _list(i, "languages")
+            ],
+        )
+        _add_m2m(
+            Issue.links,
+            [(pk, links[li["url"]]) for pk, i in objs for li in _list(i, "links")],
+        )
+        _import_shelves(Issue, objs)
+        fts.update(Issue, {pk for pk, i in objs})
+
+    def _import_papers(self, papers: List[Dict]):
+        for p in [p for p in papers if _has_files(p)]:
+            Paper.from_dict(p)
+        papers = [p for p in papers if not _has_files(p)]
+        if not papers:
+            return
+
+        journals = self._lookup(
+            Journal, [p["journal"] for p in papers if _has(p, "journal")]
+        )
+        publishers = self._lookup(
+            Publisher, [p["publisher"] for p in papers if _has(p, "publisher")]
+        )
+        series = self._lookup(
+            Series, [p["series"] for p in papers if _has(p, "series")]
+        )
+        persons = self._lookup(Person, [a for p in papers for a in _list(p, "authors")])
+        languages = self._lookup(
+            Language, [la for p in papers for la in _list(p, "languages")]
+        )
+        links = self._lookup(Link, [li for p in papers for li in _list(p, "links")])
+        proceedings: Dict[str, int] = {}
+        for p in papers:
+            if _has(p, "proceedings") and p["proceedings"]["title"] not in proceedings:
+                proceedings[p["proceedings"]["title"]] = Proceedings.from_dict(
+                    p["proceedings"]
+                )[0].pk
+
+        titles = {p["title"] for p in papers}
+        pks = dict(_values_list(Paper.objects, "title", titles, "pk"))
+        new: Dict[str, Paper] = {}
+        for p in papers:
+            if p["title"] in pks or p["title"] in new:
+                continue
+            new[p["title"]] = Paper(
+                title=p["title"],
+                journal_id=(
+                    journals[p["journal"]["name"]] if _has(p, "journal") else None
+                ),
+                volume=p["volume"] if _has(p, "volume") else None,
+                doi=p["doi"] if _has(p, "doi") else None,
+                proceedings_id=(
+                    proceedings[p["proceedings"]["title"]]
+                    if _has(p, "proceedings")
+                    else None
+                ),
+                publisher_id=(
+                    publishers[p["publisher"]["name"]] if _has(p, "publisher") else None
+                ),
+                series_id=series[p["series"]["name"]] if _has(p, "series") else None,
+                publishing_date=(
+                    _date(p["publishing_date"]) if _has(p, "publishing_date") else None
+                ),
+                bibtex=p["bibtex"] if _has(p, "bibtex") else None,
+                citation_key=(
+                    parse_citation_key(p["bibtex"]) if _has(p, "bibtex") else None
+                ),
+            )
+        if new:
+            _set_slugs(Paper, list(new.values()), "title")
+            Paper.objects.bulk_create(new.values())
+            pks.update(_values_list(Paper.objects, "title", new.keys(), "pk"))
+
+        objs = [(pks[p["title"]], p) for p in papers]
+        _add_m2m(
+            Paper.authors,
+            [(pk, persons[a["name"]]) for pk, p in objs for a in _list(p, "authors")],
+        )
+        _add_m2m(
+            Paper.languages,
+            [
+                (pk, languages[_name(la)])
+                for pk, p in objs
+                for la in _list(p, "languages")
+            ],
+        )
+        _add_m2m(
+            Paper.links,
+            [(pk, links[li["url"]]) for pk, p in objs for li in _list(p, "links")],
+        )
+        _import_shelves(Paper, objs)
+        fts.update(Paper, {pk for pk, p in objs})
+
+    def _lookup(
+        self, model: Type[models.Model], items: Iterable[Union[Dict, str]]
+    ) -> Dict[str, int]:
+        """Resolve names to primary keys, creating missing objects."""
+        field = "link" if model is Link else "name"
+        pks = self._pks.setdefault(model, {})
+
+        items = list(items)
+        missing = {_name(i) for i in items} - pks.keys()
+        if missing:
+            pks.update(_values_list(model.objects, field, missing, "pk"))
+            missing -= pks.keys()
+        if missing:
+            objs = [model(**{field: name}) for name in sorted(missing)]
+            if model is not Link:
+                _set_slugs(model, objs, field)
+            model.objects.bulk_create(objs)
+            pks.update(_values_list(model.objects, field, missing, "pk"))
+            fts.update(model, [pks[name] for name in missing])
+
+        if model in [Journal, Person, Publisher, Series]:
+            related = [(i, li) for i in items for li in _list(i, "links")]
+            if related:
+                links = self._lookup(Link, [li for i, li in related])
+                _add_m2m(
+                    getattr(model, "links"),
+                    [(pks[_name(i)], links[li["url"]]) for i, li in related],
+                )
+        return pks
+
+
+def _add_m2m(descriptor, pairs: Iterable[Tuple[int, int]]):
+    """Add many-to-many relations, already existing relations are ignored."""
+    pairs = set(pairs)
+    if not pairs:
+        return
+    through = descriptor.through
+    source = descriptor.field.m2m_field_name()
+    target = descriptor.field.m2m_reverse_field_name()
+    through.objects.bulk_create(
+        [through(**{f"{source}_id": s, f"{target}_id": t}) for s, t in pairs],
+        ignore_conflicts=True,
+    )
+
+
+def _import_shelves(model: Type[models.Model], objs: List[Tuple[int, Dict]]):
+    """Create acquisitions and reads of the given objects."""
+    content_type = ContentType.objects.get_for_model(model)
+    object_ids = {pk for pk, data in objs}
+
+    acquisitions: Set[Tuple] = set(
+        _values_list(
+            Acquisition.objects.filter(content_type=content_type),
+            "object_id",
+            object_ids,
+            "date",
+            "price",
+        )
+    )
+    new_acquisitions = []
+    for pk, data in objs:
+        for a in _list(data, "acquisitions"):
+            key = (
+                pk,
+                _date(a["date"]) if _has(a, "date") else None,
+                a["price"] if "price" in a else 0,
+            )
+            if key not in acquisitions:
+                acquisitions.add(key)
+                new_acquisitions.append(
+                    Acquisition(
+                        content_type=content_type,
+                        object_id=pk,
+                        date=key[1],
+                        price=key[2],
+                    )
+                )
+    Acquisition.objects.bulk_create(new_acquisitions)
+
+    reads: Set[Tuple] = set(
+        _values_list(
+            Read.objects.filter(content_type=content_type),
+            "object_id",
+            object_ids,
+            "started",
+            "finished",
+        )
+    )
+    new_reads = []
+    for pk, data in objs:
+        for r in _list(data, "reads"):
+            key = (
+                pk,
+                _date(r["started"]) if _has(r, "started") else None,
+                _date(r["finished"]) if _has(r, "finished") else None,
+            )
+            if key not in reads:
+                reads.add(key)
+                new_reads.append(
+                    Read(
+                        content_type=content_type,
+                        object_id=pk,
+                        started=key[1],
+                        finished=key[2],
+                    )
+                )
+    Read.objects.bulk_create(new_reads)
+
+
+def _values_list(
+    query_set: models.query.QuerySet, field: str, values: Iterable, *fields: str
+) -> List[Tuple]:
+    """Values of the objects whose field is one of the given values.
+
+    The values are filtered in chunks, to stay below SQLite's variable limit. The
+    rows start with the value of the field followed by the given fields.
+    """
+    rows: List[Tuple] = []
+    for chunk in fts.chunks(values):
+        rows += query_set.filter(**{f"{field}__in": chunk}).values_list(field, *fields)
+    return rows
+
+
+def _set_slugs(model: Type[models.Model], objs: List[models.Model], field: str):
+    """Set unique slugs, as `bulk_create` does not call `save`."""
+    for obj, slug in zip(objs, unique_slugs(model, [getattr(o, field) for o in objs])):
+        obj.slug = slug
+
+
+def _date(value: Union[str, datetime.date]) -> datetime.date:
+    if isinstance(value, datetime.date):
+        return value
+    return datetime.datetime.strptime(value, "%Y-%m-%d").date()
+
+
+def _has(data: Dict, key: str) -> bool:
+    return key in data and bool(data[key])
+
+
+def _has_files(data: Dict) -> bool:
+    return _has(data, "cover") or _has(data, "files")
+
+
+def _list(data: Union[Dict, str], key: str) -> List:
+    if isinstance(data, dict) and key in data and data[key]:
+        return data[key]
+    return []
+
+
+def _name(data: Union[Dict, str]) -> str:
+    if isinstance(data, str):
+        return data
+    return data["url"] if "url" in data else data["name"]
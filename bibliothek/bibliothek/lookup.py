@@ -0,0 +1,68 @@
+# -*- coding: utf-8 -*-
+# vim: ft=python fileencoding=utf-8 sts=4 sw=4 et:
+# Copyright (C) 2016-2022 J. Nathanael Philipp (jnphilipp) <nathanael@philipp.land>
+#
+# This file is part of bibliothek.
+#
+# bibliothek is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# bibliothek is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with bibliothek.  If not, see <http://www.gnu.org/licenses/>.
+"""Bibliothek Django app lookup.
+
+Resolves a search term to a single object. Every lookup fetches at most two
+objects per type, which is enough to tell a unique result from an ambiguous one,
+instead of counting all search results.
+"""
+
+from django.apps import apps
+from django.db import models
+from django.db.models import Q
+from typing import List, Optional
+
+RESOLVABLE = ["books.Edition", "papers.Paper", "magazines.Issue"]
+
+
+def get_one(
+    query_set: models.query.QuerySet, term: str, exact: Q
+) -> Optional[models.Model]:
+    """Get single object from search results.
+
+    If the search is ambiguous, the results are narrowed down to the object with
+    the term as id or, if the term is not a number, to the exact matches.
+
+    Args:
+        * query_set: search results
+        * term: search term
+        * exact: filter for exact matches of the term
+    """
+    objs = list(query_set[:2])
+    if len(objs) > 1:
+        objs = list(query_set.filter(Q(pk=term) if term.isdigit() else exact)[:2])
+    return objs[0] if len(objs) == 1 else None
+
+
+def resolve(term: str, labels: List[str] = RESOLVABLE) -> List[models.Model]:
+    """Resolve term across editions, papers and issues.
+
+    Returns the single object found per type, the term is unambiguous if exactly
+    one object is returned.
+
+    Args:
+        * term: search term
+        * labels: models to search in
+    """
+    objs = []
+    for label in labels:
+        obj = apps.get_model(label).get(term)
+        if obj is not None:
+            objs.append(obj)
+    return objs
@@ -0,0 +1,37 @@
+# -*- coding: utf-8 -*-
+# vim: ft=python fileencoding=utf-8 sts=4 sw=4 et:
+# Copyright (C) 2016-2022 J. Nathanael Philipp (jnphilipp) <nathanael@philipp.land>
+#
+# This file is part of bibliothek.
+#
+# bibliothek is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# bibliothek is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with bibliothek.  If not, see <http://www.gnu.org/licenses/>.
+"""Bibliothek Django app rebuild full-text index command."""
+
+from bibliothek import fts
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+
+
+class Command(BaseCommand):
+    """Rebuild full-text index command."""
+
+    help = "Rebuild the full-text index used by search."
+
+    def handle(self, *args, **options):
+        """Handle."""
+        if not fts.available() and not fts.create():
+            raise CommandError("FTS5 with the trigram tokenizer is not available.")
+        with transaction.atomic():
+            fts.rebuild()
+        self.stdout.write(self.style.SUCCESS("Successfully rebuilt full-text index."))
@@ -0,0 +1,78 @@
+# Generated by Django 4.2.30 on 2026-10-18 20:05
+
+from django.db import migrations, OperationalError
+
+# frozen copy of the full-text index of bibliothek.fts as of this migration
+TABLE = "bibliothek_fts"
+CONTENT = [
+    "SELECT 'books.book', t.id, coalesce(t.title, '') || char(10) || "
+    + "coalesce((SELECT group_concat(p.name, char(10)) FROM persons_person p "
+    + "JOIN books_book_authors m ON m.person_id = p.id WHERE m.book_id = t.id), "
+    + "'') || char(10) || coalesce(s.name, '') FROM books_book t "
+    + "LEFT JOIN series_series s ON s.id = t.series_id",
+    "SELECT 'books.edition', t.id, coalesce(t.alternate_title, '') || char(10) || "
+    + "coalesce(t.edition, '') || char(10) || coalesce(t.isbn, '') || char(10) || "
+    + "coalesce((SELECT group_concat(p.name, char(10)) FROM persons_person p "
+    + "JOIN books_edition_persons m ON m.person_id = p.id "
+    + "WHERE m.edition_id = t.id), '') || char(10) || coalesce(b.title, '') || "
+    + "char(10) || coalesce((SELECT group_concat(p.name, char(10)) "
+    + "FROM persons_person p JOIN books_book_authors m ON m.person_id = p.id "
+    + "WHERE m.book_id = b.id), '') || char(10) || "
+    + "coalesce(s.name || ' ' || printf('%%g', b.volume), '') FROM books_edition t "
+    + "JOIN books_book b ON b.id = t.book_id "
+    + "LEFT JOIN series_series s ON s.id = b.series_id",
+    "SELECT 'magazines.issue', t.id, coalesce(m.name || ' ' || t.issue, '') "
+    + "FROM magazines_issue t JOIN magazines_magazine m ON m.id = t.magazine_id",
+    "SELECT 'papers.paper', t.id, coalesce(t.title, '') || char(10) || "
+    + "coalesce((SELECT group_concat(p.name, char(10)) FROM persons_person p "
+    + "JOIN papers_paper_authors m ON m.person_id = p.id "
+    + "WHERE m.paper_id = t.id), '') || char(10) || "
+    + "coalesce(j.name || ' ' || coalesce(t.volume, ''), '') || char(10) || "
+    + "coalesce(t.doi, '') FROM papers_paper t "
+    + "LEFT JOIN journals_journal j ON j.id = t.journal_id",
+    "SELECT 'papers.proceedings', t.id, coalesce(t.title, '') || char(10) || "
+    + "coalesce(t.isbn, '') || char(10) || coalesce(t.doi, '') || char(10) || "
+    + "coalesce((SELECT group_concat(p.name, char(10)) FROM persons_person p "
+    + "JOIN papers_proceedings_editors m ON m.person_id = p.id "
+    + "WHERE m.proceedings_id = t.id), '') FROM papers_proceedings t",
+]
+
+
+def create_fts(apps, schema_editor):
+    if schema_editor.connection.vendor != "sqlite":
+        return
+    with schema_editor.connection.cursor() as cursor:
+        try:
+            cursor.execute(
+                f"CREATE VIRTUAL TABLE IF NOT EXISTS {TABLE} USING fts5("
+                + "type UNINDEXED, object_id UNINDEXED, text, tokenize = 'trigram')"
+            )
+        except OperationalError:
+            # no FTS5 or trigram tokenizer, searches fall back to LIKE
+            return
+        cursor.execute(f"DELETE FROM {TABLE}")
+        for content in CONTENT:
+            cursor.execute(f"INSERT INTO {TABLE} (type, object_id, text) {content}", [])
+
+
+def drop_fts(apps, schema_editor):
+    if schema_editor.connection.vendor == "sqlite":
+        with schema_editor.connection.cursor() as cursor:
+            cursor.execute(f"DROP TABLE IF EXISTS {TABLE}")
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("bibliothek", "0001_initial"),
+        ("books", "0007_alter_book_updated_at_alter_edition_updated_at"),
+        ("journals", "0001_initial"),
+        ("magazines", "0003_alter_issue_updated_at_alter_magazine_updated_at"),
+        ("papers", "0006_paper_citation_key"),
+        ("persons", "0001_initial"),
+        ("series", "0001_initial"),
+    ]
+
+    operations = [
+        migrations.RunPython(create_fts, drop_fts),
+    ]
@@ -0,0 +1,64 @@
+# -*- coding: utf-8 -*-
+# vim: ft=python fileencoding=utf-8 sts=4 sw=4 et:
+# Copyright (C) 2016-2022 J. Nathanael Philipp (jnphilipp) <nathanael@philipp.land>
+#
+# This file is part of bibliothek.
+#
+# bibliothek is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# bibliothek is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with bibliothek.  If not, see <http://www.gnu.org/licenses/>.
+"""Bibliothek Django app models."""
+
+from django.contrib.contenttypes.fields import GenericForeignKey
+from django.contrib.contenttypes.models import ContentType
+from django.db import models
+from django.utils.translation import gettext_lazy as _
+from typing import Dict, TypeVar
+
+
+class Tombstone(models.Model):
+    """Tombstone Model.
+
+    Records a deleted object, so that a delta export can also include deletions.
+    """
+
+    T = TypeVar("T", bound="Tombstone", covariant=True)
+
+    deleted_at = models.DateTimeField(
+        auto_now_add=True, db_index=True, verbose_name=_("Deleted at")
+    )
+
+    name = models.TextField(verbose_name=_("Name"))
+
+    content_type = models.ForeignKey(ContentType, models.CASCADE)
+    object_id = models.PositiveIntegerField()
+    content_object = GenericForeignKey("content_type", "object_id")
+
+    def to_dict(self: T) -> Dict:
+        """Convert to dict."""
+        return {
+            "type": f"{self.content_type.app_label}.{self.content_type.model}",
+            "id": self.object_id,
+            "name": self.name,
+            "deleted_at": self.deleted_at.isoformat(),
+        }
+
+    def __str__(self: T) -> str:
+        """Name."""
+        return f'Tombstone "{self.name}" [{self.deleted_at}]'
+
+    class Meta:
+        """Meta."""
+
+        ordering = ("deleted_at",)
+        verbose_name = _("Tombstone")
+        verbose_name_plural = _("Tombstones")
@@ -0,0 +1,181 @@
+# -*- coding: utf-8 -*-
+# vim: ft=python fileencoding=utf-8 sts=4 sw=4 et:
+# Copyright (C) 2016-2022 J. Nathanael Philipp (jnphilipp) <nathanael@philipp.land>
+#
+# This file is part of bibliothek.
+#
+# bibliothek is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# bibliothek is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with bibliothek.  If not, see <http://www.gnu.org/licenses/>.
+"""Bibliothek Django app pagination.
+
+Keyset pagination, a page starts after the last object of the previous page instead
+of at an offset. The ordering keys of that object are looked up once and the page
+is filtered on them, so every page costs the same regardless of how far into the
+list it is.
+"""
+
+from argparse import ArgumentParser
+from django.db import models
+from django.db.models import F, Prefetch, Q, prefetch_related_objects
+from django.db.models.expressions import OrderBy
+from django.utils.translation import gettext_lazy as _
+from typing import Iterator, List, Optional, Sequence, Tuple, Union
+
+
+def add_arguments(parser: ArgumentParser):
+    """Add the `--limit` and `--after` arguments to a list parser."""
+    parser.add_argument(
+        "--limit", type=int, help=_("List at most this many, i. e. the page size")
+    )
+    parser.add_argument(
+        "--after",
+        type=int,
+        help=_("List the ones after the one with this id, i. e. the next page"),
+    )
+
+
+def paginate(
+    query_set: models.query.QuerySet,
+    limit: Optional[int] = None,
+    after: Optional[int] = None,
+) -> models.query.QuerySet:
+    """Get a page of the query set in its ordering.
+
+    The ordering is made total with the primary key. NULLs are the smallest
+    values, as in SQLite, unless the ordering says otherwise. If there is no object
+    with id `after`, the page is empty.
+
+    Args:
+        * query_set: query set to page
+        * limit: maximum number of objects, all if None
+        * after: id of the object the page starts after, at the beginning if None
+    """
+    query_set = _keyed(query_set, after)[0]
+    return query_set if limit is None else query_set[:limit]
+
+
+def iterate(
+    query_set: models.query.QuerySet,
+    limit: Optional[int] = None,
+    after: Optional[int] = None,
+    chunk_size: int = 1000,
+    prefetches: Sequence[Union[str, Prefetch]] = (),
+) -> Iterator[models.Model]:
+    """Iterate over a page of the query set, see `paginate`.
+
+    The objects are fetched in chunks, each chunk starts after the last object of
+    the previous one. The given prefetches are done per chunk, instead of using
+    `prefetch_related` on the query set.
+
+    Args:
+        * query_set: query set to page
+        * limit: maximum number of objects, all if None
+        * after: id of the object the page starts after, at the beginning if None
+        * chunk_size: number of objects to fetch at once
+        * prefetches: lookups to prefetch, as for `prefetch_related`
+    """
+    query_set, names, orderings = _keyed(query_set, after)
+    chunk_query_set = query_set
+    while limit is None or limit > 0:
+        size = chunk_size if limit is None else min(chunk_size, limit)
+        chunk = list(chunk_query_set[:size])
+        prefetch_related_objects(chunk, *prefetches)
+        yield from chunk
+        if len(chunk) < size:
+            break
+        if limit is not None:
+            limit -= size
+        values = [getattr(chunk[-1], name) for name in names]
+        chunk_query_set = query_set.filter(_after(names, orderings, values))
+
+
+def _keyed(
+    query_set: models.query.QuerySet, after: Optional[int] = None
+) -> Tuple[models.query.QuerySet, List[str], List[OrderBy]]:
+    """Query set annotated with and ordered by its ordering keys.
+
+    Returns the query set starting after the object with id `after`, the names
+    of the keys and their orderings.
+    """
+    orderings = _orderings(query_set)
+    keys = {f"_key{i}": order.expression for i, order in enumerate(orderings)}
+    query_set = query_set.annotate(**keys).order_by(
+        *[_order_by(name, order) for name, order in zip(keys, orderings)]
+    )
+
+    if after is not None:
+        values = list(
+            query_set.model._base_manager.filter(pk=after)
+            .annotate(**keys)
+            .values_list(*keys)[:1]
+        )
+        if not values:
+            return query_set.none(), list(keys), orderings
+        query_set = query_set.filter(_after(list(keys), orderings, values[0]))
+    return query_set, list(keys), orderings
+
+
+def _after(names: List[str], orderings: List[OrderBy], values: tuple) -> Q:
+    """Filter for the objects after the given keys, lexicographically."""
+    condition = Q(pk__in=[])
+    equal = Q()
+    for name, order, value in zip(names, orderings, values):
+        nulls_first = order.nulls_first or not (order.descending or order.nulls_last)
+        if value is None:
+            if nulls_first:
+                condition |= equal & Q(**{f"{name}__isnull": False})
+            equal &= Q(**{f"{name}__isnull": True})
+        else:
+            greater = Q(**{f"{name}__{'lt' if order.descending else 'gt'}": value})
+            if not nulls_first:
+                greater |= Q(**{f"{name}__isnull": True})
+            condition |= equal & greater
+            equal &= Q(**{name: value})
+    return condition
+
+
+def _order_by(name: str, order: OrderBy) -> OrderBy:
+    order = order.copy()
+    order.set_source_expressions([F(name)])
+    return order
+
+
+def _orderings(query_set: models.query.QuerySet) -> List[OrderBy]:
+    """Ordering of the query set, ending with the primary key."""
+    if query_set.query.order_by:
+        ordering = list(query_set.query.order_by)
+    elif query_set.query.default_ordering:
+        ordering = list(query_set.model._meta.ordering)
+    else:
+        ordering = []
+
+    orderings = []
+    for field in ordering:
+        if isinstance(field, str):
+            assert field != "?"
+            if field.startswith("-"):
+                orderings.append(F(field[1:]).desc())
+            else:
+                orderings.append(F(field).asc())
+        elif isinstance(field, OrderBy):
+            orderings.append(field)
+        else:
+            orderings.append(field.asc())
+
+    pk = query_set.model._meta.pk.name
+    if not any(
+        isinstance(order.expression, F) and order.expression.name in ["pk", pk]
+        for order in orderings
+    ):
+        orderings.append(F("pk").asc())
+    return orderings
@@ -0,0 +1,114 @@
+# -*- coding: utf-8 -*-
+# vim: ft=python fileencoding=utf-8 sts=4 sw=4 et:
+# Copyright (C) 2016-2022 J. Nathanael Philipp (jnphilipp) <nathanael@philipp.land>
+#
+# This file is part of bibliothek.
+#
+# bibliothek is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# bibliothek is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with bibliothek.  If not, see <http://www.gnu.org/licenses/>.
+"""Bibliothek Django app reading.
+
+The reading list are the acquired editions, issues and papers that have not been
+read, ordered by the date of the acquisition, the ones without a date first. It
+is computed with one query per model, each ordered and limited in the DB, which
+are then merged. Only the objects that made it into the list are loaded.
+"""
+
+import heapq
+
+from bibliothek import fts
+from datetime import date
+from django.apps import apps
+from django.contrib.contenttypes.models import ContentType
+from django.db import models
+from django.db.models import Exists, F, OuterRef
+from itertools import islice
+from typing import Dict, Iterator, List, Optional, Tuple
+
+# Related objects needed to display the objects of every listed model.
+MODELS = {
+    "books.edition": (["book", "book__series"], ["book__authors"]),
+    "magazines.issue": (["magazine"], []),
+    "papers.paper": ([], ["authors"]),
+}
+
+
+def reading_list(
+    limit: Optional[int] = None,
+) -> List[Tuple[str, models.Model, Optional[date]]]:
+    """Reading list.
+
+    Returns the model label, the object and the acquisition date of each entry, an
+    object acquired more than once is listed with each date.
+
+    Args:
+        * limit: maximum number of entries
+    """
+    labels = list(MODELS.keys())
+    streams = [_unread(i, label, limit) for i, label in enumerate(labels)]
+    entries = list(islice(heapq.merge(*streams), limit))
+
+    objs = {
+        label: _objects(label, [pk for day, i, pk, acquired in entries if i == j])
+        for j, label in enumerate(labels)
+    }
+    return [
+        (labels[i], objs[labels[i]][pk], acquired)
+        for day, i, pk, acquired in entries
+        if pk in objs[labels[i]]
+    ]
+
+
+def _objects(label: str, pks: List[int]) -> Dict[int, models.Model]:
+    """Objects of a model by pk, with the related objects needed to display them."""
+    if not pks:
+        return {}
+
+    select_related, prefetch_related = MODELS[label]
+    objs = {}
+    for chunk in fts.chunks(set(pks)):
+        for obj in (
+            apps.get_model(label)
+            .objects.filter(pk__in=chunk)
+            .select_related(*select_related)
+            .prefetch_related(*prefetch_related)
+        ):
+            objs[obj.pk] = obj
+    return objs
+
+
+def _unread(
+    i: int, label: str, limit: Optional[int] = None
+) -> Iterator[Tuple[date, int, int, Optional[date]]]:
+    """Acquisitions of the unread objects of a model, ordered by date."""
+    Acquisition = apps.get_model("shelves.Acquisition")
+    Read = apps.get_model("shelves.Read")
+
+    content_type = ContentType.objects.get_for_model(apps.get_model(label))
+    query_set = (
+        Acquisition.objects.filter(content_type=content_type)
+        .filter(
+            ~Exists(
+                Read.objects.filter(
+                    content_type=content_type, object_id=OuterRef("object_id")
+                )
+            )
+        )
+        .order_by(F("date").asc(nulls_first=True), "object_id")
+        .values_list("date", "object_id")
+        .distinct()
+    )
+    if limit is not None:
+        query_set = query_set[:limit]
+    for acquired, pk in query_set:
+        yield acquired or date.min, i, pk, acquired
@@ -0,0 +1,248 @@
+# -*- coding: utf-8 -*-
+# vim: ft=python fileencoding=utf-8 sts=4 sw=4 et:
+# Copyright (C) 2016-2022 J. Nathanael Philipp (jnphilipp) <nathanael@philipp.land>
+#
+# This file is part of bibliothek.
+#
+# bibliothek is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# bibliothek is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with bibliothek.  If not, see <http://www.gnu.org/licenses/>.
+"""Bibliothek Django app in-memory search index.
+
+Keeps the searchable text of all editions, papers and issues with files in
+memory, so that a search, e. g. of the GNOME search provider on every keystroke,
+does not have to query the DB. The index is refreshed incrementally whenever
+another connection committed to the DB, which SQLite reports with
+`PRAGMA data_version`.
+"""
+
+from bibliothek import db, fts
+from bibliothek.models import Tombstone
+from datetime import datetime, timedelta
+from django.apps import apps
+from django.contrib.contenttypes.models import ContentType
+from django.db import connection, models
+from django.db.models import Q
+from django.utils import timezone
+from typing import Dict, Iterable, List, Optional, Tuple
+
+# Prefixes of the result ids and the related objects, whose changes change the
+# searchable text, for every indexed model.
+MODELS = {
+    "books.edition": (
+        "edition",
+        ["", "book__", "book__authors__", "book__series__", "persons__", "files__"],
+    ),
+    "papers.paper": ("paper", ["", "authors__", "journal__", "files__"]),
+    "magazines.issue": ("issue", ["", "magazine__", "files__"]),
+}
+
+# Related objects needed to display the objects of every indexed model.
+RELATED = {
+    "books.edition": (["book", "book__series"], ["book__authors"]),
+    "papers.paper": ([], ["authors"]),
+    "magazines.issue": (["magazine"], []),
+}
+
+
+class SearchIndex:
+    """In-memory search index of editions, papers and issues with files.
+
+    Args:
+        * max_age: time after which the index is rebuilt from scratch, this picks
+          up changes that are not tracked by `updated_at`, e. g. removed files
+        * overlap: time the incremental refresh looks further back, to include
+          changes of transactions that were still running at the last refresh
+    """
+
+    def __init__(
+        self,
+        max_age: timedelta = timedelta(minutes=15),
+        overlap: timedelta = timedelta(minutes=1),
+    ):
+        """Init."""
+        self.max_age = max_age
+        self.overlap = overlap
+        self._entries: Dict[str, Dict[int, str]] = {
+            label: {} for label in MODELS.keys()
+        }
+        self._version: Optional[Tuple[int, int]] = None
+        self._rebuilt_at: Optional[datetime] = None
+        self._refreshed_at: Optional[datetime] = None
+
+    def __len__(self) -> int:
+        """Number of indexed objects."""
+        return sum([len(entries) for entries in self._entries.values()])
+
+    def refresh(self, force: bool = False) -> bool:
+        """Refresh the index if the DB has changed.
+
+        Returns True if the index was refreshed.
+
+        Args:
+            * force: refresh even if the DB seems unchanged
+        """
+        version = db.data_version()
+        if not force and version is not None and version == self._version:
+            return False
+
+        now = timezone.now()
+        if self._rebuilt_at is None or now - self._rebuilt_at > self.max_age:
+            self.rebuild()
+        else:
+            since = self._refreshed_at - self.overlap
+            for label in MODELS.keys():
+                q = Q()
+                for path in MODELS[label][1]:
+                    q |= Q(**{f"{path}updated_at__gte": since})
+                self._update(
+                    label,
+                    apps.get_model(label)
+                    .objects.filter(q)
+                    .values_list("pk", flat=True)
+                    .distinct(),
+                )
+
+            for app_label, model, pk in Tombstone.objects.filter(
+                deleted_at__gte=since
+            ).values_list(
+                "content_type__app_label", "content_type__model", "object_id"
+            ):
+                if f"{app_label}.{model}" in self._entries:
+                    self._entries[f"{app_label}.{model}"].pop(pk, None)
+        self._version = version
+        self._refreshed_at = now
+        return True
+
+    def rebuild(self):
+        """Rebuild the index from scratch."""
+        now = timezone.now()
+        for label in MODELS.keys():
+            self._entries[label] = dict(_content(label))
+        self._rebuilt_at = now
+        self._refreshed_at = now
+
+    def search(self, terms: Iterable[str]) -> List[str]:
+        """Search for the given terms.
+
+        Every term has to be contained in the searchable text of an object, case
+        insensitive. Returns the result ids, e. g. `edition-1`.
+
+        Args:
+            * terms: search terms
+        """
+        self.refresh()
+        words = [w for term in terms for w in term.lower().split()]
+        results = []
+        for label, entries in self._entries.items():
+            matches = list(entries.items())
+            for word in words:
+                matches = [(pk, text) for pk, text in matches if word in text]
+            results += [f"{MODELS[label][0]}-{pk}" for pk, text in matches]
+        return results
+
+    def subsearch(
+        self, previous_results: Iterable[str], terms: Iterable[str]
+    ) -> List[str]:
+        """Narrow previous results down to those matching the given terms.
+
+        Only the previous results are matched, so that refining a search gets
+        cheaper with every added word instead of searching everything again.
+
+        Args:
+            * previous_results: result ids of a previous search
+            * terms: search terms, a refinement of the previous search terms
+        """
+        self.refresh()
+        words = [w for term in terms for w in term.lower().split()]
+        results = []
+        for result in previous_results:
+            parsed = parse_id(result)
+            if parsed is None:
+                continue
+            text = self._entries[parsed[0]].get(parsed[1])
+            if text is not None and all([w in text for w in words]):
+                results.append(result)
+        return results
+
+    def _update(self, label: str, pks: Iterable[int]):
+        pks = list(pks)
+        entries = self._entries[label]
+        for pk in pks:
+            entries.pop(pk, None)
+        entries.update(_content(label, pks))
+
+
+def get_objects(ids: Iterable[str]) -> Dict[str, models.Model]:
+    """Get the objects of result ids.
+
+    Fetches the objects with one query per model, together with the related
+    objects needed to display them.
+
+    Args:
+        * ids: result ids, e. g. `edition-1`
+    """
+    pks: Dict[str, List[int]] = {label: [] for label in MODELS.keys()}
+    for id in ids:
+        parsed = parse_id(id)
+        if parsed is not None:
+            pks[parsed[0]].append(parsed[1])
+
+    objs = {}
+    for label, label_pks in pks.items():
+        if not label_pks:
+            continue
+        select_related, prefetch_related = RELATED[label]
+        for obj in (
+            apps.get_model(label)
+            .objects.filter(pk__in=label_pks)
+            .select_related(*select_related)
+            .prefetch_related(*prefetch_related)
+        ):
+            objs[f"{MODELS[label][0]}-{obj.pk}"] = obj
+    return objs
+
+
+def parse_id(id: str) -> Optional[Tuple[str, int]]:
+    """Parse result id into model label and primary key, None if not valid."""
+    prefix, sep, pk = id.partition("-")
+    for label in MODELS.keys():
+        if MODELS[label][0] == prefix and pk.isdigit():
+            return label, int(pk)
+    return None
+
+
+def _content(label: str, pks: Optional[List[int]] = None) -> List[Tuple[int, str]]:
+    """Searchable text of the objects of a model with files."""
+    from files.models import File
+
+    model = apps.get_model(label)
+    sql = (
+        f"{fts.content(label)} WHERE EXISTS (SELECT 1 FROM {File._meta.db_table} f "
+        + "WHERE f.content_type_id = %s AND f.object_id = t.id)"
+    )
+    params = [ContentType.objects.get_for_model(model).pk]
+
+    if pks is None:
+        queries = [(sql, params)]
+    else:
+        queries = [
+            (f"{sql} AND t.id IN ({', '.join(['%s'] * len(chunk))})", params + chunk)
+            for chunk in fts.chunks(pks)
+        ]
+
+    rows = []
+    with connection.cursor() as cursor:
+        for query, query_params in queries:
+            cursor.execute(query, query_params)
+            rows += [(row[1], row[2].lower()) for row in cursor.fetchall()]
+    return rows
@@ -29,11 +29,49 @@ https://docs.djangoproject.com/en/4.0/ref/settings/
 """
 
 import os
+import secrets
 import sys
 
-from gi.repository import GLib
 from importlib.util import module_from_spec, spec_from_file_location
 from pathlib import Path
+from tempfile import mkstemp
+
+
+def xdg_dir(env: str, default: str) -> Path:
+    """XDG base dir, the same way GLib resolves it, i. e. without loading GLib."""
+    if os.environ.get(env) and os.path.isabs(os.environ[env]):
+        return Path(os.environ[env])
+    return Path.home() / default
+
+
+def secret_key(path: Path) -> str:
+    """Secret key stored in the file, a new one is stored if there is none yet.
+
+    An empty file, e. g. one left half-written, counts as missing. The file is
+    replaced atomically. If it can not be written, the new key is only used for
+    this run.
+    """
+    try:
+        key = path.read_text(encoding="utf8").strip()
+    except OSError:
+        key = ""
+    if key:
+        return key
+
+    key = secrets.token_hex(64)
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp_path = mkstemp(dir=path.parent, prefix=f".{path.name}.")
+        try:
+            with os.fdopen(fd, "w", encoding="utf8") as f:
+                f.write(f"{key}\n")
+            os.replace(tmp_path, path)
+        except OSError:
+            os.unlink(tmp_path)
+            raise
+    except OSError:
+        pass
+    return key
 
 
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
@@ -45,17 +83,17 @@ APP_IDENTIFIER = "bibliothek"
 
 
 # XDG config
-XDG_CONFIG_DIR = Path(GLib.get_user_config_dir())
+XDG_CONFIG_DIR = xdg_dir("XDG_CONFIG_HOME", ".config")
 APP_CONFIG_DIR = XDG_CONFIG_DIR / APP_IDENTIFIER
 
 
 # XDG cache
-XDG_CACHE_DIR = Path(GLib.get_user_cache_dir())
+XDG_CACHE_DIR = xdg_dir("XDG_CACHE_HOME", ".cache")
 APP_CACHE_DIR = XDG_CACHE_DIR / APP_IDENTIFIER
 
 
 # XDG data
-XDG_DATA_DIR = Path(GLib.get_user_data_dir())
+XDG_DATA_DIR = xdg_dir("XDG_DATA_HOME", ".local/share")
 APP_DATA_DIR = XDG_DATA_DIR / APP_IDENTIFIER
 
 
@@ -63,7 +101,7 @@ APP_DATA_DIR = XDG_DATA_DIR / APP_IDENTIFIER
 # See https://docs.djangoproject.com/en/4.0/howto/deployment/checklist/
 
 # SECURITY WARNING: keep the secret key used in production secret!
-SECRET_KEY = "".join(["%02x" % h for h in os.urandom(4096)])
+SECRET_KEY = secret_key(APP_CONFIG_DIR / "secret_key")
 
 
 # SECURITY WARNING: don't run with debug turned on in production!
@@ -0,0 +1,104 @@
+# -*- coding: utf-8 -*-
+# vim: ft=python fileencoding=utf-8 sts=4 sw=4 et:
+# Copyright (C) 2016-2022 J. Nathanael Philipp (jnphilipp) <nathanael@philipp.land>
+#
+# This file is part of bibliothek.
+#
+# bibliothek is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# bibliothek is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with bibliothek.  If not, see <http://www.gnu.org/licenses/>.
+"""Bibliothek Django app signals."""
+
+from bibliothek import fts
+from bibliothek.models import Tombstone
+from books.models import Book, Edition
+from django.contrib.contenttypes.models import ContentType
+from django.db.models.signals import m2m_changed, post_delete, post_save, pre_delete
+from django.dispatch import receiver
+from journals.models import Journal
+from magazines.models import Issue, Magazine
+from papers.models import Paper, Proceedings
+from persons.models import Person
+from series.models import Series
+from shelves.models import Acquisition, Read
+
+
+@receiver(pre_delete, sender=Acquisition)
+@receiver(pre_delete, sender=Book)
+@receiver(pre_delete, sender=Edition)
+@receiver(pre_delete, sender=Issue)
+@receiver(pre_delete, sender=Magazine)
+@receiver(pre_delete, sender=Paper)
+@receiver(pre_delete, sender=Read)
+def create_tombstone(sender, instance, **kwargs):
+    """Create tombstone when deleting an object exported by the delta export."""
+    Tombstone.objects.create(
+        name=str(instance),
+        content_type=ContentType.objects.get_for_model(sender),
+        object_id=instance.pk,
+    )
+
+
+@receiver(post_save, sender=Book)
+@receiver(post_save, sender=Edition)
+@receiver(post_save, sender=Issue)
+@receiver(post_save, sender=Journal)
+@receiver(post_save, sender=Magazine)
+@receiver(post_save, sender=Paper)
+@receiver(post_save, sender=Person)
+@receiver(post_save, sender=Proceedings)
+@receiver(post_save, sender=Series)
+def update_fts(sender, instance, **kwargs):
+    """Update full-text index when saving an object."""
+    fts.update(sender, [instance.pk])
+
+
+@receiver(m2m_changed, sender=Book.authors.through)
+@receiver(m2m_changed, sender=Edition.persons.through)
+@receiver(m2m_changed, sender=Paper.authors.through)
+@receiver(m2m_changed, sender=Proceedings.editors.through)
+def update_fts_m2m(sender, instance, action, reverse, model, pk_set, **kwargs):
+    """Update full-text index when changing authors, editors or persons."""
+    if not reverse and action in ["post_add", "post_remove", "post_clear"]:
+        fts.update(type(instance), [instance.pk])
+    elif reverse and action in ["post_add", "post_remove"]:
+        fts.update(model, pk_set)
+    elif reverse and action == "pre_clear":
+        instance._fts_dependents = fts.dependents(type(instance), [instance.pk])
+    elif reverse and action == "post_clear":
+        for dependent, pks in getattr(instance, "_fts_dependents", []):
+            fts.update(dependent, pks)
+
+
+@receiver(pre_delete, sender=Journal)
+@receiver(pre_delete, sender=Magazine)
+@receiver(pre_delete, sender=Person)
+@receiver(pre_delete, sender=Series)
+def collect_fts_dependents(sender, instance, **kwargs):
+    """Collect objects to update in the full-text index before deleting."""
+    instance._fts_dependents = fts.dependents(sender, [instance.pk])
+
+
+@receiver(post_delete, sender=Book)
+@receiver(post_delete, sender=Edition)
+@receiver(post_delete, sender=Issue)
+@receiver(post_delete, sender=Journal)
+@receiver(post_delete, sender=Magazine)
+@receiver(post_delete, sender=Paper)
+@receiver(post_delete, sender=Person)
+@receiver(post_delete, sender=Proceedings)
+@receiver(post_delete, sender=Series)
+def delete_fts(sender, instance, **kwargs):
+    """Remove deleted object from the full-text index, update dependent objects."""
+    fts.delete(sender, [instance.pk])
+    for dependent, pks in getattr(instance, "_fts_dependents", []):
+        fts.update(dependent, pks)
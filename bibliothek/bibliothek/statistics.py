@@ -0,0 +1,205 @@
+# -*- coding: utf-8 -*-
+# vim: ft=python fileencoding=utf-8 sts=4 sw=4 et:
+# Copyright (C) 2016-2022 J. Nathanael Philipp (jnphilipp) <nathanael@philipp.land>
+#
+# This file is part of bibliothek.
+#
+# bibliothek is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# bibliothek is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with bibliothek.  If not, see <http://www.gnu.org/licenses/>.
+"""Bibliothek Django app statistics.
+
+The counts are computed with one aggregate query per model and one grouped query
+per breakdown. Reads in a year are selected by date ranges, which unlike
+`__year` can use an index. The results are cached until the DB changes, i. e.
+until this connection writes to it, which includes bulk writes, or another
+connection commits to it.
+"""
+
+from bibliothek import db
+from datetime import date
+from django.apps import apps
+from django.contrib.contenttypes.models import ContentType
+from django.db import connection
+from django.db.models import Count, Exists, F, Func, OuterRef, Q, Sum
+from django.db.models.functions import ExtractYear
+from typing import Dict, List, Optional, Tuple
+
+_cache: Dict[int, Dict] = {}
+_version: Optional[Tuple[int, int, int]] = None
+
+
+def statistics(year: Optional[int] = None) -> Dict:
+    """Statistics of the library.
+
+    Returns a dict with:
+        * `totals`: number of objects, of read objects and of objects read in the
+          year per model label
+        * `years`: number of objects finished reading per year and model label
+        * `genres`: name, number of books and number of read books per genre
+        * `languages`: name, number of editions and papers and how many of them
+          were read per language
+        * `spending`: number of acquisitions and their total price per year
+
+    Args:
+        * year: year of the reads in `totals`, default the current year
+    """
+    global _version
+
+    year = year or date.today().year
+    version = _data_version()
+    if version is None or version != _version:
+        _cache.clear()
+        _version = version
+    if year not in _cache:
+        _cache[year] = {
+            "totals": _totals(year),
+            "years": _years(),
+            "genres": _genres(),
+            "languages": _languages(),
+            "spending": _spending(),
+        }
+    return _cache[year]
+
+
+def clear_cache():
+    """Drop the cached statistics."""
+    global _version
+
+    _cache.clear()
+    _version = None
+
+
+def _data_version() -> Optional[Tuple[int, int, int]]:
+    """Data version of the DB including the changes made by this connection."""
+    version = db.data_version()
+    if version is None:
+        return None
+    return version + (connection.connection.total_changes,)
+
+
+def _reads(
+    label: str, year: Optional[int] = None, pk: OuterRef = OuterRef("pk")
+) -> Exists:
+    """Whether an object of a model was read, optional finished in the year."""
+    Read = apps.get_model("shelves.Read")
+    content_type = ContentType.objects.get_for_model(apps.get_model(label))
+    query_set = Read.objects.filter(content_type=content_type, object_id=pk)
+    if year is not None:
+        query_set = query_set.filter(
+            finished__gte=date(year, 1, 1), finished__lt=date(year + 1, 1, 1)
+        )
+    return Exists(query_set)
+
+
+def _book_reads(year: Optional[int] = None, pk: OuterRef = OuterRef("pk")) -> Exists:
+    """Whether an edition of a book was read, optional finished in the year."""
+    return Exists(
+        apps.get_model("books.Edition")
+        .objects.filter(book=pk)
+        .filter(_reads("books.edition", year))
+    )
+
+
+def _magazine_reads(year: Optional[int] = None) -> Exists:
+    """Whether an issue of a magazine was read, optional finished in the year."""
+    return Exists(
+        apps.get_model("magazines.Issue")
+        .objects.filter(magazine=OuterRef("pk"))
+        .filter(_reads("magazines.issue", year))
+    )
+
+
+def _totals(year: int) -> Dict[str, Tuple[int, int, int]]:
+    totals = {}
+    for label, reads in [
+        ("books.book", _book_reads),
+        ("books.edition", lambda y=None: _reads("books.edition", y)),
+        ("magazines.magazine", _magazine_reads),
+        ("magazines.issue", lambda y=None: _reads("magazines.issue", y)),
+        ("papers.paper", lambda y=None: _reads("papers.paper", y)),
+    ]:
+        counts = apps.get_model(label).objects.aggregate(
+            count=Count("pk"),
+            read=Count("pk", filter=Q(reads())),
+            read_year=Count("pk", filter=Q(reads(year))),
+        )
+        totals[label] = (counts["count"], counts["read"], counts["read_year"])
+    return totals
+
+
+def _years() -> Dict[int, Dict[str, int]]:
+    models = {
+        ContentType.objects.get_for_model(apps.get_model(label)).pk: label
+        for label in ["books.edition", "magazines.issue", "papers.paper"]
+    }
+    years: Dict[int, Dict[str, int]] = {}
+    for row in (
+        apps.get_model("shelves.Read")
+        .objects.filter(finished__isnull=False, content_type__in=models.keys())
+        .annotate(year=ExtractYear("finished"))
+        .values("year", "content_type")
+        .annotate(count=Count("object_id", distinct=True))
+        .order_by("year")
+    ):
+        years.setdefault(row["year"], {label: 0 for label in models.values()})
+        years[row["year"]][models[row["content_type"]]] = row["count"]
+    return years
+
+
+def _genres() -> List[Tuple[str, int, int]]:
+    through = apps.get_model("books.Book").genres.through
+    return [
+        (row["genre__name"], row["count"], row["read"])
+        for row in through.objects.values("genre__name")
+        .annotate(
+            count=Count("book", distinct=True),
+            read=Count(
+                "book",
+                filter=Q(_book_reads(pk=OuterRef("book"))),
+                distinct=True,
+            ),
+        )
+        .order_by(Func(F("genre__name"), function="LOWER"))
+    ]
+
+
+def _languages() -> List[Tuple[str, int, int]]:
+    languages: Dict[str, List[int]] = {}
+    for label, field in [("books.edition", "edition"), ("papers.paper", "paper")]:
+        through = apps.get_model(label).languages.through
+        for row in through.objects.values("language__name").annotate(
+            count=Count(field, distinct=True),
+            read=Count(
+                field,
+                filter=Q(_reads(label, pk=OuterRef(field))),
+                distinct=True,
+            ),
+        ):
+            counts = languages.setdefault(row["language__name"], [0, 0])
+            counts[0] += row["count"]
+            counts[1] += row["read"]
+    return [
+        (name, counts[0], counts[1])
+        for name, counts in sorted(languages.items(), key=lambda x: x[0].lower())
+    ]
+
+
+def _spending() -> List[Tuple[Optional[int], int, float]]:
+    return [
+        (row["year"], row["count"], row["price"])
+        for row in apps.get_model("shelves.Acquisition")
+        .objects.annotate(year=ExtractYear("date"))
+        .values("year")
+        .annotate(count=Count("pk"), price=Sum("price"))
+        .order_by(F("year").asc(nulls_first=True))
+    ]
@@ -18,17 +18,134 @@
 # along with bibliothek.  If not, see <http://www.gnu.org/licenses/>.
 """Bibliothek Django app stdout."""
 
+import csv
+import json
 import sys
+import unicodedata
 
-from typing import List, Optional, Sequence, TextIO, Union
+from bibliothek.utils import lookahead
+from django.template.defaultfilters import slugify
+from django.utils import translation
+from typing import Any, Iterable, List, Optional, Sequence, TextIO, Tuple, Union
+
+FORMATS = ["table", "json", "jsonl", "csv", "tsv"]
+
+
+class TableWriter:
+    """Write rows formatted as table.
+
+    The column layout is computed once. A cell longer than its column is wrapped at
+    the last space in the column, or cut if there is none, and continued in the
+    next line. Lengths are measured in terminal cells, wide characters take two,
+    combining characters none. The lines are buffered and written to the file on
+    `flush`, or when the buffer is full.
+
+    Args:
+        * positions: end of the columns as fraction of the line length, the last
+          column always ends at the end of the line
+        * line_length: line length
+        * file: file to write to, default sys.stdout
+        * buffer_size: number of characters to buffer before writing
+    """
+
+    def __init__(
+        self,
+        positions: Sequence[float] = (),
+        line_length: int = 100,
+        file: Optional[TextIO] = None,
+        buffer_size: int = 65536,
+    ):
+        """Init."""
+        assert line_length > 0
+
+        positions = list(positions)
+        if len(positions) == 0 or positions[-1] <= 1.0:
+            positions.append(1.0)
+        self.positions = [int(line_length * pos) for pos in positions]
+        self.starts = [0] + self.positions[:-1]
+        self.widths = [end - start for start, end in zip(self.starts, self.positions)]
+        self.line_length = line_length
+        self.file = sys.stdout if file is None else file
+        self.buffer_size = buffer_size
+        self._buffer: List[str] = []
+        self._size = 0
+
+    def __enter__(self) -> "TableWriter":
+        """Enter."""
+        return self
+
+    def __exit__(self, *args):
+        """Exit, flushes the buffer."""
+        self.flush()
+
+    def flush(self):
+        """Write the buffered lines to the file."""
+        if self._buffer:
+            self.file.write("".join(self._buffer))
+            self._buffer = []
+            self._size = 0
+
+    def write(self, fields: Union[Sequence, str], after: Optional[str] = "_"):
+        """Write a row.
+
+        Args:
+            * fields: fields of the row, a single field if not a list
+            * after: if not empty symbol to write after as last line
+        """
+        assert after is None or len(after) == 0 or len(after) == 1
+
+        if isinstance(fields, str) or not isinstance(fields, list):
+            fields = [fields]
+
+        cells = [str(field) if field else "" for field in fields]
+        while cells:
+            line = []
+            wrapped: Optional[List[str]] = None
+            for i, (cell, width, start) in enumerate(
+                zip(cells, self.widths, self.starts)
+            ):
+                if len(cell) <= width and cell.isascii():
+                    line.append(cell.ljust(width))
+                    continue
+                cell, rest = _wrap(cell, width, start)
+                line.append(cell)
+                if rest:
+                    if wrapped is None:
+                        wrapped = [""] * len(cells)
+                    wrapped[i] = rest
+            self._write("".join(line))
+            cells = wrapped
+        if after:
+            self._write(after * self.line_length)
+
+    def write_table(self, header: Optional[Sequence], rows: Iterable[Sequence]):
+        """Write a table, i. e. a header and rows separated by lines.
+
+        The rows are streamed from the iterable, the buffer is flushed at the end.
+
+        Args:
+            * header: fields of the header, no header if None
+            * rows: rows to write
+        """
+        if header is not None:
+            self.write(list(header), "=")
+        for row, has_next in lookahead(rows):
+            self.write(list(row), "_" if has_next else "=")
+        self.flush()
+
+    def _write(self, line: str):
+        self._buffer.append(f"{line}\n")
+        self._size += len(line) + 1
+        if self._size >= self.buffer_size:
+            self.flush()
 
 
 def write(
     fields: Union[Sequence, str],
     after: Optional[str] = "_",
-    positions: List[float] = [],
+    positions: Sequence[float] = (),
     line_length: int = 100,
-    file: TextIO = sys.stdout,
+    file: Optional[TextIO] = None,
 ):
     """Write fields formatted as table to file.
 
@@ -39,37 +156,152 @@ def write(
         * line_length: line length
         * file: file to write to, default sys.stdout
     """
-    assert after is None or len(after) == 0 or len(after) == 1
-    assert len(positions) == 0 or [pos > 1.0 for pos in positions]
-    assert line_length > 0
-
-    if len(positions) == 0 or positions[-1] <= 1.0:
-        positions += [1.0]
-
-    if isinstance(fields, str) or not isinstance(fields, list):
-        fields = [fields]
-
-    def _write(fields: Sequence, positions: List[int]):
-        line = ""
-        rfields = []
-        for i in range(len(fields)):
-            line += str(fields[i]) if fields[i] else ""
-
-            if len(line) > positions[i]:
-                rf = line.rfind(" ", positions[i - 1] if i > 0 else 0, positions[i])
-                if rf > 0:
-                    rfields.append(line[rf + 1 :])
-                    line = line[:rf]
-                else:
-                    rfields.append(line[positions[i] :])
-                    line = line[: positions[i]]
+    with TableWriter(positions, line_length, file) as writer:
+        writer.write(fields, after)
+
+
+class JSONWriter:
+    """Write rows as JSON objects, keyed by the header.
+
+    Args:
+        * lines: write one object per line (JSON Lines) instead of an array
+        * file: file to write to, default sys.stdout
+    """
+
+    def __init__(self, lines: bool = False, file: Optional[TextIO] = None):
+        """Init."""
+        self.lines = lines
+        self.file = sys.stdout if file is None else file
+
+    def write_table(self, header: Optional[Sequence], rows: Iterable[Sequence]):
+        """Write a table, the rows are streamed from the iterable.
+
+        Args:
+            * header: fields of the header, used as keys, rows are written as
+              arrays if None
+            * rows: rows to write
+        """
+        keys = None if header is None else _keys(header)
+        empty = True
+        if not self.lines:
+            self.file.write("[")
+        for row in rows:
+            values = [_json_value(value) for value in row]
+            obj = values if keys is None else dict(zip(keys, values))
+            line = json.dumps(obj, ensure_ascii=False)
+            if self.lines:
+                self.file.write(line + "\n")
             else:
-                rfields.append("")
-            line += " " * (positions[i] - len(line))
-        file.write(f"{line}\n")
-        if max([f != "" for f in rfields]):
-            _write(rfields, positions)
-
-    _write(fields, [int(line_length * pos) for pos in positions])
-    if after:
-        file.write(f"{after * line_length}\n")
+                self.file.write(("\n" if empty else ",\n") + line)
+            empty = False
+        if not self.lines:
+            self.file.write("]\n" if empty else "\n]\n")
+
+
+class CSVWriter:
+    """Write rows as CSV.
+
+    Args:
+        * delimiter: field delimiter
+        * file: file to write to, default sys.stdout
+    """
+
+    def __init__(self, delimiter: str = ",", file: Optional[TextIO] = None):
+        """Init."""
+        self.delimiter = delimiter
+        self.file = sys.stdout if file is None else file
+
+    def write_table(self, header: Optional[Sequence], rows: Iterable[Sequence]):
+        """Write a table, the rows are streamed from the iterable.
+
+        Args:
+            * header: fields of the header, used as column names, no header row if
+              None
+            * rows: rows to write
+        """
+        writer = csv.writer(self.file, delimiter=self.delimiter, lineterminator="\n")
+        if header is not None:
+            writer.writerow(_keys(header))
+        writer.writerows(rows)
+
+
+def table_writer(
+    format: str = "table",
+    positions: Sequence[float] = (),
+    file: Optional[TextIO] = None,
+) -> Union[TableWriter, JSONWriter, CSVWriter]:
+    """Get a writer for tables in the given format.
+
+    All writers have a `write_table(header, rows)` method. Only the table format
+    wraps text, the others write each row as is.
+
+    Args:
+        * format: output format, one of `FORMATS`
+        * positions: column positions for the table format
+        * file: file to write to, default sys.stdout
+    """
+    assert format in FORMATS
+
+    if format == "json" or format == "jsonl":
+        return JSONWriter(format == "jsonl", file)
+    elif format == "csv" or format == "tsv":
+        return CSVWriter("," if format == "csv" else "\t", file)
+    return TableWriter(positions, file=file)
+
+
+def _json_value(value: Any) -> Any:
+    if value is None or isinstance(value, (bool, int, float)):
+        return value
+    return str(value)
+
+
+def _keys(header: Sequence) -> List[str]:
+    """Column names from the untranslated header, e.g. `number_of_books`."""
+    with translation.override(None):
+        return [slugify(str(field)).replace("-", "_") for field in header]
+
+
+def _char_width(c: str) -> int:
+    if unicodedata.combining(c):
+        return 0
+    return 2 if unicodedata.east_asian_width(c) in ("F", "W") else 1
+
+
+def _width(text: str) -> int:
+    """Length of the text in terminal cells."""
+    if text.isascii():
+        return len(text)
+    return sum([_char_width(c) for c in text])
+
+
+def _wrap(text: str, width: int, start: int) -> Tuple[str, str]:
+    """Split text into the part fitting into a column, padded, and the rest.
+
+    Args:
+        * text: text of the cell
+        * width: width of the column
+        * start: start of the column in the line
+    """
+    if text.isascii():
+        if len(text) <= width:
+            return text + " " * (width - len(text)), ""
+        end = width
+    else:
+        end = 0
+        length = 0
+        for c in text:
+            length += _char_width(c)
+            if length > width:
+                break
+            end += 1
+        if end == len(text):
+            return text + " " * (width - length), ""
+        # a wide character wider than the column is put into it nevertheless
+        end = max(end, 1)
+
+    i = text.rfind(" ", 0, end)
+    if i >= 0 and start + i > 0:
+        cell, rest = text[:i], text[i + 1 :]
+    else:
+        cell, rest = text[:end], text[end:]
+    return cell + " " * (width - _width(cell)), rest
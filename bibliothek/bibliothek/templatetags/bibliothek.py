@@ -18,6 +18,7 @@
 # along with bibliothek.  If not, see <http://www.gnu.org/licenses/>.
 
 from django.template import Library
+from django.urls import reverse
 
 register = Library()
 
@@ -30,3 +31,8 @@ def startswith(value, start):
 @register.filter
 def endswith(value, end):
     return value.endswith(end)
+
+
+@register.simple_tag
+def thumbnail(image, size=256):
+    return reverse("thumbnail", args=[size, image.name])
@@ -0,0 +1,83 @@
+# -*- coding: utf-8 -*-
+# vim: ft=python fileencoding=utf-8 sts=4 sw=4 et:
+# Copyright (C) 2016-2022 J. Nathanael Philipp (jnphilipp) <nathanael@philipp.land>
+#
+# This file is part of bibliothek.
+#
+# bibliothek is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# bibliothek is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with bibliothek.  If not, see <http://www.gnu.org/licenses/>.
+
+from argparse import ArgumentParser
+from bibliothek import batch
+from books import argparse
+from books.models import Book
+from django.test import TestCase
+from io import StringIO
+
+
+class BatchTestCase(TestCase):
+    def setUp(self):
+        self.parser = ArgumentParser(prog="bibliothek")
+        self.parser.add_argument("--format", default="table")
+        subparser = self.parser.add_subparsers(dest="subparser")
+        argparse.add_subparser(subparser)
+
+    def test_parse(self):
+        self.assertIsNone(batch.parse("  # comment\n"))
+        self.assertEquals(
+            ["book", "add", "Some Title", "--author", "A B"],
+            batch.parse('book add "Some Title" --author "A B"  # new\n'),
+        )
+        self.assertEquals(
+            ["book", "add", 'Title "with" #'],
+            batch.parse('["book", "add", "Title \\"with\\" #"]\n'),
+        )
+        with self.assertRaises(ValueError):
+            batch.parse('["book", 1]')
+        with self.assertRaises(ValueError):
+            batch.parse('["book"')
+
+    def test_run(self):
+        lines = [
+            "# books\n",
+            'book add "Title 1"\n',
+            "\n",
+            '["book", "add", "Title 2"]\n',
+            "book foo\n",
+            "book\n",
+            'book edit "Title 2" title "Title 3"\n',
+            "book list\n",
+        ]
+        counts = []
+        file = StringIO()
+        results = batch.run(self.parser, lines, 3, file, progress=counts.append)
+        self.assertEquals([2, 4, 5, 6, 7, 8], [r[0] for r in results])
+        self.assertEquals([3, 6], counts)
+        self.assertEquals(["book", "add", "Title 2"], results[1][1])
+        self.assertIsNone(results[0][2])
+        self.assertIsNone(results[1][2])
+        self.assertIn("invalid choice: 'foo'", results[2][2])
+        self.assertEquals("No command given.", results[3][2])
+        self.assertIsNone(results[4][2])
+        self.assertIsNone(results[5][2])
+        self.assertEquals(
+            ["Title 1", "Title 3"], list(Book.objects.values_list("title", flat=True))
+        )
+        self.assertIn("Title 3", file.getvalue())
+
+    def test_run_error(self):
+        results = batch.run(self.parser, ["book add Title\n", "book list\n"], 10)
+        self.assertEquals([None, None], [r[2] for r in results])
+
+        results = batch.run(self.parser, ["book list\n"], exclude=["list"])
+        self.assertEquals('Command "list" is not allowed in a batch.', results[0][2])
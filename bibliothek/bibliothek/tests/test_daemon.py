@@ -0,0 +1,143 @@
+# -*- coding: utf-8 -*-
+# vim: ft=python fileencoding=utf-8 sts=4 sw=4 et:
+# Copyright (C) 2016-2022 J. Nathanael Philipp (jnphilipp) <nathanael@philipp.land>
+#
+# This file is part of bibliothek.
+#
+# bibliothek is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# bibliothek is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with bibliothek.  If not, see <http://www.gnu.org/licenses/>.
+
+import os
+import sys
+import threading
+
+from argparse import ArgumentParser
+from bibliothek import daemon, fts
+from books import argparse
+from books.models import Book
+from django.test import SimpleTestCase, TestCase
+from io import BytesIO
+from pathlib import Path
+from tempfile import TemporaryDirectory
+from typing import List, TextIO
+from unittest import mock
+
+
+def main(argv: List[str], file: TextIO):
+    if argv[0] == "cwd":
+        file.write(f"{os.getcwd()}\n")
+    elif argv[0] == "echo":
+        file.write(" ".join(argv[1:]) * 10000 + "\n")
+        print("done", file=sys.stderr)
+    elif argv[0] == "exit":
+        sys.exit(int(argv[1]))
+    else:
+        raise ValueError(argv[0])
+
+
+class DaemonTestCase(SimpleTestCase):
+    def test_forward(self):
+        with TemporaryDirectory() as tmpdir:
+            path = Path(tmpdir) / "daemon.sock"
+            self.assertIsNone(daemon.forward(["echo"], path))
+            self.assertFalse(daemon.stop(path))
+
+            thread = threading.Thread(target=daemon.serve, args=(main, path))
+            thread.start()
+            try:
+                while not path.exists():
+                    thread.join(0.01)
+
+                out, err = BytesIO(), BytesIO()
+                self.assertEquals(0, daemon.forward(["echo", "ä"], path, out, err))
+                self.assertEquals("ä" * 10000 + "\n", out.getvalue().decode("utf8"))
+                self.assertEquals(b"done\n", err.getvalue())
+
+                # reads from stdin, has to run locally
+                out, err = BytesIO(), BytesIO()
+                self.assertIsNone(daemon.forward(["echo", "-"], path, out, err))
+                self.assertEquals(b"", out.getvalue())
+
+                out, err = BytesIO(), BytesIO()
+                self.assertEquals(3, daemon.forward(["exit", "3"], path, out, err))
+                self.assertEquals(b"", out.getvalue())
+
+                out, err = BytesIO(), BytesIO()
+                self.assertEquals(1, daemon.forward(["foo"], path, out, err))
+                self.assertIn(b"ValueError: foo", err.getvalue())
+
+                cwd = os.getcwd()
+                os.chdir(tmpdir)
+                try:
+                    out, err = BytesIO(), BytesIO()
+                    self.assertEquals(0, daemon.forward(["cwd"], path, out, err))
+                finally:
+                    os.chdir(cwd)
+                self.assertEquals(
+                    os.path.realpath(tmpdir), out.getvalue().decode("utf8").strip()
+                )
+                self.assertEquals(cwd, os.getcwd())
+
+                with self.assertRaises(RuntimeError):
+                    daemon.serve(main, path)
+            finally:
+                self.assertTrue(daemon.stop(path))
+                thread.join()
+            self.assertFalse(path.exists())
+            self.assertIsNone(daemon.forward(["echo"], path))
+
+
+class DaemonCommandTestCase(TestCase):
+    def test_info(self):
+        book, created = Book.from_dict({"title": "Cool"})
+
+        def book_main(argv: List[str], file: TextIO):
+            parser = ArgumentParser(prog="bibliothek")
+            argparse.add_subparser(parser.add_subparsers(dest="subparser"))
+            args = parser.parse_args(argv)
+            # relies on the default file, which has to be the client's
+            args.func(args)
+
+        with TemporaryDirectory() as tmpdir:
+            path = Path(tmpdir) / "daemon.sock"
+            out, err = BytesIO(), BytesIO()
+            codes = []
+
+            # the daemon runs in this thread, as it uses the DB of the test
+            def client():
+                while not path.exists():
+                    threading.Event().wait(0.01)
+                codes.append(
+                    daemon.forward(["book", "info", str(book.pk)], path, out, err)
+                )
+                daemon.stop(path)
+
+            thread = threading.Thread(target=client)
+            thread.start()
+            daemon.serve(book_main, path)
+            thread.join()
+
+        self.assertEquals([0], codes, err.getvalue())
+        self.assertIn("Cool", out.getvalue().decode("utf8"))
+
+    def test_reset_caches(self):
+        with mock.patch("bibliothek.db.data_version", return_value=(1, 1)):
+            daemon._reset_caches()
+            fts._available["other"] = True
+            daemon._reset_caches()
+            self.assertIn("other", fts._available)
+
+        # another connection committed to the DB
+        with mock.patch("bibliothek.db.data_version", return_value=(1, 2)):
+            daemon._reset_caches()
+            self.assertNotIn("other", fts._available)
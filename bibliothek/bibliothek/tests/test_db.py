@@ -0,0 +1,38 @@
+# -*- coding: utf-8 -*-
+# vim: ft=python fileencoding=utf-8 sts=4 sw=4 et:
+# Copyright (C) 2016-2022 J. Nathanael Philipp (jnphilipp) <nathanael@philipp.land>
+#
+# This file is part of bibliothek.
+#
+# bibliothek is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# bibliothek is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with bibliothek.  If not, see <http://www.gnu.org/licenses/>.
+
+from bibliothek import db
+from django.db import connection
+from django.test import TransactionTestCase
+
+
+class DBTestCase(TransactionTestCase):
+    def test_migrate(self):
+        fingerprint = db.fingerprint()
+        self.assertEquals(fingerprint, db.fingerprint())
+        self.assertGreater(fingerprint, 0)
+        self.assertLess(fingerprint, 2**31)
+
+        with connection.cursor() as cursor:
+            cursor.execute("PRAGMA user_version = 0")
+        self.assertEquals(0, db.stored_fingerprint())
+        self.assertTrue(db.migrate())
+        self.assertEquals(fingerprint, db.stored_fingerprint())
+        self.assertFalse(db.migrate())
+        self.assertTrue(db.migrate(force=True))
@@ -0,0 +1,138 @@
+# -*- coding: utf-8 -*-
+# vim: ft=python fileencoding=utf-8 sts=4 sw=4 et:
+# Copyright (C) 2016-2022 J. Nathanael Philipp (jnphilipp) <nathanael@philipp.land>
+#
+# This file is part of bibliothek.
+#
+# bibliothek is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# bibliothek is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with bibliothek.  If not, see <http://www.gnu.org/licenses/>.
+
+import json
+
+from bibliothek.exporter import export_json
+from bibliothek.importer import import_json
+from books.models import Book, Edition
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from io import StringIO
+from magazines.models import Issue, Magazine
+from papers.models import Paper
+from shelves.models import Read
+
+
+class ExporterTestCase(TestCase):
+    def _create(self, n: int, offset: int = 0):
+        for i in range(offset, offset + n):
+            book, created = Book.from_dict(
+                {
+                    "title": f"Book {i}",
+                    "authors": [{"name": f"Author {i}"}],
+                    "series": {"name": "Series"},
+                    "volume": i,
+                    "genres": [{"name": "Fantasy"}],
+                }
+            )
+            Edition.from_dict(
+                {
+                    "isbn": f"{i:013d}",
+                    "binding": {"name": "Hardcover"},
+                    "publisher": {"name": "Publisher"},
+                    "languages": [{"name": "English"}],
+                    "acquisitions": [{"date": "2021-01-01", "price": 5}],
+                    "reads": [{"started": "2021-02-01"}],
+                },
+                book,
+            )
+            magazine, created = Magazine.from_dict({"name": f"Magazine {i}"})
+            Issue.from_dict({"issue": "1/2021"}, magazine)
+            Paper.from_dict(
+                {
+                    "title": f"Paper {i}",
+                    "authors": [{"name": f"Author {i}"}],
+                    "journal": {"name": "Journal"},
+                    "proceedings": {"title": "Proceedings"},
+                }
+            )
+
+    def test_export_json(self):
+        self._create(3)
+        with CaptureQueriesContext(connection) as queries:
+            with StringIO() as f:
+                counts = export_json(f)
+                data = json.loads(f.getvalue())
+        self.assertEquals({"books": 3, "magazines": 3, "papers": 3}, counts)
+        self.assertEquals(3, len(data["books"]))
+        self.assertEquals("Book 0", data["books"][0]["title"])
+        self.assertEquals(
+            Edition.objects.get(isbn="0000000000000").to_dict(),
+            data["books"][0]["editions"][0],
+        )
+        self.assertEquals(
+            [Issue.objects.get(magazine__name="Magazine 2").to_dict()],
+            data["magazines"][2]["issues"],
+        )
+        self.assertEquals(
+            Paper.objects.get(title="Paper 1").to_dict(), data["papers"][1]
+        )
+
+        self._create(5, 3)
+        with CaptureQueriesContext(connection) as queries2:
+            with StringIO() as f:
+                counts = export_json(f)
+        self.assertEquals({"books": 8, "magazines": 8, "papers": 8}, counts)
+        self.assertEquals(len(queries), len(queries2))
+
+        with StringIO() as f:
+            export_json(f)
+            f.seek(0)
+            for model in [Book, Magazine, Paper]:
+                model.objects.all().delete()
+            self.assertEquals(0, Edition.objects.count())
+            self.assertEquals({"books": 8, "magazines": 8, "papers": 8}, import_json(f))
+        self.assertEquals(8, Edition.objects.count())
+        self.assertEquals(1, Edition.objects.get(isbn="0000000000004").reads.count())
+        self.assertEquals(8, Issue.objects.count())
+
+    def test_export_json_since(self):
+        self._create(3)
+        since = timezone.now()
+
+        with StringIO() as f:
+            counts = export_json(f, since=since)
+            data = json.loads(f.getvalue())
+        self.assertEquals(
+            {"books": 0, "magazines": 0, "papers": 0, "deleted": 0}, counts
+        )
+        self.assertEquals([], data["deleted"])
+
+        book = Book.objects.get(title="Book 0")
+        book.edit("title", "Book 0 (2nd)")
+        Read.from_dict(
+            {"started": "2022-01-01"}, Edition.objects.get(isbn="0000000000001")
+        )
+        Paper.objects.get(title="Paper 2").delete()
+
+        with StringIO() as f:
+            counts = export_json(f, since=since)
+            data = json.loads(f.getvalue())
+        self.assertEquals(
+            {"books": 2, "magazines": 0, "papers": 0, "deleted": 1}, counts
+        )
+        self.assertEquals(
+            ["Book 0 (2nd)", "Book 1"], [b["title"] for b in data["books"]]
+        )
+        self.assertEquals(2, len(data["books"][1]["editions"][0]["reads"]))
+        self.assertEquals("papers.paper", data["deleted"][0]["type"])
+        self.assertEquals("Paper 2 - Author 2", data["deleted"][0]["name"])
@@ -0,0 +1,105 @@
+# -*- coding: utf-8 -*-
+# vim: ft=python fileencoding=utf-8 sts=4 sw=4 et:
+# Copyright (C) 2016-2022 J. Nathanael Philipp (jnphilipp) <nathanael@philipp.land>
+#
+# This file is part of bibliothek.
+#
+# bibliothek is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# bibliothek is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with bibliothek.  If not, see <http://www.gnu.org/licenses/>.
+
+from bibliothek import fts
+from bibliothek.importer import BulkImporter
+from books.models import Book, Edition
+from django.core.management import call_command
+from django.db import connection
+from django.test import TestCase
+from io import StringIO
+from papers.models import Paper
+from persons.models import Person
+from shelves.models import Acquisition
+
+
+class FTSTestCase(TestCase):
+    def test_search(self):
+        self.assertTrue(fts.available())
+
+        book, created = Book.from_dict(
+            {
+                "title": "The Hitchhiker's Guide to the Galaxy",
+                "authors": [{"name": "Douglas Adams"}],
+                "series": {"name": "Hitchhiker"},
+                "volume": 1,
+            }
+        )
+        edition, created = Edition.from_dict({"isbn": "9780330258647"}, book)
+        Acquisition.from_dict({"date": "2021-01-01"}, edition)
+        paper, created = Paper.from_dict(
+            {
+                "title": "Self-Normalizing Neural Networks",
+                "authors": [{"name": "Sepp Hochreiter"}],
+                "doi": "10.5555/3294771.3294864",
+            }
+        )
+
+        self.assertIn(fts.TABLE, str(Book.search("guide").query))
+        self.assertEquals([book], list(Book.search("guide")))
+        self.assertEquals([book], list(Book.search("douglas")))
+        self.assertEquals([edition], list(Edition.search("adams")))
+        self.assertEquals([edition], list(Edition.search("0330258")))
+        self.assertEquals([edition], list(Edition.search("Hitchhiker 1")))
+        self.assertEquals([paper], list(Paper.search("normalizing neural")))
+        self.assertEquals([paper], list(Paper.search("3294771")))
+        self.assertEquals(1, Acquisition.search("0330258").count())
+        self.assertEquals(0, Paper.search("guide").count())
+
+        self.assertNotIn(fts.TABLE, str(Book.search("gu").query))
+        self.assertEquals([book], list(Book.search("gu")))
+
+        person = Person.objects.get(name="Douglas Adams")
+        person.edit("name", "Douglas Noël Adams")
+        self.assertEquals([book], list(Book.search("noël")))
+        self.assertEquals([edition], list(Edition.search("noël")))
+
+        person.delete()
+        self.assertEquals(0, Book.search("douglas").count())
+        self.assertEquals(0, Edition.search("douglas").count())
+
+        paper.delete()
+        self.assertEquals(0, Paper.search("normalizing").count())
+
+    def test_rebuild(self):
+        book, created = Book.from_dict({"title": "Some Book"})
+        with connection.cursor() as cursor:
+            cursor.execute(f"DELETE FROM {fts.TABLE}")
+        self.assertEquals(0, Book.search("some book").count())
+
+        with StringIO() as stdout:
+            call_command("rebuild_fts", stdout=stdout)
+        self.assertEquals([book], list(Book.search("some book")))
+
+    def test_bulk_import(self):
+        importer = BulkImporter()
+        importer.add(
+            "books",
+            {
+                "title": "Bulk Book",
+                "authors": [{"name": "Bulk Author"}],
+                "editions": [{"isbn": "9780000000001"}],
+            },
+        )
+        importer.add("papers", {"title": "Bulk Paper", "doi": "10.1/bulk"})
+        importer.flush()
+
+        self.assertEquals(1, Book.search("bulk author").count())
+        self.assertEquals(1, Edition.search("bulk author").count())
+        self.assertEquals(1, Paper.search("10.1/bulk").count())
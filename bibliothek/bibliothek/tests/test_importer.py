@@ -0,0 +1,204 @@
+# -*- coding: utf-8 -*-
+# vim: ft=python fileencoding=utf-8 sts=4 sw=4 et:
+# Copyright (C) 2016-2022 J. Nathanael Philipp (jnphilipp) <nathanael@philipp.land>
+#
+# This file is part of bibliothek.
+#
+# bibliothek is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# bibliothek is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with bibliothek.  If not, see <http://www.gnu.org/licenses/>.
+
+import json
+import sqlite3
+import unittest
+
+from bibliothek.importer import BulkImporter, import_json
+from books.models import Book, Edition
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from io import StringIO
+from magazines.models import Issue, Magazine
+from papers.models import Paper
+from persons.models import Person
+
+
+class ImporterTestCase(TestCase):
+    def test_import_json(self):
+        data = {
+            "books": [
+                {
+                    "title": "Cool",
+                    "authors": [{"name": "Max Mustermann"}],
+                    "editions": [
+                        {
+                            "isbn": "9780000000000",
+                            "acquisitions": [{"date": "2021-01-01", "price": 5}],
+                            "reads": [{"started": "2021-02-01"}],
+                        }
+                    ],
+                },
+                {"title": "Boring"},
+            ],
+            "magazines": [{"name": "Mag", "issues": [{"issue": "1/2021"}]}],
+            "papers": [{"title": "Paper", "reads": [{"finished": "2021-03-01"}]}],
+        }
+
+        progress = []
+        with StringIO(json.dumps(data)) as f:
+            counts = import_json(f, lambda c: progress.append(dict(c)))
+        self.assertEquals({"books": 2, "magazines": 1, "papers": 1}, counts)
+        self.assertEquals(4, len(progress))
+
+        self.assertEquals(2, Book.objects.count())
+        edition = Edition.objects.get(isbn="9780000000000")
+        self.assertEquals("Cool", edition.book.title)
+        self.assertEquals(1, edition.acquisitions.count())
+        self.assertEquals(1, edition.reads.count())
+        self.assertEquals(1, Magazine.objects.count())
+        self.assertEquals(1, Issue.objects.filter(magazine__name="Mag").count())
+        self.assertEquals(1, Paper.objects.get(title="Paper").reads.count())
+
+        with StringIO(json.dumps(data)) as f:
+            import_json(f)
+        self.assertEquals(2, Book.objects.count())
+        self.assertEquals(1, Edition.objects.count())
+        self.assertEquals(1, Paper.objects.count())
+
+    def test_bulk_import(self):
+        data = {
+            "books": [
+                {
+                    "title": f"Book {i}",
+                    "authors": [{"name": f"Author {i % 10}"}, {"name": "Max"}],
+                    "series": {"name": "Series"} if i % 2 else None,
+                    "volume": i,
+                    "genres": [{"name": "Fantasy"}],
+                    "links": [{"url": f"https://example.com/{i}"}],
+                    "editions": [
+                        {
+                            "isbn": f"978-{i:09d}",
+                            "publishing_date": "2020-01-01",
+                            "binding": {"name": "Paperback"},
+                            "languages": [{"name": "English"}],
+                            "acquisitions": [{"date": "2021-01-01", "price": 5}],
+                            "reads": [{"started": "2021-02-01"}],
+                        }
+                    ],
+                }
+                for i in range(50)
+            ],
+            "magazines": [
+                {
+                    "name": "Mag",
+                    "feed": {"url": "https://example.com/feed"},
+                    "issues": [
+                        {"issue": f"{i}/2021", "languages": ["English"]}
+                        for i in range(10)
+                    ],
+                }
+            ],
+            "papers": [
+                {
+                    "title": f"Paper {i}",
+                    "authors": [{"name": "Max", "links": [{"url": "https://max.me"}]}],
+                    "journal": {"name": "Journal"},
+                    "volume": str(i),
+                    "reads": [{"finished": "2021-03-01"}],
+                }
+                for i in range(50)
+            ],
+        }
+
+        progress = []
+        with CaptureQueriesContext(connection) as queries:
+            with StringIO(json.dumps(data)) as f:
+                counts = import_json(f, lambda c: progress.append(dict(c)), 40)
+        self.assertEquals({"books": 50, "magazines": 1, "papers": 50}, counts)
+        self.assertEquals(3, len(progress))
+        self.assertLess(len(queries), 200)
+
+        self.assertEquals(50, Book.objects.count())
+        self.assertEquals(11, Person.objects.count())
+        self.assertEquals(1, Person.objects.get(name="Max").links.count())
+        book = Book.objects.get(title="Book 3")
+        self.assertEquals("book-3", book.slug)
+        self.assertEquals("Series", book.series.name)
+        self.assertEquals(3, book.volume)
+        self.assertEquals(
+            ["Author 3", "Max"], [a.name for a in book.authors.order_by("name")]
+        )
+        edition = Edition.objects.get(isbn="978000000003")
+        self.assertEquals(book, edition.book)
+        self.assertEquals("Paperback", edition.binding.name)
+        self.assertEquals(1, edition.languages.count())
+        self.assertEquals(1, edition.acquisitions.count())
+        self.assertEquals(1, edition.reads.count())
+        self.assertEquals(10, Issue.objects.filter(magazine__name="Mag").count())
+        self.assertEquals(
+            "https://example.com/feed", Magazine.objects.get(name="Mag").feed.link
+        )
+        paper = Paper.objects.get(title="Paper 7")
+        self.assertEquals("Journal", paper.journal.name)
+        self.assertEquals(1, paper.reads.count())
+
+        with StringIO(json.dumps(data)) as f:
+            import_json(f, chunk_size=1000)
+        self.assertEquals(50, Book.objects.count())
+        self.assertEquals(50, Edition.objects.count())
+        self.assertEquals(10, Issue.objects.count())
+        self.assertEquals(50, Paper.objects.count())
+        self.assertEquals(1, Edition.objects.get(isbn="978000000003").reads.count())
+
+    def test_bulk_importer_slugs(self):
+        Book.from_dict({"title": "Cool"})
+        importer = BulkImporter()
+        importer.add("books", {"title": "cool"})
+        importer.add("books", {"title": "COOL"})
+        importer.add("journals", {"name": "Ignored"})
+        importer.flush()
+        self.assertEquals({"books": 2, "magazines": 0, "papers": 0}, importer.counts)
+        self.assertEquals(
+            ["cool", "cool-2", "cool-3"],
+            sorted(Book.objects.values_list("slug", flat=True)),
+        )
+
+    @unittest.skipUnless(
+        hasattr(sqlite3.Connection, "setlimit"), "needs sqlite3 setlimit"
+    )
+    def test_bulk_importer_variable_limit(self):
+        # the default limit of SQLite before 3.32
+        connection.ensure_connection()
+        limit = connection.connection.setlimit(
+            sqlite3.SQLITE_LIMIT_VARIABLE_NUMBER, 999
+        )
+        try:
+            importer = BulkImporter(1200)
+            for i in range(1200):
+                importer.add(
+                    "books",
+                    {
+                        "title": f"Book {i}",
+                        "authors": [{"name": f"Person {i}"}],
+                        "editions": [
+                            {"isbn": f"{i}", "reads": [{"started": "2021-01-01"}]},
+                            {"alternate_title": f"Second {i}"},
+                        ],
+                    },
+                )
+            importer.flush()
+        finally:
+            connection.connection.setlimit(sqlite3.SQLITE_LIMIT_VARIABLE_NUMBER, limit)
+        self.assertEquals(1200, Book.objects.count())
+        self.assertEquals(1200, Person.objects.count())
+        self.assertEquals(2400, Edition.objects.count())
+        self.assertEquals(1, Edition.objects.get(isbn="17").reads.count())
@@ -0,0 +1,81 @@
+# -*- coding: utf-8 -*-
+# vim: ft=python fileencoding=utf-8 sts=4 sw=4 et:
+# Copyright (C) 2016-2022 J. Nathanael Philipp (jnphilipp) <nathanael@philipp.land>
+#
+# This file is part of bibliothek.
+#
+# bibliothek is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# bibliothek is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with bibliothek.  If not, see <http://www.gnu.org/licenses/>.
+
+import os
+import subprocess
+import sys
+
+from django.conf import settings
+from django.test import SimpleTestCase
+from tempfile import TemporaryDirectory
+
+# cumulative import time of the CLI in ms, generous for slow CI machines
+IMPORT_TIME_BUDGET = 1500
+
+
+class ImportTimeTestCase(SimpleTestCase):
+    def test_cli(self):
+        with TemporaryDirectory() as tmpdir:
+            env = dict(
+                os.environ,
+                XDG_CACHE_HOME=tmpdir,
+                XDG_CONFIG_HOME=tmpdir,
+                XDG_DATA_HOME=tmpdir,
+            )
+            env.pop("DJANGO_SETTINGS_MODULE", None)
+            # the first run migrates the new DB
+            for i in range(2):
+                process = subprocess.run(
+                    [
+                        sys.executable,
+                        "-X",
+                        "importtime",
+                        "bibliothek.py",
+                        "book",
+                        "list",
+                    ],
+                    cwd=settings.BASE_DIR,
+                    env=env,
+                    capture_output=True,
+                    text=True,
+                )
+        self.assertEqual(0, process.returncode, process.stderr)
+
+        imports = {}
+        total = 0
+        for line in process.stderr.splitlines():
+            if not line.startswith("import time:") or "|" not in line:
+                continue
+            us, cumulative, name = line[12:].split("|")
+            if cumulative.strip().isdigit():
+                imports[name.strip()] = int(cumulative)
+                # top-level imports, their cumulative times include the nested ones
+                if not name.startswith("  "):
+                    total += int(cumulative)
+        report = "\n".join(
+            [f"{total / 1000:8.1f} ms total"]
+            + [
+                f"{us / 1000:8.1f} ms {name}"
+                for name, us in sorted(imports.items(), key=lambda x: -x[1])[:25]
+            ]
+        )
+
+        for name in ["gi", "bibtexparser", "papers.argparse", "magazines.argparse"]:
+            self.assertNotIn(name, imports, report)
+        self.assertLess(total / 1000, IMPORT_TIME_BUDGET, report)
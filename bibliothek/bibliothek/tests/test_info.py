@@ -0,0 +1,103 @@
+# -*- coding: utf-8 -*-
+# vim: ft=python fileencoding=utf-8 sts=4 sw=4 et:
+# Copyright (C) 2016-2022 J. Nathanael Philipp (jnphilipp) <nathanael@philipp.land>
+#
+# This file is part of bibliothek.
+#
+# bibliothek is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# bibliothek is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with bibliothek.  If not, see <http://www.gnu.org/licenses/>.
+
+from books.models import Book, Edition
+from django.test import TestCase
+from django.utils.translation import gettext_lazy as _
+from genres.models import Genre
+from io import StringIO
+from journals.models import Journal
+from magazines.models import Issue, Magazine
+from papers.models import Paper
+from persons.models import Person
+from publishers.models import Publisher
+from series.models import Series
+
+
+class InfoTestCase(TestCase):
+    def setUp(self):
+        shelves = {
+            "acquisitions": [{"date": "2021-01-01", "price": 1}, {"price": 2}],
+            "reads": [{"started": "2021-01-02"}, {"started": "2021-02-02"}],
+            "languages": [{"name": "English"}, {"name": "German"}],
+            "links": [{"url": "https://example.com"}, {"url": "https://a.example"}],
+        }
+        for i in range(2):
+            book, created = Book.from_dict(
+                {
+                    "title": f"Book {i}",
+                    "authors": [{"name": "Author"}, {"name": f"Author {i}"}],
+                    "series": {"name": "Series"},
+                    "volume": i,
+                    "genres": [{"name": "Genre"}, {"name": f"Genre {i}"}],
+                    "links": shelves["links"],
+                }
+            )
+            for j in range(2):
+                Edition.from_dict(
+                    {
+                        "isbn": f"97800000000{i}{j}",
+                        "binding": {"name": "Paperback"},
+                        "publisher": {"name": "Publisher"},
+                        "persons": [{"name": "Author"}, {"name": "Translator"}],
+                        **shelves,
+                    },
+                    book,
+                )
+            Paper.from_dict(
+                {
+                    "title": f"Paper {i}",
+                    "authors": [{"name": "Author"}, {"name": f"Author {i}"}],
+                    "journal": {"name": "Journal"},
+                    "volume": "1",
+                    "publisher": {"name": "Publisher"},
+                    "series": {"name": "Series"},
+                    **shelves,
+                }
+            )
+            Issue.from_dict(
+                {"issue": f"{i}/2021", **shelves},
+                Magazine.from_dict({"name": "Magazine", "links": shelves["links"]})[0],
+            )
+
+    def test_print(self):
+        # a fixed number of queries per object, i. e. one per relation printed,
+        # regardless of the number of related objects
+        for obj, num_queries in [
+            (Book.objects.first(), 6),
+            (Edition.objects.first(), 11),
+            (Paper.objects.first(), 9),
+            (Issue.objects.first(), 6),
+            (Person.objects.get(name="Author"), 10),
+            (Genre.objects.first(), 3),
+            (Journal.objects.first(), 3),
+            (Magazine.objects.first(), 2),
+            (Publisher.objects.first(), 5),
+            (Series.objects.first(), 3),
+        ]:
+            with StringIO() as cout:
+                with self.assertNumQueries(num_queries):
+                    obj.print(cout)
+                self.assertIn(str(obj.pk), cout.getvalue())
+
+        edition = Edition.objects.first()
+        with StringIO() as cout:
+            edition.print(cout)
+            self.assertIn(str(edition.book), cout.getvalue())
+            self.assertEquals(2, cout.getvalue().count(f"{_('date started')}="))
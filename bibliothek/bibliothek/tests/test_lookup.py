@@ -0,0 +1,80 @@
+# -*- coding: utf-8 -*-
+# vim: ft=python fileencoding=utf-8 sts=4 sw=4 et:
+# Copyright (C) 2016-2022 J. Nathanael Philipp (jnphilipp) <nathanael@philipp.land>
+#
+# This file is part of bibliothek.
+#
+# bibliothek is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# bibliothek is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with bibliothek.  If not, see <http://www.gnu.org/licenses/>.
+
+from bibliothek import lookup
+from books.models import Book, Edition
+from django.db import connection
+from django.db.models import Q
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from magazines.models import Issue, Magazine
+from papers.models import Paper
+
+
+class LookupTestCase(TestCase):
+    def setUp(self):
+        book, created = Book.from_dict({"title": "Cosmos"})
+        self.edition, created = Edition.from_dict({"isbn": "9780345539434"}, book)
+        book, created = Book.from_dict({"title": "Cosmos and Culture"})
+        self.edition2, created = Edition.from_dict({"isbn": "9780160867118"}, book)
+        self.paper, created = Paper.from_dict({"title": "Deep Residual Learning"})
+        magazine, created = Magazine.from_dict({"name": "Space"})
+        self.issue, created = Issue.from_dict({"issue": "3/2022"}, magazine)
+
+    def test_get_one(self):
+        with CaptureQueriesContext(connection) as context:
+            self.assertEquals(
+                self.edition,
+                lookup.get_one(Edition.search("9780345539434"), "", Q()),
+            )
+        self.assertEquals(1, len(context.captured_queries))
+        self.assertIn("LIMIT 2", context.captured_queries[0]["sql"])
+
+        with CaptureQueriesContext(connection) as context:
+            self.assertEquals(
+                self.edition,
+                lookup.get_one(
+                    Edition.search("Cosmos"), "Cosmos", Q(book__title="Cosmos")
+                ),
+            )
+        self.assertEquals(2, len(context.captured_queries))
+
+        self.assertIsNone(
+            lookup.get_one(Edition.search("Cosmos"), "Cosmos", Q(isbn="Cosmos"))
+        )
+        self.assertIsNone(lookup.get_one(Edition.search("Nothing"), "Nothing", Q()))
+        self.assertEquals(
+            self.edition2,
+            lookup.get_one(Edition.objects.all(), str(self.edition2.pk), Q()),
+        )
+
+    def test_citation_key(self):
+        Paper.objects.filter(pk=self.paper.pk).update(citation_key="he2016deep")
+        with self.assertNumQueries(1):
+            self.assertEquals(self.paper, Paper.get("he2016deep"))
+        self.assertEquals(self.paper, Paper.get("Residual"))
+
+    def test_resolve(self):
+        self.assertEquals([self.edition], lookup.resolve("Cosmos"))
+        self.assertEquals([self.paper], lookup.resolve("Residual"))
+        self.assertEquals([self.issue], lookup.resolve("Space 3/2022"))
+        self.assertEquals([], lookup.resolve("Nothing"))
+        self.assertEquals(
+            [self.issue], lookup.resolve("Space", ["magazines.Issue", "papers.Paper"])
+        )
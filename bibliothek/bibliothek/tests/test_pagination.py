@@ -0,0 +1,131 @@
+# -*- coding: utf-8 -*-
+# vim: ft=python fileencoding=utf-8 sts=4 sw=4 et:
+# Copyright (C) 2016-2022 J. Nathanael Philipp (jnphilipp) <nathanael@philipp.land>
+#
+# This file is part of bibliothek.
+#
+# bibliothek is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# bibliothek is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with bibliothek.  If not, see <http://www.gnu.org/licenses/>.
+
+from argparse import ArgumentParser
+from bibliothek import pagination
+from books import argparse
+from books.models import Book
+from django.test import TestCase
+from io import StringIO
+
+
+class PaginationTestCase(TestCase):
+    def setUp(self):
+        for i, (series, volume) in enumerate(
+            [
+                (None, None),
+                (None, None),
+                ("a", 1),
+                ("a", 1),
+                ("B", 2),
+                ("a", None),
+                (None, 3),
+                ("B", 1),
+            ]
+        ):
+            book, created = Book.from_dict(
+                {
+                    "title": f"Book {i}",
+                    "authors": [{"name": f"Author {i}"}, {"name": "Author"}],
+                    "series": {"name": series} if series else None,
+                    "volume": volume,
+                }
+            )
+            # same ordering keys for some books, bypassing the unique slug
+            Book.objects.filter(pk=book.pk).update(
+                title=f"{'Book' if i % 2 else 'book'} {i // 2}"
+            )
+
+    def pages(self, query_set, limit):
+        pks = []
+        page = list(pagination.paginate(query_set, limit))
+        while page:
+            self.assertLessEqual(len(page), limit)
+            pks += [book.pk for book in page]
+            page = list(pagination.paginate(query_set, limit, page[-1].pk))
+        return pks
+
+    def test_paginate(self):
+        pks = list(Book.objects.values_list("pk", flat=True))
+        self.assertEquals(8, len(pks))
+        for limit in range(1, 9):
+            self.assertEquals(pks, self.pages(Book.objects.all(), limit))
+
+        pks = list(
+            Book.objects.order_by("-series__name", "volume").values_list(
+                "pk", flat=True
+            )
+        )
+        for limit in range(1, 9):
+            self.assertEquals(
+                pks, self.pages(Book.objects.order_by("-series__name", "volume"), limit)
+            )
+
+        query_set = Book.objects.filter(series__isnull=False)
+        pks = list(query_set.values_list("pk", flat=True))
+        self.assertEquals(5, len(pks))
+        self.assertEquals(pks, self.pages(query_set, 3))
+
+    def test_paginate_missing(self):
+        self.assertEquals([], list(pagination.paginate(Book.objects.all(), 2, 1000)))
+
+    def test_iterate(self):
+        query_set = Book.objects.order_by("-series__name", "volume")
+        for limit in [None, 1, 3, 8, 9]:
+            for after in [None, 1, 5]:
+                pks = [book.pk for book in pagination.paginate(query_set, limit, after)]
+                for chunk_size in range(1, 9):
+                    self.assertEquals(
+                        pks,
+                        [
+                            book.pk
+                            for book in pagination.iterate(
+                                query_set, limit, after, chunk_size
+                            )
+                        ],
+                    )
+
+        with self.assertNumQueries(6):
+            for book in pagination.iterate(
+                Book.objects.all(), chunk_size=3, prefetches=["authors"]
+            ):
+                self.assertEquals(2, len(book.authors.all()))
+
+    def test_list(self):
+        parser = ArgumentParser(prog="bibliothek")
+        parser.add_argument("--format", default="table")
+        argparse.add_subparser(parser.add_subparsers(dest="subparser"))
+
+        pks = list(Book.objects.values_list("pk", flat=True))
+        with StringIO() as cout:
+            args = parser.parse_args(["--format", "jsonl", "book", "list"])
+            with self.assertNumQueries(2):
+                args.func(args, cout)
+            self.assertEquals(8, len(cout.getvalue().splitlines()))
+
+        with StringIO() as cout:
+            args = parser.parse_args(
+                ["--format", "csv", "book", "list", "--limit", "2", "--after", "2"]
+            )
+            with self.assertNumQueries(3):
+                args.func(args, cout)
+            self.assertEquals(
+                [str(pk) for pk in pks[pks.index(2) + 1 :][:2]],
+                [line.split(",")[0] for line in cout.getvalue().splitlines()[1:]],
+            )
@@ -0,0 +1,97 @@
+# -*- coding: utf-8 -*-
+# vim: ft=python fileencoding=utf-8 sts=4 sw=4 et:
+# Copyright (C) 2016-2022 J. Nathanael Philipp (jnphilipp) <nathanael@philipp.land>
+#
+# This file is part of bibliothek.
+#
+# bibliothek is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# bibliothek is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with bibliothek.  If not, see <http://www.gnu.org/licenses/>.
+
+from bibliothek.reading import reading_list
+from books.models import Book, Edition
+from datetime import date
+from django.test import TestCase
+from magazines.models import Issue, Magazine
+from papers.models import Paper
+from shelves.models import Acquisition, Read
+
+
+class ReadingListTestCase(TestCase):
+    def setUp(self):
+        book, created = Book.from_dict(
+            {
+                "title": "The Hitchhiker's Guide to the Galaxy",
+                "authors": [{"name": "Douglas Adams"}],
+                "series": {"name": "Hitchhiker"},
+                "volume": 1,
+            }
+        )
+        self.edition, created = Edition.from_dict({"isbn": "9780330258647"}, book)
+        Acquisition.from_dict({"date": "2021-03-01"}, self.edition)
+        Acquisition.from_dict({"date": "2021-01-01"}, self.edition)
+
+        edition, created = Edition.from_dict({"isbn": "9780345391803"}, book)
+        Acquisition.from_dict({"date": "2020-01-01"}, edition)
+        Read.from_dict({"started": "2020-02-01"}, edition)
+
+        self.paper, created = Paper.from_dict(
+            {
+                "title": "Self-Normalizing Neural Networks",
+                "authors": [{"name": "Sepp Hochreiter"}],
+            }
+        )
+        Acquisition.from_dict({}, self.paper)
+
+        magazine, created = Magazine.from_dict({"name": "Stuff"})
+        self.issue, created = Issue.from_dict({"issue": "1/2021"}, magazine)
+        Acquisition.from_dict({"date": "2021-02-01"}, self.issue)
+
+    def test_reading_list(self):
+        with self.assertNumQueries(8):
+            entries = reading_list()
+            self.assertEquals(
+                [
+                    ("papers.paper", self.paper, None),
+                    ("books.edition", self.edition, date(2021, 1, 1)),
+                    ("magazines.issue", self.issue, date(2021, 2, 1)),
+                    ("books.edition", self.edition, date(2021, 3, 1)),
+                ],
+                entries,
+            )
+            self.assertEquals(
+                [
+                    "Self-Normalizing Neural Networks - Sepp Hochreiter",
+                    "The Hitchhiker's Guide to the Galaxy - Douglas Adams "
+                    + f"(Hitchhiker 1) #{self.edition.id}",
+                    "Stuff 1/2021",
+                    "The Hitchhiker's Guide to the Galaxy - Douglas Adams "
+                    + f"(Hitchhiker 1) #{self.edition.id}",
+                ],
+                [str(obj) for label, obj, acquired in entries],
+            )
+
+        self.assertEquals([("papers.paper", self.paper, None)], reading_list(1))
+        self.assertEquals([], reading_list(0))
+
+        Read.from_dict({}, self.edition)
+        self.assertEquals(
+            ["papers.paper", "magazines.issue"],
+            [label for label, obj, acquired in reading_list()],
+        )
+
+    def test_view(self):
+        with self.assertNumQueries(7):
+            response = self.client.get("/reading-list/?limit=2")
+        self.assertEquals(200, response.status_code)
+        self.assertEquals(2, len(response.context["entries"]))
+        self.assertContains(response, f"/paper/{self.paper.slug}/")
@@ -0,0 +1,136 @@
+# -*- coding: utf-8 -*-
+# vim: ft=python fileencoding=utf-8 sts=4 sw=4 et:
+# Copyright (C) 2016-2022 J. Nathanael Philipp (jnphilipp) <nathanael@philipp.land>
+#
+# This file is part of bibliothek.
+#
+# bibliothek is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# bibliothek is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with bibliothek.  If not, see <http://www.gnu.org/licenses/>.
+
+from bibliothek.search import get_objects, parse_id, SearchIndex
+from books.models import Book, Edition
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.test import override_settings, TestCase
+from files.models import File
+from magazines.models import Issue, Magazine
+from papers.models import Paper
+from pathlib import Path
+from series.models import Series
+from tempfile import mkdtemp
+
+
+@override_settings(MEDIA_ROOT=Path(mkdtemp()))
+class SearchIndexTestCase(TestCase):
+    def _add_file(self, obj, name):
+        file = File(file=SimpleUploadedFile(name, b"Lorem ipsum dolorem"))
+        file.save()
+        obj.files.add(file)
+        return file
+
+    def setUp(self):
+        book, created = Book.from_dict(
+            {
+                "title": "The Hitchhiker's Guide to the Galaxy",
+                "authors": [{"name": "Douglas Adams"}],
+                "series": {"name": "Hitchhiker"},
+                "volume": 1,
+            }
+        )
+        self.edition, created = Edition.from_dict({"isbn": "9780330258647"}, book)
+        self._add_file(self.edition, "hitchhiker.epub")
+
+        self.paper, created = Paper.from_dict(
+            {
+                "title": "Self-Normalizing Neural Networks",
+                "authors": [{"name": "Sepp Hochreiter"}],
+            }
+        )
+        self._add_file(self.paper, "snn.pdf")
+        Paper.from_dict({"title": "Long Short-Term Memory"})
+
+        magazine, created = Magazine.from_dict({"name": "Stuff"})
+        self.issue, created = Issue.from_dict({"issue": "1/2021"}, magazine)
+        self._add_file(self.issue, "stuff.pdf")
+
+    def test_search(self):
+        index = SearchIndex()
+        self.assertTrue(index.refresh())
+        self.assertEquals(3, len(index))
+        self.assertFalse(index.refresh())
+
+        self.assertEquals([f"edition-{self.edition.pk}"], index.search(["guide"]))
+        self.assertEquals(
+            [f"edition-{self.edition.pk}"], index.search(["adams", "Hitchhiker 1"])
+        )
+        self.assertEquals([f"paper-{self.paper.pk}"], index.search(["neural"]))
+        self.assertEquals([f"issue-{self.issue.pk}"], index.search(["stuff 2021"]))
+        self.assertEquals([], index.search(["memory"]))
+        self.assertEquals([], index.search(["guide", "neural"]))
+
+    def test_subsearch(self):
+        index = SearchIndex()
+        results = index.search(["self"])
+        self.assertEquals([f"paper-{self.paper.pk}"], results)
+        self.assertEquals(results, index.subsearch(results, ["self", "neural"]))
+        self.assertEquals([], index.subsearch(results, ["self", "memory"]))
+        self.assertEquals(
+            [f"edition-{self.edition.pk}"],
+            index.subsearch(
+                [f"edition-{self.edition.pk}", "edition-0", "book-1", "foo"],
+                ["hitchhiker"],
+            ),
+        )
+
+    def test_get_objects(self):
+        ids = [
+            f"paper-{self.paper.pk}",
+            f"edition-{self.edition.pk}",
+            f"issue-{self.issue.pk}",
+            "issue-0",
+            "foo",
+        ]
+        with self.assertNumQueries(5):
+            objs = get_objects(ids)
+            self.assertEquals(
+                [
+                    "Self-Normalizing Neural Networks - Sepp Hochreiter",
+                    "The Hitchhiker's Guide to the Galaxy - Douglas Adams "
+                    + "(Hitchhiker 1)",
+                    "Stuff 1/2021",
+                ],
+                [str(objs[ids[0]]), str(objs[ids[1]].book), str(objs[ids[2]])],
+            )
+        self.assertEquals(3, len(objs))
+
+        self.assertEquals(("books.edition", 12), parse_id("edition-12"))
+        self.assertIsNone(parse_id("edition-"))
+        self.assertIsNone(parse_id("book-12"))
+
+    def test_refresh(self):
+        index = SearchIndex()
+        index.refresh()
+        rebuilt_at = index._rebuilt_at
+
+        paper = Paper.objects.get(title="Long Short-Term Memory")
+        self._add_file(paper, "lstm.pdf")
+        series = Series.objects.get(name="Hitchhiker")
+        series.name = "H2G2"
+        series.save()
+        self.issue.delete()
+
+        self.assertTrue(index.refresh(force=True))
+        self.assertEquals(rebuilt_at, index._rebuilt_at)
+        self.assertEquals(3, len(index))
+        self.assertEquals([f"paper-{paper.pk}"], index.search(["memory"]))
+        self.assertEquals([f"edition-{self.edition.pk}"], index.search(["h2g2 1"]))
+        self.assertEquals([], index.search(["stuff"]))
@@ -0,0 +1,48 @@
+# -*- coding: utf-8 -*-
+# vim: ft=python fileencoding=utf-8 sts=4 sw=4 et:
+# Copyright (C) 2016-2022 J. Nathanael Philipp (jnphilipp) <nathanael@philipp.land>
+#
+# This file is part of bibliothek.
+#
+# bibliothek is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# bibliothek is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with bibliothek.  If not, see <http://www.gnu.org/licenses/>.
+
+import os
+
+from bibliothek.settings import secret_key
+from django.test import SimpleTestCase
+from pathlib import Path
+from tempfile import TemporaryDirectory
+
+
+class SettingsTestCase(SimpleTestCase):
+    def test_secret_key(self):
+        with TemporaryDirectory() as tmpdir:
+            path = Path(tmpdir) / "bibliothek" / "secret_key"
+            key = secret_key(path)
+            self.assertEquals(128, len(key))
+            self.assertEquals(f"{key}\n", path.read_text(encoding="utf8"))
+            self.assertEquals(0o600, path.stat().st_mode & 0o777)
+            self.assertEquals(key, secret_key(path))
+
+            path.write_text(" \n", encoding="utf8")
+            key = secret_key(path)
+            self.assertEquals(128, len(key))
+            self.assertEquals(f"{key}\n", path.read_text(encoding="utf8"))
+            self.assertEquals(0o600, path.stat().st_mode & 0o777)
+            self.assertEquals(["secret_key"], os.listdir(path.parent))
+
+            path = Path(tmpdir) / "file" / "secret_key"
+            path.parent.touch()
+            self.assertEquals(128, len(secret_key(path)))
+            self.assertNotEqual(secret_key(path), secret_key(path))
@@ -0,0 +1,114 @@
+# -*- coding: utf-8 -*-
+# vim: ft=python fileencoding=utf-8 sts=4 sw=4 et:
+# Copyright (C) 2016-2022 J. Nathanael Philipp (jnphilipp) <nathanael@philipp.land>
+#
+# This file is part of bibliothek.
+#
+# bibliothek is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# bibliothek is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with bibliothek.  If not, see <http://www.gnu.org/licenses/>.
+
+from bibliothek.statistics import statistics
+from books.models import Book, Edition
+from django.test import TestCase
+from magazines.models import Issue, Magazine
+from papers.models import Paper
+from shelves.models import Acquisition, Read
+
+
+class StatisticsTestCase(TestCase):
+    def setUp(self):
+        book, created = Book.from_dict(
+            {"title": "Dune", "genres": [{"name": "Science Fiction"}]}
+        )
+        edition, created = Edition.from_dict(
+            {
+                "isbn": "9780441172719",
+                "languages": [{"name": "English"}],
+                "acquisitions": [{"date": "2020-05-01", "price": 9.99}],
+                "reads": [
+                    {"started": "2020-06-01", "finished": "2020-07-01"},
+                    {"started": "2021-01-01", "finished": "2021-02-01"},
+                ],
+            },
+            book,
+        )
+        edition, created = Edition.from_dict(
+            {
+                "isbn": "9783453317178",
+                "languages": [{"name": "Deutsch"}],
+                "acquisitions": [{"date": "2021-05-01", "price": 12.0}],
+                "reads": [{"started": "2021-03-01", "finished": "2021-04-01"}],
+            },
+            book,
+        )
+        Book.from_dict(
+            {
+                "title": "Neuromancer",
+                "genres": [{"name": "Science Fiction"}, {"name": "Cyberpunk"}],
+            }
+        )
+
+        magazine, created = Magazine.from_dict({"name": "Stuff"})
+        issue, created = Issue.from_dict({"issue": "1/2021"}, magazine)
+        Read.from_dict({"started": "2021-01-01", "finished": "2021-01-02"}, issue)
+        Issue.from_dict({"issue": "2/2021"}, magazine)
+
+        self.paper, created = Paper.from_dict(
+            {
+                "title": "Long Short-Term Memory",
+                "languages": [{"name": "English"}],
+            }
+        )
+        Acquisition.from_dict({"price": 5.0}, self.paper)
+
+    def test_statistics(self):
+        with self.assertNumQueries(11):
+            stats = statistics(2021)
+        self.assertEquals(
+            {
+                "books.book": (2, 1, 1),
+                "books.edition": (2, 2, 2),
+                "magazines.magazine": (1, 1, 1),
+                "magazines.issue": (2, 1, 1),
+                "papers.paper": (1, 0, 0),
+            },
+            stats["totals"],
+        )
+        self.assertEquals(
+            {
+                2020: {"books.edition": 1, "magazines.issue": 0, "papers.paper": 0},
+                2021: {"books.edition": 2, "magazines.issue": 1, "papers.paper": 0},
+            },
+            stats["years"],
+        )
+        self.assertEquals(
+            [("Cyberpunk", 1, 0), ("Science Fiction", 2, 1)], stats["genres"]
+        )
+        self.assertEquals([("Deutsch", 1, 1), ("English", 2, 1)], stats["languages"])
+        self.assertEquals(
+            [(None, 1, 5.0), (2020, 1, 9.99), (2021, 1, 12.0)], stats["spending"]
+        )
+        self.assertEquals((2, 1, 1), statistics(2020)["totals"]["books.book"])
+        self.assertEquals((2, 1, 0), statistics(2019)["totals"]["books.book"])
+
+    def test_cache(self):
+        statistics(2021)
+        with self.assertNumQueries(1):
+            stats = statistics(2021)
+        self.assertEquals((1, 0, 0), stats["totals"]["papers.paper"])
+
+        Read.from_dict({"started": "2021-01-01", "finished": "2021-01-05"}, self.paper)
+        self.assertEquals((1, 1, 1), statistics(2021)["totals"]["papers.paper"])
+
+        Acquisition.objects.filter(date__isnull=True).update(price=1.0)
+        self.assertEquals((None, 1, 1.0), statistics(2021)["spending"][0])
@@ -17,8 +17,11 @@
 # You should have received a copy of the GNU General Public License
 # along with bibliothek.  If not, see <http://www.gnu.org/licenses/>.
 
+import json
+
 from bibliothek import stdout
 from django.test import TestCase
+from django.utils.translation import gettext_lazy as _
 from io import StringIO
 
 
@@ -55,3 +58,79 @@ class StdoutTestCase(TestCase):
         with StringIO() as cout:
             stdout.write(["1", "2"], "#", [0.5], 10, cout)
             self.assertEquals("1    2    \n##########\n", cout.getvalue())
+
+    def test_write_wide(self):
+        with StringIO() as cout:
+            stdout.write(["日本", "x"], None, [0.5], 10, cout)
+            self.assertEquals("日本 x    \n", cout.getvalue())
+
+        with StringIO() as cout:
+            stdout.write(["日本語です", "x"], None, [0.5], 10, cout)
+            self.assertEquals("日本 x    \n語で      \nす        \n", cout.getvalue())
+
+    def test_positions(self):
+        positions = [0.5]
+        with StringIO() as cout:
+            stdout.write([1, 2], positions=positions, line_length=20, file=cout)
+        self.assertEquals([0.5], positions)
+
+    def test_table_writer(self):
+        rows = [[1, "a"], [2, "b b b b b b b"], [3, "c"]]
+        with StringIO() as cout:
+            stdout.write(["Id", "Name"], "=", [0.3], 20, cout)
+            stdout.write(rows[0], "_", [0.3], 20, cout)
+            stdout.write(rows[1], "_", [0.3], 20, cout)
+            stdout.write(rows[2], "=", [0.3], 20, cout)
+            expected = cout.getvalue()
+
+        with StringIO() as cout:
+            stdout.TableWriter([0.3], 20, cout).write_table(["Id", "Name"], rows)
+            self.assertEquals(expected, cout.getvalue())
+
+        with StringIO() as cout:
+            with stdout.TableWriter([0.3], 20, cout) as writer:
+                writer.write(["Id", "Name"], "=")
+                self.assertEquals("", cout.getvalue())
+            self.assertEquals(
+                "Id    Name          \n====================\n", cout.getvalue()
+            )
+
+    def test_table_writer_formats(self):
+        header = [_("Id"), _("Name"), _("Number of books")]
+        rows = [[1, "a, b", 2], [2, 'c "d"', None]]
+
+        with StringIO() as cout:
+            stdout.table_writer("json", [0.3], cout).write_table(header, rows)
+            self.assertEquals(
+                '[\n{"id": 1, "name": "a, b", "number_of_books": 2},\n'
+                + '{"id": 2, "name": "c \\"d\\"", "number_of_books": null}\n]\n',
+                cout.getvalue(),
+            )
+            self.assertEquals(2, len(json.loads(cout.getvalue())))
+
+        with StringIO() as cout:
+            stdout.table_writer("json", [0.3], cout).write_table(header, [])
+            self.assertEquals([], json.loads(cout.getvalue()))
+
+        with StringIO() as cout:
+            stdout.table_writer("jsonl", [0.3], cout).write_table(header, rows)
+            self.assertEquals(
+                [{"id": 1, "name": "a, b", "number_of_books": 2}],
+                [json.loads(line) for line in cout.getvalue().splitlines()][:1],
+            )
+            self.assertEquals(2, len(cout.getvalue().splitlines()))
+
+        with StringIO() as cout:
+            stdout.table_writer("csv", [0.3], cout).write_table(header, rows)
+            self.assertEquals(
+                'id,name,number_of_books\n1,"a, b",2\n2,"c ""d""",\n', cout.getvalue()
+            )
+
+        with StringIO() as cout:
+            stdout.table_writer("tsv", [0.3], cout).write_table(header, rows)
+            self.assertEquals(
+                'id\tname\tnumber_of_books\n1\ta, b\t2\n2\t"c ""d"""\t\n',
+                cout.getvalue(),
+            )
+
+        self.assertIsInstance(stdout.table_writer("table", [0.3]), stdout.TableWriter)
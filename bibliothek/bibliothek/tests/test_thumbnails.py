@@ -0,0 +1,75 @@
+# -*- coding: utf-8 -*-
+# vim: ft=python fileencoding=utf-8 sts=4 sw=4 et:
+# Copyright (C) 2016-2022 J. Nathanael Philipp (jnphilipp) <nathanael@philipp.land>
+#
+# This file is part of bibliothek.
+#
+# bibliothek is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# bibliothek is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with bibliothek.  If not, see <http://www.gnu.org/licenses/>.
+
+import os
+
+from bibliothek.thumbnails import thumbnail
+from django.conf import settings
+from django.test import override_settings, TestCase
+from pathlib import Path
+from PIL import Image
+from tempfile import mkdtemp
+from unittest import mock
+
+
+@override_settings(APP_CACHE_DIR=Path(mkdtemp()), MEDIA_ROOT=Path(mkdtemp()))
+class ThumbnailsTestCase(TestCase):
+    def setUp(self):
+        self.path = settings.MEDIA_ROOT / "cover.jpg"
+        Image.new("CMYK", (600, 900), (0, 128, 255, 0)).save(self.path)
+
+    def test_thumbnail(self):
+        path = thumbnail(self.path)
+        self.assertIsNotNone(path)
+        self.assertIn(settings.APP_CACHE_DIR, path.parents)
+        with Image.open(path) as image:
+            self.assertEquals(64, max(image.size))
+            self.assertEquals("RGB", image.mode)
+
+        self.assertEquals(path, thumbnail(self.path))
+        self.assertNotEquals(path, thumbnail(self.path, 128))
+
+        mtime = self.path.stat().st_mtime_ns
+        os.utime(self.path, ns=(mtime + 10**9, mtime + 10**9))
+        self.assertNotEquals(path, thumbnail(self.path))
+
+        self.assertIsNone(thumbnail(settings.MEDIA_ROOT / "missing.jpg"))
+        (settings.MEDIA_ROOT / "broken.jpg").write_bytes(b"Lorem ipsum")
+        self.assertIsNone(thumbnail(settings.MEDIA_ROOT / "broken.jpg"))
+
+    def test_decompression_bomb(self):
+        with mock.patch("PIL.Image.MAX_IMAGE_PIXELS", 1000):
+            self.assertIsNone(thumbnail(self.path))
+            self.assertEquals(
+                404, self.client.get("/thumbnails/64/cover.jpg").status_code
+            )
+
+    def test_view(self):
+        response = self.client.get("/thumbnails/256/cover.jpg")
+        self.assertEquals(200, response.status_code)
+        self.assertEquals("image/png", response["Content-Type"])
+        response.close()
+
+        self.assertEquals(404, self.client.get("/thumbnails/100/cover.jpg").status_code)
+        self.assertEquals(
+            404, self.client.get("/thumbnails/64/missing.jpg").status_code
+        )
+        self.assertEquals(
+            404, self.client.get("/thumbnails/64/../../etc/passwd").status_code
+        )
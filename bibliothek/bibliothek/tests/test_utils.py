@@ -17,8 +17,19 @@
 # You should have received a copy of the GNU General Public License
 # along with bibliothek.  If not, see <http://www.gnu.org/licenses/>.
 
-from bibliothek.utils import lookahead
+import hashlib
+
+from bibliothek.utils import (
+    iterjson,
+    lookahead,
+    search_key,
+    search_key_filter,
+    unique_slug,
+    unique_slugs,
+)
+from books.models import Book
 from django.test import TestCase
+from io import StringIO
 
 
 class UtilsTestCase(TestCase):
@@ -30,3 +41,72 @@ class UtilsTestCase(TestCase):
         self.assertEquals(
             [("1", True), ("2", True), ("3", False)], list(lookahead(["1", "2", "3"]))
         )
+
+    def test_search_key(self):
+        self.assertEquals("secret files 1", search_key("Secret  Files", "1"))
+        self.assertEquals("stuff 1/2021", search_key(" Stuff\t", None, "1/2021 "))
+        self.assertEquals("", search_key())
+
+        q = search_key_filter("search_key", "Secret Files 1")
+        self.assertEquals(
+            [
+                ("search_key__gte", "secret"),
+                ("search_key__lt", "secret\U0010ffff"),
+                ("search_key__contains", "files"),
+                ("search_key__contains", "1"),
+            ],
+            q.children,
+        )
+
+        q = search_key_filter("search_key", "Secret Files", False)
+        self.assertEquals(
+            [("search_key__contains", "secret"), ("search_key__contains", "files")],
+            q.children,
+        )
+
+    def test_unique_slugs(self):
+        self.assertEquals(["cool", "cool-2"], unique_slugs(Book, ["Cool", "COOL"]))
+        self.assertEquals(
+            [hashlib.sha512("!".encode("utf8")).hexdigest()], unique_slugs(Book, ["!"])
+        )
+
+        book, created = Book.from_dict({"title": "Cool"})
+        self.assertEquals("cool", book.slug)
+        self.assertEquals("cool", unique_slug(Book, "cool", book.pk))
+        self.assertEquals("cool-2", unique_slug(Book, "cool"))
+
+        Book.from_dict({"title": "cool"})
+        Book.objects.filter(slug="cool-2").update(slug="cool-3")
+        self.assertEquals(["cool-2", "cool-4"], unique_slugs(Book, ["COOL", "cOOl"]))
+        self.assertEquals("cool-2", Book.from_dict({"title": "COOL"})[0].slug)
+
+    def test_iterjson(self):
+        data = (
+            '{"books": [{"title": "A"}, {"title": "B", "volume": 12345}], '
+            + '"magazines": [], "version": 1.25, "papers": [{"title": "C"}]}'
+        )
+        for chunk_size in [1, 3, 7, 1024]:
+            with StringIO(data) as f:
+                self.assertEquals(
+                    [
+                        ("books", {"title": "A"}),
+                        ("books", {"title": "B", "volume": 12345}),
+                        ("version", 1.25),
+                        ("papers", {"title": "C"}),
+                    ],
+                    list(iterjson(f, chunk_size)),
+                )
+
+        with StringIO(" { } ") as f:
+            self.assertEquals([], list(iterjson(f)))
+
+        data = '{"books": [' + ", ".join(f'{{"title": "{i}"}}' for i in range(1000))
+        for chunk_size in [5, 65536]:
+            with StringIO(data + "], " + '"version": 2}') as f:
+                items = list(iterjson(f, chunk_size))
+            self.assertEquals(1001, len(items))
+            self.assertEquals(("books", {"title": "999"}), items[999])
+            self.assertEquals(("version", 2), items[1000])
+
+        with StringIO('{"books": [{"title": "A"}') as f:
+            self.assertRaises(ValueError, list, iterjson(f, 4))
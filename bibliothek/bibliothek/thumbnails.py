@@ -0,0 +1,74 @@
+# -*- coding: utf-8 -*-
+# vim: ft=python fileencoding=utf-8 sts=4 sw=4 et:
+# Copyright (C) 2016-2022 J. Nathanael Philipp (jnphilipp) <nathanael@philipp.land>
+#
+# This file is part of bibliothek.
+#
+# bibliothek is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# bibliothek is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with bibliothek.  If not, see <http://www.gnu.org/licenses/>.
+"""Bibliothek Django app thumbnails.
+
+Downscaled cover images, cached in the app cache dir. A thumbnail is keyed by
+the path and the modification time of the image, so a changed image gets a new
+thumbnail.
+"""
+
+import hashlib
+import os
+
+from django.conf import settings
+from pathlib import Path
+from PIL import Image
+from tempfile import NamedTemporaryFile
+from typing import Optional, Union
+
+SIZES = [64, 128, 256, 512]
+
+
+def thumbnail(path: Union[str, Path], size: int = 64) -> Optional[Path]:
+    """Get thumbnail of an image, it is created if not cached yet.
+
+    Returns the path of the thumbnail, None if the image can not be read or is too
+    large to decode safely.
+
+    Args:
+        * path: path of the image
+        * size: maximum width and height of the thumbnail
+    """
+    path = Path(path).resolve()
+    try:
+        mtime = path.stat().st_mtime_ns
+    except OSError:
+        return None
+
+    key = hashlib.sha1(f"{path}\0{mtime}\0{size}".encode("utf8")).hexdigest()
+    thumbnail_path = settings.APP_CACHE_DIR / "thumbnails" / f"{key}.png"
+    if thumbnail_path.exists():
+        return thumbnail_path
+
+    try:
+        with Image.open(path) as image:
+            image.draft("RGB", (size, size))
+            if image.mode not in ["1", "L", "LA", "P", "RGB", "RGBA"]:
+                image = image.convert("RGB")
+            image.thumbnail((size, size))
+
+            thumbnail_path.parent.mkdir(parents=True, exist_ok=True)
+            with NamedTemporaryFile(
+                dir=thumbnail_path.parent, suffix=".png", delete=False
+            ) as f:
+                image.save(f, "PNG")
+            os.replace(f.name, thumbnail_path)
+    except (OSError, Image.DecompressionBombError):
+        return None
+    return thumbnail_path
@@ -54,6 +54,8 @@ urlpatterns = [
     path("publishers/", include("publishers.urls")),
     path("series/", include("series.urls")),
     path("admin/", admin.site.urls),
+    path("reading-list/", views.reading_list, name="reading_list"),
+    path("thumbnails/<int:size>/<path:name>", views.thumbnail, name="thumbnail"),
     path(
         "favicon.ico",
         RedirectView.as_view(url="/static/images/bibliothek-symbolic.png"),
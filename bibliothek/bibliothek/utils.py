@@ -18,7 +18,14 @@
 # along with bibliothek.  If not, see <http://www.gnu.org/licenses/>.
 """Bibliotheek Django app utils."""
 
-from typing import Any, Dict, Generator, Iterable, Optional, Tuple
+import hashlib
+import json
+
+from bibliothek import fts
+from django.db import models
+from django.db.models import Q
+from django.template.defaultfilters import slugify
+from typing import Any, Dict, Generator, Iterable, List, Optional, TextIO, Tuple, Type
 
 
 def lookahead(iterable: Optional[Iterable]) -> Generator[Tuple[Any, bool], None, None]:
@@ -48,3 +55,160 @@ def concat(*args: Tuple[int, Dict[str, int]]) -> Tuple[int, Dict[str, int]]:
             else:
                 d[k] = v
     return n, d
+
+
+def search_key(*parts: Optional[str]) -> str:
+    """Normalized search key, lower case with single spaces between words."""
+    return " ".join(" ".join([p for p in parts if p]).lower().split())
+
+
+def search_key_filter(field: str, term: str, prefix: bool = True) -> Q:
+    """Filter for search keys matching a term.
+
+    With `prefix` the first word of the term has to be a prefix of the key, which
+    is an index range lookup, the other words have to be contained in the key.
+    Without, every word has to be contained in the key anywhere.
+
+    Args:
+        * field: name of the search key field
+        * term: term to search for
+        * prefix: whether the key has to start with the first word
+    """
+    words = search_key(term).split(" ")
+    if prefix:
+        q = Q(**{f"{field}__gte": words[0], f"{field}__lt": f"{words[0]}\U0010ffff"})
+    else:
+        q = Q(**{f"{field}__contains": words[0]})
+    for word in words[1:]:
+        q &= Q(**{f"{field}__contains": word})
+    return q
+
+
+def slug(value: str) -> str:
+    """Slug of the value, its SHA-512 hash if it has no characters to slugify."""
+    return slugify(value) or hashlib.sha512(value.encode("utf8")).hexdigest()
+
+
+def unique_slugs(
+    model: Type[models.Model], values: List[str], pk: Optional[int] = None
+) -> List[str]:
+    """Slugs of the values, unique among each other and the objects of the model.
+
+    A slug already taken gets the first free suffix "-2", "-3", ...
+
+    Args:
+        * model: model with a unique slug field
+        * values: values to slugify, e.g. names or titles
+        * pk: primary key of the object the slug is for, if it exists
+    """
+    query_set = model.objects.all() if pk is None else model.objects.exclude(pk=pk)
+    slugs = [slug(value) for value in values]
+    taken = set()
+    for chunk in fts.chunks(set(slugs)):
+        taken.update(query_set.filter(slug__in=chunk).values_list("slug", flat=True))
+    for i, s in enumerate(slugs):
+        if s in taken:
+            taken.update(
+                query_set.filter(slug__startswith=f"{s}-").values_list(
+                    "slug", flat=True
+                )
+            )
+            n = 2
+            while f"{s}-{n}" in taken:
+                n += 1
+            slugs[i] = f"{s}-{n}"
+        taken.add(slugs[i])
+    return slugs
+
+
+def unique_slug(model: Type[models.Model], value: str, pk: Optional[int] = None) -> str:
+    """Slug of the value, unique among the objects of the model, see `unique_slugs`.
+
+    Args:
+        * model: model with a unique slug field
+        * value: value to slugify, e.g. a name or title
+        * pk: primary key of the object the slug is for, if it exists
+    """
+    return unique_slugs(model, [value], pk)[0]
+
+
+def iterjson(
+    fp: TextIO, chunk_size: int = 65536
+) -> Generator[Tuple[str, Any], None, None]:
+    """Iterate incrementally over a JSON object read from a file.
+
+    Yields a `(key, item)` tuple for every item of the arrays of the top-level
+    object, values that are not arrays are yielded as a whole. The file is read in
+    chunks, so only a single item has to be held in memory at a time.
+
+    Args:
+        * fp: file to read from
+        * chunk_size: number of characters to read at once
+    """
+    decoder = json.JSONDecoder()
+    buffer = ""
+    pos = 0
+
+    def _read() -> bool:
+        nonlocal buffer, pos
+        chunk = fp.read(max(chunk_size, len(buffer) - pos))
+        buffer = buffer[pos:] + chunk
+        pos = 0
+        return chunk != ""
+
+    def _peek() -> str:
+        nonlocal pos
+        while True:
+            while pos < len(buffer) and buffer[pos].isspace():
+                pos += 1
+            if pos < len(buffer):
+                return buffer[pos]
+            if not _read():
+                raise ValueError("Unexpected end of JSON data.")
+
+    def _next(expected: str) -> str:
+        nonlocal pos
+        c = _peek()
+        if c not in expected:
+            raise ValueError(f'Expected one of "{expected}" but got "{c}".')
+        pos += 1
+        return c
+
+    def _value() -> Any:
+        nonlocal pos
+        _peek()
+        while True:
+            try:
+                value, end = decoder.raw_decode(buffer, pos)
+                # a number at the end of the buffer might continue in the next chunk
+                if end < len(buffer) and buffer[end] not in "+-.0123456789Ee":
+                    pos = end
+                    return value
+                # reading drops everything before pos from the buffer
+                end -= pos
+                if not _read():
+                    pos = end
+                    return value
+            except json.JSONDecodeError:
+                if not _read():
+                    raise
+
+    _next("{")
+    if _peek() == "}":
+        return
+    while True:
+        key = _value()
+        _next(":")
+        if _peek() == "[":
+            _next("[")
+            if _peek() == "]":
+                _next("]")
+            else:
+                while True:
+                    yield key, _value()
+                    if _next(",]") == "]":
+                        break
+        else:
+            yield key, _value()
+        if _next(",}") == "}":
+            break
@@ -18,9 +18,13 @@
 # along with bibliothek.  If not, see <http://www.gnu.org/licenses/>.
 """Bibliothek Django app views."""
 
+from bibliothek import reading, thumbnails
 from books.models import Edition
 from django.contrib.contenttypes.models import ContentType
+from django.core.exceptions import SuspiciousFileOperation
+from django.core.files.storage import default_storage
 from django.db.models import Case, TextField, When
+from django.http import FileResponse, Http404
 from django.shortcuts import render
 from magazines.models import Issue
 from papers.models import Paper
@@ -61,3 +65,23 @@ def dashboard(request):
     )
 
     return render(request, "bibliothek/dashboard.html", locals())
+
+
+def reading_list(request):
+    """Reading list view."""
+    limit = request.GET.get("limit", "100")
+    entries = reading.reading_list(int(limit) if limit.isdigit() else 100)
+    return render(request, "bibliothek/reading_list.html", locals())
+
+
+def thumbnail(request, size: int, name: str):
+    """Thumbnail view."""
+    if size not in thumbnails.SIZES:
+        raise Http404
+    try:
+        path = thumbnails.thumbnail(default_storage.path(name), size)
+    except SuspiciousFileOperation:
+        raise Http404
+    if path is None:
+        raise Http404
+    return FileResponse(open(path, "rb"), content_type="image/png")
@@ -21,14 +21,14 @@
 import sys
 
 from argparse import _SubParsersAction
-from bibliothek import stdout
-from bibliothek.utils import lookahead
+from bibliothek import pagination, stdout
 from django.utils.translation import gettext_lazy as _
 from bindings.models import Binding
 from typing import Optional, TextIO
 
 
-def _binding(args, file: TextIO = sys.stdout):
+def _binding(args, file: Optional[TextIO] = None):
+    file = sys.stdout if file is None else file
     binding: Optional[Binding] = None
     if args.subparser == "add":
         binding, created = Binding.from_dict({"name": args.name})
@@ -78,9 +78,13 @@ def _binding(args, file: TextIO = sys.stdout):
             bindings = Binding.search(args.search)
         else:
             bindings = Binding.objects.all()
-        stdout.write([_("Id"), _("Name")], "=", [0.05], file=file)
-        for i, has_next in lookahead(bindings):
-            stdout.write([i.id, i.name], "_" if has_next else "=", [0.05], file=file)
+        stdout.table_writer(args.format, [0.05], file).write_table(
+            [_("Id"), _("Name")],
+            (
+                [i.id, i.name]
+                for i in pagination.iterate(bindings, args.limit, args.after)
+            ),
+        )
 
 
 def add_subparser(parser: _SubParsersAction):
@@ -110,3 +114,4 @@ def add_subparser(parser: _SubParsersAction):
     # binding list
     list_parser = subparser.add_parser("list", help=_("List bindings"))
     list_parser.add_argument("--search", help=_("Filter by name"))
+    pagination.add_arguments(list_parser)
@@ -20,10 +20,10 @@
 
 import sys
 
-from bibliothek import stdout
+from bibliothek import lookup, stdout
+from bibliothek.utils import unique_slug
 from django.db import models
 from django.db.models import F, Func, Q
-from django.template.defaultfilters import slugify
 from django.utils.translation import gettext_lazy as _
 from typing import Dict, Optional, TextIO, Tuple, Type, TypeVar
 
@@ -50,17 +50,7 @@ class Binding(models.Model):
     @classmethod
     def get(cls: Type[T], term: str) -> Optional[T]:
         """Search for given term, return single object."""
-        query_set = cls.search(term)
-        if query_set.count() == 0:
-            return None
-        elif query_set.count() > 1:
-            if term.isdigit():
-                query_set = query_set.filter(pk=term)
-            else:
-                query_set = query_set.filter(name=term)
-            if query_set.count() != 1:
-                return None
-        return query_set[0]
+        return lookup.get_one(cls.search(term), term, Q(name=term))
 
     @classmethod
     def get_or_create(cls: Type[T], term: str) -> T:
@@ -95,8 +85,9 @@ class Binding(models.Model):
             ]
         )
 
-    def print(self: T, file: TextIO = sys.stdout):
+    def print(self: T, file: Optional[TextIO] = None):
         """Print instance info."""
+        file = sys.stdout if file is None else file
         stdout.write([_("Field"), _("Value")], "=", [0.33], file=file)
         stdout.write([_("Id"), self.id], positions=[0.33], file=file)
         stdout.write([_("Name"), self.name], positions=[0.33], file=file)
@@ -104,11 +95,11 @@ class Binding(models.Model):
     def save(self: T, *args, **kwargs):
         """Save in DB."""
         if not self.slug:
-            self.slug = slugify(self.name)
+            self.slug = unique_slug(Binding, self.name, self.pk)
         else:
             orig = Binding.objects.get(pk=self.id)
             if orig.name != self.name:
-                self.slug = slugify(self.name)
+                self.slug = unique_slug(Binding, self.name, self.pk)
         super(Binding, self).save(*args, **kwargs)
 
     def to_dict(self: T) -> Dict:
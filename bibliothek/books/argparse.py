@@ -22,8 +22,7 @@ import os
 import sys
 
 from argparse import _SubParsersAction, Namespace
-from bibliothek import stdout
-from bibliothek.utils import lookahead
+from bibliothek import pagination, stdout
 from bibliothek.argparse import valid_date
 from bindings.models import Binding
 from books.models import Book, Edition
@@ -40,7 +39,8 @@ from shelves.argparse import acquisition_subparser, read_subparser
 from typing import Optional, TextIO
 
 
-def _book(args: Namespace, file: TextIO = sys.stdout):
+def _book(args: Namespace, file: Optional[TextIO] = None):
+    file = sys.stdout if file is None else file
     book: Optional[Book] = None
     if args.subparser == "add":
         book, created = Book.from_dict(
@@ -49,9 +49,9 @@ def _book(args: Namespace, file: TextIO = sys.stdout):
                 "authors": [
                     Person.get_or_create(author).to_dict() for author in args.author
                 ],
-                "series": Series.get_or_create(args.series).to_dict()
-                if args.series
-                else None,
+                "series": (
+                    Series.get_or_create(args.series).to_dict() if args.series else None
+                ),
                 "volume": args.volume,
                 "genres": [
                     Genre.get_or_create(genre).to_dict() for genre in args.genre
@@ -154,12 +154,16 @@ def _book(args: Namespace, file: TextIO = sys.stdout):
                         "isbn": args.isbn,
                         "publishing_date": args.publishing_date,
                         "cover": args.cover,
-                        "binding": Binding.get_or_create(args.binding).to_dict()
-                        if args.binding
-                        else None,
-                        "publisher": Publisher.get_or_create(args.publisher).to_dict()
-                        if args.publisher
-                        else None,
+                        "binding": (
+                            Binding.get_or_create(args.binding).to_dict()
+                            if args.binding
+                            else None
+                        ),
+                        "publisher": (
+                            Publisher.get_or_create(args.publisher).to_dict()
+                            if args.publisher
+                            else None
+                        ),
                         "persons": [
                             Person.get_or_create(person).to_dict()
                             for person in args.person
@@ -214,12 +218,15 @@ def _book(args: Namespace, file: TextIO = sys.stdout):
                     stdout.write(_("No edition found."), "", file=file)
             elif args.edition_subparser == "list" and book:
                 if args.shelf:
-                    editions = Edition.list.by_shelf(args.shelf, book)
+                    editions = Edition.by_shelf(args.shelf, book)
                 elif args.search:
-                    editions = Edition.list.by_term(args.search, book)
+                    editions = Edition.search(args.search, book)
                 else:
                     editions = Edition.objects.filter(book=book)
-                stdout.write(
+                editions = editions.select_related("binding", "book")
+                stdout.table_writer(
+                    args.format, [0.05, 0.55, 0.7, 0.85], file
+                ).write_table(
                     [
                         _("Id"),
                         _("Title"),
@@ -227,17 +234,11 @@ def _book(args: Namespace, file: TextIO = sys.stdout):
                         _("ISBN"),
                         _("Publishing date"),
                     ],
-                    "=",
-                    [0.05, 0.55, 0.7, 0.85],
-                    file=file,
+                    (
+                        [i.pk, i.get_title(), i.binding, i.isbn, i.publishing_date]
+                        for i in pagination.iterate(editions, args.limit, args.after)
+                    ),
                 )
-                for i, has_next in lookahead(editions):
-                    stdout.write(
-                        [i.pk, i.get_title(), i.binding, i.isbn, i.publishing_date],
-                        "_" if has_next else "=",
-                        [0.05, 0.55, 0.7, 0.85],
-                        file=file,
-                    )
             elif args.edition_subparser == "open" and book:
                 edition = Edition.get(args.edition, book)
                 if edition:
@@ -312,25 +313,22 @@ def _book(args: Namespace, file: TextIO = sys.stdout):
             books = Book.by_shelf(args.shelf)
         else:
             books = Book.objects.all()
-        stdout.write(
-            [_("Id"), ("Title"), _("Authors"), _("Series"), _("Volume")],
-            "=",
-            [0.05, 0.5, 0.75, 0.9],
-            file=file,
-        )
-        for i, has_next in lookahead(books):
-            stdout.write(
+        books = books.select_related("series")
+        stdout.table_writer(args.format, [0.05, 0.5, 0.75, 0.9], file).write_table(
+            [_("Id"), _("Title"), _("Authors"), _("Series"), _("Volume")],
+            (
                 [
                     i.pk,
                     i.title,
                     " ,".join(f"{a}" for a in i.authors.all()),
                     i.series.name if i.series else "",
                     i.volume,
-                ],
-                "_" if has_next else "=",
-                [0.05, 0.5, 0.75, 0.9],
-                file=file,
-            )
+                ]
+                for i in pagination.iterate(
+                    books, args.limit, args.after, prefetches=["authors"]
+                )
+            ),
+        )
 
 
 def add_subparser(parser: _SubParsersAction):
@@ -386,6 +384,7 @@ def add_subparser(parser: _SubParsersAction):
         "--shelf", choices=["read", "unread"], help=_("Filter books by shelves")
     )
     list_parser.add_argument("--search", help=_("Filter books by term"))
+    pagination.add_arguments(list_parser)
 
 
 def edition_subparser(parser: _SubParsersAction):
@@ -464,6 +463,7 @@ def edition_subparser(parser: _SubParsersAction):
         "--shelf", choices=["read", "unread"], help=_("Filter editions by shelf")
     )
     list_parser.add_argument("--search", help=_("Filter editions by term"))
+    pagination.add_arguments(list_parser)
 
     # edition open
     help_txt = _("Open a file associated with an edition")
@@ -0,0 +1,27 @@
+# Generated by Django 4.2.30 on 2026-10-18 19:34
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("books", "0006_edition_edition"),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name="book",
+            name="updated_at",
+            field=models.DateTimeField(
+                auto_now=True, db_index=True, verbose_name="Updated at"
+            ),
+        ),
+        migrations.AlterField(
+            model_name="edition",
+            name="updated_at",
+            field=models.DateTimeField(
+                auto_now=True, db_index=True, verbose_name="Updated at"
+            ),
+        ),
+    ]
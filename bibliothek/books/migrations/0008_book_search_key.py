@@ -0,0 +1,39 @@
+# Generated by Django 4.2.30 on 2026-10-18 19:46
+
+from django.db import migrations, models
+
+
+# frozen copy of bibliothek.utils.search_key as of this migration
+def search_key(*parts):
+    return " ".join(" ".join([p for p in parts if p]).lower().split())
+
+
+def set_search_keys(apps, schema_editor):
+    Book = apps.get_model("books", "Book")
+
+    books = list(Book.objects.filter(series__isnull=False).select_related("series"))
+    for book in books:
+        book.search_key = search_key(book.series.name, f"{book.volume:g}")
+    Book.objects.bulk_update(books, ["search_key"], batch_size=1000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("books", "0007_alter_book_updated_at_alter_edition_updated_at"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="book",
+            name="search_key",
+            field=models.TextField(
+                blank=True,
+                db_index=True,
+                editable=False,
+                null=True,
+                verbose_name="Search key",
+            ),
+        ),
+        migrations.RunPython(set_search_keys, migrations.RunPython.noop),
+    ]
@@ -19,21 +19,24 @@
 """Books Django app models."""
 
 import datetime
-import hashlib
 import os
 import shutil
 import sys
 
-from bibliothek import stdout
-from bibliothek.utils import concat, lookahead
+from bibliothek import fts, lookup, stdout
+from bibliothek.utils import (
+    concat,
+    lookahead,
+    search_key,
+    search_key_filter,
+    unique_slug,
+)
 from bindings.models import Binding
 from django.conf import settings
 from django.contrib.contenttypes.fields import GenericRelation
 from django.core.files import File as DJFile
 from django.db import models
-from django.db.models import F, Func, Q, Value
-from django.db.models.functions import Concat
-from django.template.defaultfilters import slugify
+from django.db.models import F, Func, Q, prefetch_related_objects
 from django.utils.translation import gettext_lazy as _
 from files.models import File
 from genres.models import Genre
@@ -52,7 +55,9 @@ class Book(models.Model):
     T = TypeVar("T", bound="Book", covariant=True)
 
     created_at = models.DateTimeField(auto_now_add=True, verbose_name=_("Created at"))
-    updated_at = models.DateTimeField(auto_now=True, verbose_name=_("Updated at"))
+    updated_at = models.DateTimeField(
+        auto_now=True, db_index=True, verbose_name=_("Updated at")
+    )
 
     slug = models.SlugField(max_length=2048, unique=True, verbose_name=_("Slug"))
     title = models.TextField(unique=True, verbose_name=_("Title"))
@@ -69,6 +74,13 @@ class Book(models.Model):
         verbose_name=_("Series"),
     )
     volume = models.FloatField(default=0, blank=True, verbose_name=_("Volume"))
+    search_key = models.TextField(
+        blank=True,
+        null=True,
+        db_index=True,
+        editable=False,
+        verbose_name=_("Search key"),
+    )
 
     genres = models.ManyToManyField(
         Genre, blank=True, related_name="books", verbose_name=_("Genres")
@@ -124,21 +136,17 @@ class Book(models.Model):
     @classmethod
     def get(cls: Type[T], term: str) -> Optional[T]:
         """Search for given term, return single object."""
-        query_set = cls.search(term)
-        if query_set.count() == 0:
-            return None
-        elif query_set.count() > 1:
-            if term.isdigit():
-                query_set = query_set.filter(pk=term)
-            else:
-                query_set = query_set.filter(title=term)
-            if query_set.count() != 1:
-                return None
-        return query_set[0]
+        return lookup.get_one(cls.search(term), term, Q(title=term))
 
     @classmethod
     def search(cls: Type[T], term: str) -> models.query.QuerySet[T]:
         """Search for given term."""
+        ids = fts.search(cls, term)
+        if ids is not None:
+            return cls.objects.filter(
+                Q(pk=term if term.isdigit() else None) | Q(pk__in=ids)
+            )
+
         persons = Person.objects.filter(
             Q(pk=term if term.isdigit() else None) | Q(name__icontains=term)
         )
@@ -197,8 +205,17 @@ class Book(models.Model):
                 self.links.add(link)
         self.save(*args, **kwargs)
 
-    def print(self: T, file: TextIO = sys.stdout):
+    def print(self: T, file: Optional[TextIO] = None):
         """Print instance info."""
+        file = sys.stdout if file is None else file
+        prefetch_related_objects(
+            [self],
+            "authors",
+            "series",
+            "genres",
+            "links",
+            "editions__binding",
+        )
         stdout.write([_("Field"), _("Value")], "=", [0.33], file=file)
         stdout.write([_("Id"), self.pk], positions=[0.33], file=file)
         stdout.write([_("Title"), self.title], positions=[0.33], file=file)
@@ -266,13 +283,14 @@ class Book(models.Model):
     def save(self, *args, **kwargs):
         """Save in DB."""
         if not self.slug:
-            self.slug = slugify(self.title)
+            self.slug = unique_slug(Book, self.title, self.pk)
         else:
             orig = Book.objects.get(pk=self.id)
             if orig.title != self.title:
-                self.slug = slugify(self.title)
-        if self.slug is None or self.slug == "":
-            self.slug = hashlib.md5(self.title.encode("utf8")).hexdigest()
+                self.slug = unique_slug(Book, self.title, self.pk)
+        self.search_key = (
+            search_key(self.series.name, f"{self.volume:g}") if self.series else None
+        )
         super(Book, self).save(*args, **kwargs)
 
     def to_dict(self: T) -> Dict:
@@ -317,7 +335,9 @@ class Edition(models.Model):
     T = TypeVar("T", bound="Edition", covariant=True)
 
     created_at = models.DateTimeField(auto_now_add=True, verbose_name=_("Created at"))
-    updated_at = models.DateTimeField(auto_now=True, verbose_name=_("Updated at"))
+    updated_at = models.DateTimeField(
+        auto_now=True, db_index=True, verbose_name=_("Updated at")
+    )
 
     alternate_title = models.TextField(
         blank=True, null=True, verbose_name=_("Alternate title")
@@ -411,7 +431,7 @@ class Edition(models.Model):
         if "edition" in data and data["edition"]:
             edition_str = data["edition"]
         if "isbn" in data and data["isbn"]:
-            isbn = data["isbn"]
+            isbn = data["isbn"].replace("-", "")
         if "publishing_date" in data and data["publishing_date"]:
             publishing_date = (
                 data["publishing_date"]
@@ -466,19 +486,11 @@ class Edition(models.Model):
     @classmethod
     def get(cls: Type[T], term: str, book: Optional[Book] = None) -> Optional[T]:
         """Search for given term, return single object."""
-        query_set = cls.search(term, book)
-        if query_set.count() == 0:
-            return None
-        elif query_set.count() > 1:
-            if term.isdigit():
-                query_set = query_set.filter(pk=term)
-            else:
-                query_set = query_set.filter(
-                    Q(alternate_title=term) | Q(isbn=term) | Q(book__title=term)
-                )
-            if query_set.count() != 1:
-                return None
-        return query_set[0]
+        return lookup.get_one(
+            cls.search(term, book),
+            term,
+            Q(alternate_title=term) | Q(isbn=term) | Q(book__title=term),
+        )
 
     @classmethod
     def search(
@@ -492,18 +504,20 @@ class Edition(models.Model):
             Q(pk=term if term.isdigit() else None) | Q(name__icontains=term)
         )
 
-        query_set = cls.objects.annotate(
-            series=Concat(
-                "book__series__name",
-                Value(" "),
-                "book__volume",
-                output_field=models.TextField(),
-            )
-        ).all()
+        query_set = cls.objects.all()
         if book is not None:
             query_set = query_set.filter(book=book)
         if has_file is not None:
             query_set = query_set.filter(files__isnull=not has_file)
+
+        ids = fts.search(cls, term)
+        if ids is not None:
+            return query_set.filter(
+                Q(pk=term if term.isdigit() else None)
+                | Q(pk__in=ids)
+                | search_key_filter("book__search_key", term)
+            ).distinct()
+
         return query_set.filter(
             Q(pk=term if term.isdigit() else None)
             | Q(alternate_title__icontains=term)
@@ -511,7 +525,7 @@ class Edition(models.Model):
             | Q(isbn__icontains=term)
             | Q(persons__in=persons)
             | Q(book__authors__in=persons)
-            | Q(series__iregex=term.replace(" ", ".+?"))
+            | search_key_filter("book__search_key", term, prefix=False)
             | Q(book__title__icontains=term)
         ).distinct()
 
@@ -612,8 +626,22 @@ class Edition(models.Model):
         else:
             return self.book.title
 
-    def print(self: T, file: TextIO = sys.stdout):
+    def print(self: T, file: Optional[TextIO] = None):
         """Print instance info."""
+        file = sys.stdout if file is None else file
+        prefetch_related_objects(
+            [self],
+            "book__authors",
+            "book__series",
+            "binding",
+            "publisher",
+            "persons",
+            "languages",
+            "links",
+            "files",
+            "acquisitions",
+            "reads",
+        )
         stdout.write([_("Field"), _("Value")], "=", [0.33], file=file)
         stdout.write([_("Id"), self.pk], positions=[0.33], file=file)
         stdout.write(
@@ -32,6 +32,7 @@ from pathlib import Path
 from persons.models import Person
 from series.models import Series
 from tempfile import mkdtemp, NamedTemporaryFile
+from unittest import mock
 
 from .models import Book, Edition
 
@@ -333,6 +334,21 @@ class BookModelTestCase(TestCase):
         book.save()
         self.assertIsNotNone(book.id)
         self.assertEquals("old-garden", book.slug)
+        self.assertIsNone(book.search_key)
+
+        book.series, created = Series.from_dict({"name": "Garden  Series"})
+        book.volume = 2.5
+        book.save()
+        self.assertEquals("garden series 2.5", book.search_key)
+
+        book.series.name = "Gardens"
+        book.series.save()
+        book.refresh_from_db()
+        self.assertEquals("gardens 2.5", book.search_key)
+
+        book.series.delete()
+        book.refresh_from_db()
+        self.assertIsNone(book.search_key)
 
 
 class EditionModelTestCase(TestCase):
@@ -641,6 +657,16 @@ class EditionModelTestCase(TestCase):
         self.assertEquals(3, Edition.search("", self.book).count())
         self.assertEquals(1, Edition.search("9783030637873").count())
 
+        book, created = Book.from_dict(
+            {"title": "Stone", "series": {"name": "Harry Potter"}, "volume": 1}
+        )
+        self.assertTrue(created)
+        edition, created = Edition.from_dict({}, book)
+        self.assertTrue(created)
+        self.assertEquals([edition], list(Edition.search("harry potter 1")))
+        with mock.patch("bibliothek.fts.available", return_value=False):
+            self.assertEquals([edition], list(Edition.search("Potter 1")))
+
     @override_settings(MEDIA_ROOT=Path(mkdtemp()))
     def test_print(self):
         edition, created = Edition.from_dict(
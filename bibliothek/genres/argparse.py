@@ -20,14 +20,14 @@
 
 import sys
 
-from bibliothek import stdout
-from bibliothek.utils import lookahead
+from bibliothek import pagination, stdout
 from django.utils.translation import gettext_lazy as _
 from genres.models import Genre
 from typing import Optional, TextIO
 
 
-def _genre(args, file: TextIO = sys.stdout):
+def _genre(args, file: Optional[TextIO] = None):
+    file = sys.stdout if file is None else file
     genre: Optional[Genre] = None
     if args.subparser == "add":
         genre, created = Genre.from_dict({"name": args.name})
@@ -77,9 +77,13 @@ def _genre(args, file: TextIO = sys.stdout):
             genres = Genre.search(args.search)
         else:
             genres = Genre.objects.all()
-        stdout.write([_("Id"), _("Name")], "=", [0.05], file=file)
-    for i, has_next in lookahead(genres):
-        stdout.write([i.id, i.name], "_" if has_next else "=", [0.05], file=file)
+        stdout.table_writer(args.format, [0.05], file).write_table(
+            [_("Id"), _("Name")],
+            (
+                [i.id, i.name]
+                for i in pagination.iterate(genres, args.limit, args.after)
+            ),
+        )
 
 
 def add_subparser(parser):
@@ -109,3 +113,4 @@ def add_subparser(parser):
     # genre list
     list_parser = subparser.add_parser("list", help=_("List genres"))
     list_parser.add_argument("--search", help=_("Filter genres by term"))
+    pagination.add_arguments(list_parser)
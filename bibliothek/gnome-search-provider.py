@@ -33,11 +33,11 @@ import dbus.service  # noqa: E402
 import os  # noqa: E402
 import sys  # noqa: E402
 
-from books.models import Edition  # noqa: E402
+from bibliothek.search import get_objects, SearchIndex  # noqa: E402
+from bibliothek.thumbnails import thumbnail  # noqa: E402
+from concurrent.futures import ThreadPoolExecutor  # noqa: E402
 from django.db.models import Q  # noqa: E402
 from gi.repository import GLib  # noqa: E402
-from magazines.models import Issue  # noqa: E402
-from papers.models import Paper  # noqa: E402
 
 search_bus_name = "org.gnome.Shell.SearchProvider2"
 sbn = dict(dbus_interface=search_bus_name)
@@ -55,6 +55,13 @@ class BibliothekSearchService(dbus.service.Object):
         self.session_bus = dbus.SessionBus()
         bus_name = dbus.service.BusName(self.bus_name, bus=self.session_bus)
         dbus.service.Object.__init__(self, bus_name, self._object_path)
+        self.index = SearchIndex()
+        self.generation = 0
+        # Searches and metas run in their own worker thread each, so that the
+        # main loop stays responsive and metas are not blocked by a search.
+        self.search_executor = ThreadPoolExecutor(1, "search")
+        self.metas_executor = ThreadPoolExecutor(1, "metas")
+        self.search_executor.submit(self.index.refresh)
 
     @dbus.service.method(in_signature="sasu", **sbn)
     def ActivateResult(self, id, terms, timestamp):  # noqa: N802
@@ -79,63 +86,112 @@ class BibliothekSearchService(dbus.service.Object):
             else:
                 os.system('open "%s"' % path)
 
-    @dbus.service.method(in_signature="as", out_signature="as", **sbn)
-    def GetInitialResultSet(self, terms):  # noqa: N802
+    @dbus.service.method(
+        in_signature="as",
+        out_signature="as",
+        async_callbacks=("reply_handler", "error_handler"),
+        **sbn,
+    )
+    def GetInitialResultSet(self, terms, reply_handler, error_handler):  # noqa: N802
         """Get initial result set."""
-        return self._get_result_set(terms)
-
-    @dbus.service.method(in_signature="as", out_signature="aa{sv}", **sbn)
-    def GetResultMetas(self, ids):  # noqa: N802
+        self.generation += 1
+        self._run(
+            self.search_executor,
+            self.index.search,
+            (terms,),
+            reply_handler,
+            error_handler,
+            self.generation,
+        )
+
+    @dbus.service.method(
+        in_signature="as",
+        out_signature="aa{sv}",
+        async_callbacks=("reply_handler", "error_handler"),
+        **sbn,
+    )
+    def GetResultMetas(self, ids, reply_handler, error_handler):  # noqa: N802
         """Get result metas."""
+        self._run(
+            self.metas_executor, self._get_metas, (ids,), reply_handler, error_handler
+        )
+
+    @dbus.service.method(
+        in_signature="asas",
+        out_signature="as",
+        async_callbacks=("reply_handler", "error_handler"),
+        **sbn,
+    )
+    def GetSubsearchResultSet(  # noqa: N802
+        self, previous_results, new_terms, reply_handler, error_handler
+    ):
+        """Get subsearch result set."""
+        self.generation += 1
+        self._run(
+            self.search_executor,
+            self.index.subsearch,
+            (previous_results, new_terms),
+            reply_handler,
+            error_handler,
+            self.generation,
+        )
+
+    @dbus.service.method(in_signature="asu", terms="as", timestamp="u", **sbn)
+    def LaunchSearch(self, terms, timestamp):  # noqa: N802
+        """Launch search."""
+        pass
+
+    def _get_metas(self, ids):
         metas = []
+        objs = get_objects(ids)
         for id in ids:
-            obj = self._get_obj(id)
+            obj = objs.get(id)
             if obj is None:
                 continue
             elif id.startswith("edition"):
                 name = f"{obj.book}"
-                gicon = obj.cover_image.path if obj.cover_image else self.default_cover
+                gicon = self._gicon(obj.cover_image)
             elif id.startswith("paper"):
                 name = f"{obj}"
                 gicon = self.default_cover
             elif id.startswith("issue"):
                 name = f"{obj}"
-                gicon = obj.cover_image.path if obj.cover_image else self.default_cover
+                gicon = self._gicon(obj.cover_image)
 
             metas.append({"id": id, "name": name, "gicon": gicon})
         return metas
 
-    @dbus.service.method(in_signature="asas", out_signature="as", **sbn)
-    def GetSubsearchResultSet(self, previous_results, new_terms):  # noqa: N802
-        """Get subsearch result set."""
-        return self._get_result_set(new_terms)
-
-    @dbus.service.method(in_signature="asu", terms="as", timestamp="u", **sbn)
-    def LaunchSearch(self, terms, timestamp):  # noqa: N802
-        """Launch search."""
-        pass
+    def _gicon(self, image):
+        if not image:
+            return self.default_cover
+        path = thumbnail(image.path)
+        return image.path if path is None else str(path)
 
     def _get_obj(self, id):
-        if id.startswith("edition"):
-            return Edition.get(id[8:])
-        elif id.startswith("paper"):
-            return Paper.get(id[6:])
-        elif id.startswith("issue"):
-            return Issue.get(id[6:])
-        else:
-            return None
-
-    def _get_result_set(self, terms):
-        term = " ".join(terms)
-        editions = Edition.search(term, has_file=True)
-        results = [f"edition-{e.pk}" for e in editions]
-
-        papers = Paper.search(term, has_file=True)
-        results += [f"paper-{p.pk}" for p in papers]
-
-        issues = Issue.search(term, has_file=True)
-        results += [f"issue-{i.pk}" for i in issues]
-        return results
+        return get_objects([id]).get(id)
+
+    def _run(self, executor, func, args, reply_handler, error_handler, generation=None):
+        """Run in a worker thread and reply from the main loop.
+
+        A search is dropped, i. e. replied with no results, if a newer search was
+        started before it ran or finished.
+        """
+
+        def stale():
+            return generation is not None and generation != self.generation
+
+        def run():
+            if stale():
+                GLib.idle_add(reply_handler, [])
+                return
+            try:
+                result = func(*args)
+            except Exception as e:
+                GLib.idle_add(error_handler, e)
+                return
+            GLib.idle_add(reply_handler, [] if stale() else result)
+
+        executor.submit(run)
 
     def notify(self, message, body="", error=False):
         """Send notification."""
@@ -21,15 +21,16 @@
 import sys
 
 from argparse import _SubParsersAction, Namespace
-from bibliothek import stdout
-from bibliothek.utils import lookahead
+from bibliothek import pagination, stdout
+from django.db.models import Count
 from django.utils.translation import gettext_lazy as _
 from journals.models import Journal
 from links.models import Link
 from typing import Optional, TextIO
 
 
-def _journal(args: Namespace, file: TextIO = sys.stdout):
+def _journal(args: Namespace, file: Optional[TextIO] = None):
+    file = sys.stdout if file is None else file
     journal: Optional[Journal] = None
     if args.subparser == "add":
         journal, created = Journal.from_dict(
@@ -88,16 +89,14 @@ def _journal(args: Namespace, file: TextIO = sys.stdout):
             journals = Journal.search(args.search)
         else:
             journals = Journal.objects.all()
-        stdout.write(
-            [_("Id"), _("Name"), _("Number of papers")], "=", [0.05, 0.8], file=file
+        journals = journals.annotate(num_papers=Count("papers"))
+        stdout.table_writer(args.format, [0.05, 0.8], file).write_table(
+            [_("Id"), _("Name"), _("Number of papers")],
+            (
+                [i.id, i.name, i.num_papers]
+                for i in pagination.iterate(journals, args.limit, args.after)
+            ),
         )
-        for i, has_next in lookahead(journals):
-            stdout.write(
-                [i.id, i.name, i.papers.count()],
-                "_" if has_next else "=",
-                [0.05, 0.8],
-                file=file,
-            )
 
 
 def add_subparser(parser: _SubParsersAction):
@@ -130,3 +129,4 @@ def add_subparser(parser: _SubParsersAction):
     # journal list
     list_parser = subparser.add_parser("list", help=_("List journals"))
     list_parser.add_argument("--search", help=_("Filter journals by term"))
+    pagination.add_arguments(list_parser)
@@ -20,7 +20,7 @@
 
 import sys
 
-from bibliothek import stdout
+from bibliothek import lookup, stdout
 from django.db import models
 from django.db.models import F, Func, Q
 from django.utils.translation import gettext_lazy as _
@@ -48,17 +48,7 @@ class Link(models.Model):
     @classmethod
     def get(cls: Type[T], term: str) -> Optional[T]:
         """Search for given term, return single object."""
-        query_set = cls.search(term)
-        if query_set.count() == 0:
-            return None
-        elif query_set.count() > 1:
-            if term.isdigit():
-                query_set = query_set.filter(pk=term)
-            else:
-                query_set = query_set.filter(link=term)
-            if query_set.count() != 1:
-                return None
-        return query_set[0]
+        return lookup.get_one(cls.search(term), term, Q(link=term))
 
     @classmethod
     def get_or_create(cls: Type[T], term: str) -> T:
@@ -93,8 +83,9 @@ class Link(models.Model):
             ]
         )
 
-    def print(self: T, file: TextIO = sys.stdout):
+    def print(self: T, file: Optional[TextIO] = None):
         """Print instance info."""
+        file = sys.stdout if file is None else file
         stdout.write([_("Field"), _("Value")], "=", [0.33], file=file)
         stdout.write([_("Id"), self.id], positions=[0.33], file=file)
         stdout.write([_("URL"), self.link], positions=[0.33], file=file)
@@ -21,11 +21,11 @@
 import os
 import sys
 
-from bibliothek import stdout
-from bibliothek.utils import lookahead
+from bibliothek import pagination, stdout
 from argparse import _SubParsersAction, Namespace
 from bibliothek.argparse import valid_date
 from django.conf import settings
+from django.db.models import Count
 from django.utils.translation import gettext_lazy as _
 from links.models import Link
 from magazines.models import Issue, Magazine
@@ -34,7 +34,8 @@ from shelves.models import Acquisition, Read
 from typing import Optional, TextIO
 
 
-def _magazine(args: Namespace, file: TextIO = sys.stdout):
+def _magazine(args: Namespace, file: Optional[TextIO] = None):
+    file = sys.stdout if file is None else file
     magazine: Optional[Magazine] = None
     if args.subparser == "add":
         magazine, created = Magazine.from_dict(
@@ -203,24 +204,19 @@ def _magazine(args: Namespace, file: TextIO = sys.stdout):
                     stdout.write(_("No issue found."), "", file=file)
             elif args.issue_subparser == "list" and magazine:
                 if args.search:
-                    issues = Issue.search(args.search)
+                    issues = Issue.search(args.search, magazine)
                 elif args.shelf:
-                    issues = Issue.by_shelf(args.shelf)
+                    issues = Issue.by_shelf(args.shelf, magazine)
                 else:
                     issues = Issue.objects.filter(magazine=magazine)
-                stdout.write(
+                issues = issues.select_related("magazine")
+                stdout.table_writer(args.format, [0.05, 0.40, 0.85], file).write_table(
                     [_("Id"), _("Magazine"), _("Issue"), _("Publishing date")],
-                    "=",
-                    [0.05, 0.40, 0.85],
-                    file=file,
+                    (
+                        [i.pk, i.magazine.name, i.issue, i.publishing_date]
+                        for i in pagination.iterate(issues, args.limit, args.after)
+                    ),
                 )
-                for i, has_next in lookahead(issues):
-                    stdout.write(
-                        [i.pk, i.magazine.name, i.issue, i.publishing_date],
-                        "_" if has_next else "=",
-                        [0.05, 0.40, 0.85],
-                        file=file,
-                    )
             elif args.issue_subparser == "open" and magazine:
                 issue = Issue.get(args.issue, magazine)
                 if issue:
@@ -287,20 +283,15 @@ def _magazine(args: Namespace, file: TextIO = sys.stdout):
             magazines = Magazine.search(args.search)
         else:
             magazines = Magazine.objects.all()
+        magazines = magazines.annotate(num_issues=Count("issues"))
 
-        stdout.write(
+        stdout.table_writer(args.format, [0.05, 0.8], file).write_table(
             [_("Id"), _("Name"), _("Number of issues")],
-            "=",
-            [0.05, 0.8],
-            file=file,
+            (
+                [i.pk, i.name, i.num_issues]
+                for i in pagination.iterate(magazines, args.limit, args.after)
+            ),
         )
-        for i, has_next in lookahead(magazines):
-            stdout.write(
-                [i.pk, i.name, i.issues.count()],
-                "_" if has_next else "=",
-                [0.05, 0.8],
-                file=file,
-            )
 
 
 def add_subparser(parser: _SubParsersAction):
@@ -343,6 +334,7 @@ def add_subparser(parser: _SubParsersAction):
     # magazine list
     list_parser = subparser.add_parser("list", help=_("List magazines"))
     list_parser.add_argument("--search", help=_("Filter magazines by term"))
+    pagination.add_arguments(list_parser)
 
 
 def issue_subparser(parser: _SubParsersAction):
@@ -405,6 +397,7 @@ def issue_subparser(parser: _SubParsersAction):
         "--shelf", choices=["read", "unread"], help=_("Filter editions by shelf")
     )
     list_parser.add_argument("--search", help=_("Filter editions by term"))
+    pagination.add_arguments(list_parser)
 
     # magazine issue open
     help_txt = _("Open a file associated with a magazine issue")
@@ -0,0 +1,39 @@
+# Generated by Django 4.2.30 on 2026-10-18 19:46
+
+from django.db import migrations, models
+
+
+# frozen copy of bibliothek.utils.search_key as of this migration
+def search_key(*parts):
+    return " ".join(" ".join([p for p in parts if p]).lower().split())
+
+
+def set_search_keys(apps, schema_editor):
+    Issue = apps.get_model("magazines", "Issue")
+
+    issues = list(Issue.objects.select_related("magazine"))
+    for issue in issues:
+        issue.search_key = search_key(issue.magazine.name, issue.issue)
+    Issue.objects.bulk_update(issues, ["search_key"], batch_size=1000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("magazines", "0003_alter_issue_updated_at_alter_magazine_updated_at"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="issue",
+            name="search_key",
+            field=models.TextField(
+                blank=True,
+                db_index=True,
+                editable=False,
+                null=True,
+                verbose_name="Search key",
+            ),
+        ),
+        migrations.RunPython(set_search_keys, migrations.RunPython.noop),
+    ]
@@ -23,15 +23,20 @@ import os
 import shutil
 import sys
 
-from bibliothek import stdout
-from bibliothek.utils import concat, lookahead
+from bibliothek import fts, lookup, stdout
+from bibliothek.utils import (
+    concat,
+    lookahead,
+    search_key,
+    search_key_filter,
+    unique_slug,
+)
 from django.conf import settings
 from django.contrib.contenttypes.fields import GenericRelation
 from django.core.files import File as DJFile
 from django.db import models
-from django.db.models import F, Func, Q, Value
+from django.db.models import F, Func, Prefetch, Q, Value, prefetch_related_objects
 from django.db.models.functions import Concat
-from django.template.defaultfilters import slugify
 from django.utils.translation import gettext_lazy as _
 from files.models import File
 from languages.models import Language
@@ -46,7 +51,9 @@ class Magazine(models.Model):
     T = TypeVar("T", bound="Magazine", covariant=True)
 
     created_at = models.DateTimeField(auto_now_add=True, verbose_name=_("Created at"))
-    updated_at = models.DateTimeField(auto_now=True, verbose_name=_("Updated at"))
+    updated_at = models.DateTimeField(
+        auto_now=True, db_index=True, verbose_name=_("Updated at")
+    )
 
     slug = models.SlugField(max_length=2048, unique=True, verbose_name=_("Slug"))
     name = models.TextField(unique=True, verbose_name=_("Name"))
@@ -85,17 +92,7 @@ class Magazine(models.Model):
     @classmethod
     def get(cls: Type[T], term: str) -> Optional[T]:
         """Search for given term, return single object."""
-        query_set = cls.search(term)
-        if query_set.count() == 0:
-            return None
-        elif query_set.count() > 1:
-            if term.isdigit():
-                query_set = query_set.filter(pk=term)
-            else:
-                query_set = query_set.filter(name=term)
-            if query_set.count() != 1:
-                return None
-        return query_set[0]
+        return lookup.get_one(cls.search(term), term, Q(name=term))
 
     @classmethod
     def search(cls: Type[T], term: str) -> models.query.QuerySet[T]:
@@ -130,8 +127,15 @@ class Magazine(models.Model):
                 self.links.add(link)
         self.save()
 
-    def print(self: T, file: TextIO = sys.stdout):
+    def print(self: T, file: Optional[TextIO] = None):
         """Print instance info."""
+        file = sys.stdout if file is None else file
+        prefetch_related_objects(
+            [self],
+            "feed",
+            "links",
+            Prefetch("issues", Issue.objects.order_by("publishing_date")),
+        )
         stdout.write([_("Field"), _("Value")], "=", [0.33], file=file)
         stdout.write([_("Id"), self.pk], positions=[0.33], file=file)
         stdout.write([_("Name"), self.name], positions=[0.33], file=file)
@@ -153,7 +157,7 @@ class Magazine(models.Model):
             stdout.write([_("Links"), ""], positions=[0.33], file=file)
 
         if self.issues.count() > 0:
-            issues = self.issues.all().order_by("publishing_date")
+            issues = self.issues.all()
             for (i, issue), has_next in lookahead(enumerate(issues)):
                 stdout.write(
                     ["" if i else _("Issue"), f"{issue.id}: {issue.issue}"],
@@ -166,13 +170,20 @@ class Magazine(models.Model):
 
     def save(self: T, *args, **kwargs):
         """Save."""
+        renamed = False
         if not self.slug:
-            self.slug = slugify(self.name)
+            self.slug = unique_slug(Magazine, self.name, self.pk)
         else:
             orig = Magazine.objects.get(pk=self.id)
             if orig.name != self.name:
-                self.slug = slugify(self.name)
+                self.slug = unique_slug(Magazine, self.name, self.pk)
+                renamed = True
         super(Magazine, self).save(*args, **kwargs)
+        if renamed:
+            issues = list(self.issues.all())
+            for issue in issues:
+                issue.search_key = search_key(self.name, issue.issue)
+            self.issues.bulk_update(issues, ["search_key"])
 
     def to_dict(self: T) -> Dict:
         """Convert to dict."""
@@ -202,9 +213,18 @@ class Issue(models.Model):
     T = TypeVar("T", bound="Issue", covariant=True)
 
     created_at = models.DateTimeField(auto_now_add=True, verbose_name=_("Created at"))
-    updated_at = models.DateTimeField(auto_now=True, verbose_name=_("Updated at"))
+    updated_at = models.DateTimeField(
+        auto_now=True, db_index=True, verbose_name=_("Updated at")
+    )
 
     issue = models.TextField(verbose_name=_("Issue"))
+    search_key = models.TextField(
+        blank=True,
+        null=True,
+        db_index=True,
+        editable=False,
+        verbose_name=_("Search key"),
+    )
     magazine = models.ForeignKey(
         Magazine, models.CASCADE, related_name="issues", verbose_name=_("Magazine")
     )
@@ -300,17 +320,9 @@ class Issue(models.Model):
         cls: Type[T], term: str, magazine: Optional[Magazine] = None
     ) -> Optional[T]:
         """Search for given term, return single object."""
-        query_set = cls.search(term, magazine)
-        if query_set.count() == 0:
-            return None
-        elif query_set.count() > 1:
-            if term.isdigit():
-                query_set = query_set.filter(pk=term)
-            else:
-                query_set = query_set.filter(Q(issue=term) | Q(name=term))
-            if query_set.count() != 1:
-                return None
-        return query_set[0]
+        return lookup.get_one(
+            cls.search(term, magazine), term, Q(issue=term) | Q(name=term)
+        )
 
     @classmethod
     def search(
@@ -329,9 +341,18 @@ class Issue(models.Model):
             query_set = query_set.filter(magazine=magazine)
         if has_file is not None:
             query_set = query_set.filter(files__isnull=not has_file)
+
+        ids = fts.search(cls, term)
+        if ids is not None:
+            return query_set.filter(
+                Q(pk=term if term.isdigit() else None)
+                | Q(pk__in=ids)
+                | search_key_filter("search_key", term)
+            )
+
         return query_set.filter(
             Q(pk=term if term.isdigit() else None)
-            | Q(name__iregex=term.replace(" ", ".+?"))
+            | search_key_filter("search_key", term, prefix=False)
         )
 
     def delete(self: T) -> Tuple[int, Dict[str, int]]:
@@ -391,8 +412,18 @@ class Issue(models.Model):
                 self.files.add(file)
         self.save(*args, **kwargs)
 
-    def print(self: T, file: TextIO = sys.stdout):
+    def print(self: T, file: Optional[TextIO] = None):
         """Print instance info."""
+        file = sys.stdout if file is None else file
+        prefetch_related_objects(
+            [self],
+            "magazine",
+            "languages",
+            "files",
+            "links",
+            "acquisitions",
+            "reads",
+        )
         stdout.write([_("Field"), _("Value")], "=", [0.33], file=file)
         stdout.write([_("Id"), self.pk], positions=[0.33], file=file)
         stdout.write(
@@ -472,6 +503,7 @@ class Issue(models.Model):
         """Save."""
         if self.cover_image and not self.cover_image.name.startswith("magazines"):
             self._move_cover_image()
+        self.search_key = search_key(self.magazine.name, self.issue)
         super(Issue, self).save(*args, **kwargs)
         for file in self.files.all():
             path = os.path.join("magazines", str(self.id))
@@ -29,6 +29,7 @@ from links.models import Link
 from magazines.models import Magazine, Issue
 from pathlib import Path
 from tempfile import mkdtemp, NamedTemporaryFile
+from unittest import mock
 
 
 class MagazineModelTestCase(TestCase):
@@ -600,6 +601,14 @@ class IssueModelTestCase(TestCase):
         self.assertEquals(3, Issue.objects.all().count())
         self.assertEquals(1, Issue.search("Stuff 2020").count())
         self.assertEquals(2, Issue.search("Stuff 2021").count())
+        self.assertEquals(2, Issue.search("stuff  2021").count())
+        self.assertEquals(0, Issue.search("2021 Stuff").count())
+        self.assertNotIn("REGEXP", str(Issue.search("Stuff 2021").query))
+
+        with mock.patch("bibliothek.fts.available", return_value=False):
+            self.assertEquals(2, Issue.search("tuff 2021").count())
+            self.assertEquals(2, Issue.search("2021 Stuff").count())
+            self.assertEquals(1, Issue.search("1/2020").count())
 
     def test_print(self):
         issue, created = Issue.from_dict(
@@ -658,6 +667,12 @@ class IssueModelTestCase(TestCase):
         issue.magazine = self.magazine
         issue.save()
         self.assertIsNotNone(issue.id)
+        self.assertEquals("stuff 1/2021", issue.search_key)
+
+        self.magazine.name = "More Stuff"
+        self.magazine.save()
+        issue.refresh_from_db()
+        self.assertEquals("more stuff 1/2021", issue.search_key)
 
         issue = Issue(issue="2/2021")
         issue.magazine = self.magazine
@@ -21,10 +21,10 @@
 import datetime
 import os
 import sys
+import time
 
 from argparse import _SubParsersAction, Namespace
-from bibliothek import stdout
-from bibliothek.utils import lookahead
+from bibliothek import pagination, stdout
 from bibliothek.argparse import valid_date
 from django.conf import settings
 from django.utils.translation import gettext_lazy as _
@@ -38,7 +38,8 @@ from shelves.argparse import acquisition_subparser, read_subparser
 from typing import Optional, TextIO
 
 
-def _paper(args: Namespace, file: TextIO = sys.stdout):
+def _paper(args: Namespace, file: Optional[TextIO] = None):
+    file = sys.stdout if file is None else file
     paper: Optional[Paper] = None
     if args.subparser == "acquisition":
         paper = Paper.get(args.paper)
@@ -169,19 +170,13 @@ def _paper(args: Namespace, file: TextIO = sys.stdout):
             papers = Paper.by_shelf(args.shelf)
         else:
             papers = Paper.objects.all()
-        stdout.write(
+        stdout.table_writer(args.format, [0.05, 0.7, 0.85], file).write_table(
             [_("Id"), _("Title")],
-            "=",
-            [0.05, 0.7, 0.85],
-            file=file,
+            (
+                [i.pk, i.title]
+                for i in pagination.iterate(papers, args.limit, args.after)
+            ),
         )
-        for i, has_next in lookahead(papers):
-            stdout.write(
-                [i.pk, i.title],
-                "_" if has_next else "=",
-                [0.05, 0.7, 0.85],
-                file=file,
-            )
     elif args.subparser == "open":
         paper = Paper.get(args.paper)
         if paper:
@@ -194,7 +189,12 @@ def _paper(args: Namespace, file: TextIO = sys.stdout):
         else:
             stdout.write(_("No paper found."), "", file=file)
     elif args.subparser == "parse":
-        for paper, created in Paper.from_bibfile(args.bibfile, args.file):
+        start = time.perf_counter()
+        count = 0
+        for paper, created in Paper.from_bibfiles(
+            args.bibfile, args.file, args.chunk_size, args.jobs
+        ):
+            count += 1
             if created:
                 stdout.write(
                     _('Successfully added paper "%(title)s" with id "%(pk)d".')
@@ -227,6 +227,20 @@ def _paper(args: Namespace, file: TextIO = sys.stdout):
                     file=file,
                 )
             paper.print(file)
+        seconds = time.perf_counter() - start
+        stdout.write(
+            _(
+                "Parsed %(count)d papers from %(bibfiles)d bibfiles in "
+                + "%(seconds).2fs (%(rate).1f papers/s)."
+            )
+            % {
+                "count": count,
+                "bibfiles": len(args.bibfile),
+                "seconds": seconds,
+                "rate": count / seconds if seconds > 0 else 0,
+            },
+            file=file,
+        )
     elif args.subparser == "read":
         paper = Paper.get(args.paper)
         read: Optional[Read] = None
@@ -349,6 +363,7 @@ def add_subparser(parser: _SubParsersAction):
         help=_("Filter editions by shelf"),
     )
     list_parser.add_argument("--search", help=_("Filter editions by term"))
+    pagination.add_arguments(list_parser)
 
     # paper info
     info_parser = subparser.add_parser("info", help=_("Show paper info"))
@@ -362,8 +377,8 @@ def add_subparser(parser: _SubParsersAction):
     open_parser.add_argument("file", type=int, help=_("File to open"))
 
     # paper parse
-    parse_parser = subparser.add_parser("parse", help=_("Add papers from bibfile."))
-    parse_parser.add_argument("bibfile", help=_("Bibfile"))
+    parse_parser = subparser.add_parser("parse", help=_("Add papers from bibfiles."))
+    parse_parser.add_argument("bibfile", nargs="+", help=_("Bibfiles"))
     parse_parser.add_argument(
         "-f", "--file", nargs="*", default=[], help=_("Additional files")
     )
@@ -373,3 +388,16 @@ def add_subparser(parser: _SubParsersAction):
         action="store_true",
         help=_("Add acquisition for parsed papers."),
     )
+    parse_parser.add_argument(
+        "--chunk-size",
+        type=int,
+        default=100,
+        help=_("Number of papers written per transaction."),
+    )
+    parse_parser.add_argument(
+        "-j",
+        "--jobs",
+        type=int,
+        default=None,
+        help=_("Number of processes parsing bibfiles, default number of CPUs."),
+    )
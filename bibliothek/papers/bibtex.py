@@ -0,0 +1,213 @@
+# -*- coding: utf-8 -*-
+# vim: ft=python fileencoding=utf-8 sts=4 sw=4 et:
+# Copyright (C) 2016-2022 J. Nathanael Philipp (jnphilipp) <nathanael@philipp.land>
+#
+# This file is part of bibliothek.
+#
+# bibliothek is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# bibliothek is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with bibliothek.  If not, see <http://www.gnu.org/licenses/>.
+"""Papers Django app BibTeX utils."""
+
+import datetime
+import re
+
+from typing import Dict, Iterator, List, Optional, Tuple
+
+ENTRY_START = re.compile(r"@\s*(\w+)\s*([{(])")
+PAPER_TYPES = [
+    "article",
+    "inproceedings",
+    "phdthesis",
+    "inbook",
+    "incollection",
+    "conference",
+]
+SKIP_TYPES = ["comment", "preamble", "string"]
+
+
+def parse_citation_key(entry: Optional[str]) -> Optional[str]:
+    """Get the citation key of a single BibTeX entry."""
+    if not entry:
+        return None
+    match = re.match(r"\s*@\s*\w+\s*[{(]\s*([^,\s]+)\s*,", entry)
+    return match.group(1) if match else None
+
+
+def split_entries(bibtex: str) -> Iterator[Tuple[str, str]]:
+    """Split BibTeX into its entries.
+
+    Scans for the start of each entry and its matching closing delimiter, the
+    entries are not parsed. Comments, preambles and string definitions are
+    skipped.
+
+    Args:
+        * bibtex: BibTeX to split
+
+    Yields the citation key and the raw text of each entry.
+    """
+    pos = 0
+    while True:
+        match = ENTRY_START.search(bibtex, pos)
+        if match is None:
+            return
+
+        closing = "}" if match.group(2) == "{" else ")"
+        depth = 0
+        end = match.end()
+        while end < len(bibtex):
+            if bibtex[end] == "{":
+                depth += 1
+            elif bibtex[end] == "}" and depth > 0:
+                depth -= 1
+            elif bibtex[end] == closing and depth == 0:
+                break
+            end += 1
+
+        entry = bibtex[match.start() : end + 1]
+        pos = end + 1
+        if match.group(1).lower() in SKIP_TYPES:
+            continue
+        key = parse_citation_key(entry)
+        if key is not None:
+            yield key, entry
+
+
+def parse_bibfile(path: str) -> List[Optional[Dict]]:
+    """Read a bibfile and convert its entries to paper dicts, see `parse_papers`."""
+    with open(path, "r", encoding="utf-8") as f:
+        return parse_papers(f.read())
+
+
+def parse_papers(bibtex: str) -> List[Optional[Dict]]:
+    """Parse BibTeX and convert its entries to paper dicts.
+
+    Only needs the BibTeX, no DB access, so it can run in another process.
+
+    Args:
+        * bibtex: BibTeX to parse
+
+    Returns a dict for every entry, None for entries that are not papers.
+    """
+    from bibtexparser.bparser import BibTexParser
+
+    bib_database = BibTexParser(common_strings=True, homogenize_fields=True).parse(
+        bibtex
+    )
+    entries = dict(split_entries(bibtex))
+    return [
+        (
+            paper_from_entry(entry, entries.get(entry["ID"]))
+            if entry["ENTRYTYPE"] in PAPER_TYPES
+            else None
+        )
+        for entry in bib_database.entries
+    ]
+
+
+def paper_from_entry(entry: Dict, bibtex: Optional[str] = None) -> Dict:
+    """Convert a parsed BibTeX entry to a paper dict.
+
+    Args:
+        * entry: entry parsed by bibtexparser
+        * bibtex: raw text of the entry
+    """
+    title = entry["title"].strip() if "title" in entry else ""
+    if title.startswith("{"):
+        title = title[1:]
+    if title.endswith("}"):
+        title = title[:-1]
+
+    authors = []
+    entry["author"] = re.sub(r"\s*\n\s*", " ", entry["author"], flags=re.S)
+    for author in re.compile(r"\s+and\s+").split(entry["author"]):
+        author = author.replace("{", "").replace("}", "")
+        if "," in author:
+            s = author.split(",")
+            authors.append({"name": f"{s[1].strip()} {s[0].strip()}"})
+        else:
+            authors.append({"name": author.strip()})
+
+    journal = {"name": entry["journal"].strip()} if "journal" in entry else None
+
+    volume = entry["volume"].strip() if "volume" in entry else None
+    if "number" in entry:
+        volume = f"{volume}.{entry['number']}" if volume else entry["number"]
+    if "eprint" in entry and not volume:
+        volume = entry["eprint"].strip()
+
+    publisher = {"name": entry["publisher"].strip()} if "publisher" in entry else None
+    series = {"name": entry["series"].strip()} if "series" in entry else None
+
+    date = None
+    year = int(entry["year"].strip()) if "year" in entry else None
+    month = entry["month"].strip() if "month" in entry else None
+    day = entry["day"].strip() if "day" in entry else None
+    if year and month and day:
+        try:
+            date = datetime.datetime.strptime(f"{day} {month} {year}", "%d %B %Y")
+        except ValueError:
+            date = datetime.datetime.strptime(f"{day} {month} {year}", "%d %b %Y")
+    elif year and month:
+        if month.isdigit():
+            date = datetime.datetime.strptime(f"{month} {year}", "%m %Y")
+        else:
+            try:
+                date = datetime.datetime.strptime(f"{month} {year}", "%B %Y")
+            except ValueError:
+                try:
+                    date = datetime.datetime.strptime(f"{month} {year}", "%b %Y")
+                except ValueError:
+                    date = datetime.datetime(year, 1, 1)
+    elif year:
+        date = datetime.datetime(year, 1, 1)
+
+    pub_date = None
+    if "timestamp" in entry:
+        pub_date = (
+            datetime.datetime.strptime(
+                entry["timestamp"].strip(), "%a, %d %b %Y %H:%M:%S %z"
+            )
+            .date()
+            .strftime("%Y-%m-%d")
+        )
+    elif date:
+        pub_date = date.date().strftime("%Y-%m-%d")
+
+    if "link" in entry:
+        url: Optional[Dict] = {"url": entry["link"].strip()}
+    elif "url" in entry:
+        url = {"url": entry["url"].strip()}
+    else:
+        url = None
+
+    doi = None
+    if "doi" in entry:
+        if entry["doi"].startswith("doi:"):
+            doi = entry["doi"][4:]
+        elif entry["doi"].startswith("http"):
+            doi = re.sub(r"https?://[^/]+/", "", entry["doi"])
+        else:
+            doi = entry["doi"]
+
+    return {
+        "title": title,
+        "authors": authors,
+        "journal": journal,
+        "volume": volume,
+        "publisher": publisher,
+        "series": series,
+        "publishing_date": pub_date,
+        "links": [url] if url else None,
+        "bibtex": bibtex,
+        "doi": doi,
+    }
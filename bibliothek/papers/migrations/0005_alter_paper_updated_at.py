@@ -0,0 +1,20 @@
+# Generated by Django 4.2.30 on 2026-10-18 19:34
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("papers", "0004_alter_paper_options_proceedings_paper_proceedings"),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name="paper",
+            name="updated_at",
+            field=models.DateTimeField(
+                auto_now=True, db_index=True, verbose_name="Updated at"
+            ),
+        ),
+    ]
@@ -0,0 +1,104 @@
+# Generated by Django 4.2.30 on 2026-10-18 19:36
+
+import re
+
+from bibtexparser.bparser import BibTexParser
+from django.db import migrations, models, transaction
+
+# frozen copies of papers.bibtex as of this migration, so later changes there do
+# not change what the migration does
+ENTRY_START = re.compile(r"@\s*(\w+)\s*([{(])")
+SKIP_TYPES = ["comment", "preamble", "string"]
+
+
+def parse_citation_key(entry):
+    if not entry:
+        return None
+    match = re.match(r"\s*@\s*\w+\s*[{(]\s*([^,\s]+)\s*,", entry)
+    return match.group(1) if match else None
+
+
+def split_entries(bibtex):
+    pos = 0
+    while True:
+        match = ENTRY_START.search(bibtex, pos)
+        if match is None:
+            return
+
+        closing = "}" if match.group(2) == "{" else ")"
+        depth = 0
+        end = match.end()
+        while end < len(bibtex):
+            if bibtex[end] == "{":
+                depth += 1
+            elif bibtex[end] == "}" and depth > 0:
+                depth -= 1
+            elif bibtex[end] == closing and depth == 0:
+                break
+            end += 1
+
+        entry = bibtex[match.start() : end + 1]
+        pos = end + 1
+        if match.group(1).lower() in SKIP_TYPES:
+            continue
+        key = parse_citation_key(entry)
+        if key is not None:
+            yield key, entry
+
+
+def split_bibtex(apps, schema_editor):
+    for model_name in ["Paper", "Proceedings"]:
+        model = apps.get_model("papers", model_name)
+
+        with transaction.atomic():
+            entries = {}
+            for obj in model.objects.filter(bibtex__isnull=False).only(
+                "pk", "title", "bibtex"
+            ):
+                if obj.bibtex not in entries:
+                    raw = dict(split_entries(obj.bibtex))
+                    entries[obj.bibtex] = {}
+                    for entry in (
+                        BibTexParser(common_strings=True, homogenize_fields=True)
+                        .parse(obj.bibtex)
+                        .entries
+                    ):
+                        title = entry["title"].strip() if "title" in entry else ""
+                        if model_name == "Paper":
+                            if title.startswith("{"):
+                                title = title[1:]
+                            if title.endswith("}"):
+                                title = title[:-1]
+                        if entry["ID"] in raw:
+                            entries[obj.bibtex][title] = raw[entry["ID"]]
+
+                if obj.title in entries[obj.bibtex]:
+                    bibtex = entries[obj.bibtex][obj.title]
+                    model.objects.filter(pk=obj.pk).update(
+                        bibtex=bibtex, citation_key=parse_citation_key(bibtex)
+                    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("papers", "0005_alter_paper_updated_at"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="paper",
+            name="citation_key",
+            field=models.TextField(
+                blank=True, db_index=True, null=True, verbose_name="Citation key"
+            ),
+        ),
+        migrations.AddField(
+            model_name="proceedings",
+            name="citation_key",
+            field=models.TextField(
+                blank=True, db_index=True, null=True, verbose_name="Citation key"
+            ),
+        ),
+        migrations.RunPython(split_bibtex, migrations.RunPython.noop),
+    ]
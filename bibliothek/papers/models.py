@@ -24,25 +24,42 @@ import re
 import shutil
 import sys
 
-from bibliothek import stdout
-from bibliothek.utils import concat, lookahead
-from bibtexparser.bparser import BibTexParser
+from bibliothek import fts, lookup, stdout
+from bibliothek.utils import concat, lookahead, unique_slug
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import nullcontext
 from django.conf import settings
 from django.contrib.contenttypes.fields import GenericRelation
-from django.db import models
-from django.db.models import F, Func, Q, Value
+from django.db import models, transaction
+from django.db.models import F, Func, Q, Value, prefetch_related_objects
 from django.db.models.functions import Concat
-from django.template.defaultfilters import slugify
 from django.utils.translation import gettext_lazy as _
 from files.models import File
 from journals.models import Journal
 from languages.models import Language
 from links.models import Link
+from papers.bibtex import (
+    parse_bibfile,
+    parse_citation_key,
+    parse_papers,
+    split_entries,
+)
 from persons.models import Person
 from publishers.models import Publisher
 from series.models import Series
 from shelves.models import Acquisition, Read
-from typing import Dict, List, Optional, TextIO, Tuple, Type, TypeVar, Union
+from typing import (
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    TextIO,
+    Tuple,
+    Type,
+    TypeVar,
+    Union,
+)
 
 
 class Paper(models.Model):
@@ -51,7 +68,9 @@ class Paper(models.Model):
     T = TypeVar("T", bound="Paper", covariant=True)
 
     created_at = models.DateTimeField(auto_now_add=True, verbose_name=_("Created at"))
-    updated_at = models.DateTimeField(auto_now=True, verbose_name=_("Updated at"))
+    updated_at = models.DateTimeField(
+        auto_now=True, db_index=True, verbose_name=_("Updated at")
+    )
 
     slug = models.SlugField(max_length=2048, unique=True, verbose_name=_("Slug"))
     title = models.TextField(unique=True, verbose_name=_("Title"))
@@ -102,6 +121,9 @@ class Paper(models.Model):
 
     files = GenericRelation(File, related_query_name="papers", verbose_name=_("Files"))
     bibtex = models.TextField(blank=True, null=True, verbose_name=_("BibTex"))
+    citation_key = models.TextField(
+        blank=True, null=True, db_index=True, verbose_name=_("Citation key")
+    )
 
     links = models.ManyToManyField(
         Link, blank=True, related_name="papers", verbose_name=_("Links")
@@ -136,140 +158,81 @@ class Paper(models.Model):
         with open(path, "r", encoding="utf-8") as f:
             return cls.from_bibtex(f.read(), files, path)
 
+    @classmethod
+    def from_bibfiles(
+        cls: Type[T],
+        paths: List[str],
+        files: List[str] = [],
+        chunk_size: int = 100,
+        max_workers: Optional[int] = None,
+    ) -> Iterator[Tuple[T, bool]]:
+        """Create from bibfiles.
+
+        The bibfiles are parsed in a process pool while the papers are written to
+        the DB in chunks, one transaction per chunk. The additional files are
+        matched to the entries in order.
+
+        Args:
+            * paths: bibfiles to parse
+            * files: additional files
+            * chunk_size: number of papers written per transaction
+            * max_workers: number of processes used for parsing
+
+        Yields the papers of every chunk once it has been written.
+        """
+
+        def _entries(parsed: Iterable[List[Optional[Dict]]]) -> Iterator[Tuple]:
+            i = 0
+            for path, entries in zip(paths, parsed):
+                for data in entries:
+                    if data is not None:
+                        yield data, files[i] if i < len(files) else None, path
+                    i += 1
+
+        def _write(chunk: List[Tuple]) -> List[Tuple]:
+            with transaction.atomic():
+                return [cls._from_bibtex_dict(*args) for args in chunk]
+
+        executor = ProcessPoolExecutor(max_workers) if len(paths) > 1 else None
+        with executor or nullcontext():
+            parsed = (
+                map(parse_bibfile, paths)
+                if executor is None
+                else executor.map(parse_bibfile, paths)
+            )
+            chunk = []
+            for args in _entries(parsed):
+                chunk.append(args)
+                if len(chunk) >= chunk_size:
+                    yield from _write(chunk)
+                    chunk = []
+            if chunk:
+                yield from _write(chunk)
+
     @classmethod
     def from_bibtex(
         cls: Type[T], bibtex: str, files: List[str] = [], bibfile: Optional[str] = None
     ) -> List[Tuple[T, bool]]:
         """Create from bibtext."""
-        bib_database = BibTexParser(common_strings=True, homogenize_fields=True).parse(
-            bibtex
-        )
-
-        if len(files) < len(bib_database.entries):
-            for i in range(len(files), len(bib_database.entries)):
-                files.append("")
-
-        papers = []
-        for entry, file in zip(bib_database.entries, files):
-            if entry["ENTRYTYPE"] not in [
-                "article",
-                "inproceedings",
-                "phdthesis",
-                "inbook",
-                "incollection",
-                "conference",
-            ]:
-                continue
-
-            title = entry["title"].strip() if "title" in entry else ""
-            if title.startswith("{"):
-                title = title[1:]
-            if title.endswith("}"):
-                title = title[:-1]
-
-            authors = []
-            entry["author"] = re.sub(r"\s*\n\s*", " ", entry["author"], flags=re.S)
-            for author in re.compile(r"\s+and\s+").split(entry["author"]):
-                author = author.replace("{", "").replace("}", "")
-                if "," in author:
-                    s = author.split(",")
-                    authors.append({"name": f"{s[1].strip()} {s[0].strip()}"})
-                else:
-                    authors.append({"name": author.strip()})
-
-            journal = {"name": entry["journal"].strip()} if "journal" in entry else None
-
-            volume = entry["volume"].strip() if "volume" in entry else None
-            if "number" in entry:
-                volume = f"{volume}.{entry['number']}" if volume else entry["number"]
-            if "eprint" in entry and not volume:
-                volume = entry["eprint"].strip()
-
-            publisher = (
-                {"name": entry["publisher"].strip()} if "publisher" in entry else None
-            )
-            series = {"name": entry["series"].strip()} if "series" in entry else None
-
-            year = int(entry["year"].strip()) if "year" in entry else None
-            month = entry["month"].strip() if "month" in entry else None
-            day = entry["day"].strip() if "day" in entry else None
-            if year and month and day:
-                try:
-                    date = datetime.datetime.strptime(
-                        f"{day} {month} {year}", "%d %B %Y"
-                    )
-                except ValueError:
-                    date = datetime.datetime.strptime(
-                        f"{day} {month} {year}", "%d %b %Y"
-                    )
-            elif year and month:
-                if month.isdigit():
-                    date = datetime.datetime.strptime(f"{month} {year}", "%m %Y")
-                else:
-                    try:
-                        date = datetime.datetime.strptime(f"{month} {year}", "%B %Y")
-                    except ValueError:
-                        try:
-                            date = datetime.datetime.strptime(
-                                f"{month} {year}", "%b %Y"
-                            )
-                        except ValueError:
-                            date = datetime.datetime(year, 1, 1)
-            elif year:
-                date = datetime.datetime(year, 1, 1)
-
-            pub_date = None
-            if "timestamp" in entry:
-                pub_date = (
-                    datetime.datetime.strptime(
-                        entry["timestamp"].strip(), "%a, %d %b %Y %H:%M:%S %z"
-                    )
-                    .date()
-                    .strftime("%Y-%m-%d")
-                )
-            elif date:
-                pub_date = date.date().strftime("%Y-%m-%d")
-
-            if "link" in entry:
-                url: Optional[Dict] = {"url": entry["link"].strip()}
-            elif "url" in entry:
-                url = {"url": entry["url"].strip()}
-            else:
-                url = None
-
-            doi = None
-            if "doi" in entry:
-                if entry["doi"].startswith("doi:"):
-                    doi = entry["doi"][4:]
-                elif entry["doi"].startswith("http"):
-                    doi = re.sub(r"https?://[^/]+/", "", entry["doi"])
-                else:
-                    doi = entry["doi"]
-
-            papers.append(
-                cls.from_dict(
-                    {
-                        "title": title,
-                        "authors": authors,
-                        "journal": journal,
-                        "volume": volume,
-                        "publisher": publisher,
-                        "series": series,
-                        "publishing_date": pub_date,
-                        "links": [url] if url else None,
-                        "bibtex": bibtex,
-                        "doi": doi,
-                    }
-                )
-            )
+        return [
+            cls._from_bibtex_dict(data, files[i] if i < len(files) else None, bibfile)
+            for i, data in enumerate(parse_papers(bibtex))
+            if data is not None
+        ]
 
-            if file:
-                papers[-1][0].files.add(File.from_dict({"path": file})[0])
-                papers[-1][0].save()
-            if bibfile:
-                papers[-1][0].files.add(File.from_dict({"path": bibfile})[0])
-                papers[-1][0].save()
-        return papers
+    @classmethod
+    def _from_bibtex_dict(
+        cls: Type[T], data: Dict, file: Optional[str], bibfile: Optional[str]
+    ) -> Tuple[T, bool]:
+        """Create from dict parsed from a bibfile and add files."""
+        paper, created = cls.from_dict(data)
+        if file:
+            paper.files.add(File.from_dict({"path": file})[0])
+            paper.save()
+        if bibfile:
+            paper.files.add(File.from_dict({"path": bibfile})[0])
+            paper.save()
+        return paper, created
 
     @classmethod
     def from_dict(cls: Type[T], data: Dict) -> Tuple[T, bool]:
@@ -330,17 +293,14 @@ class Paper(models.Model):
     @classmethod
     def get(cls: Type[T], term: str) -> Optional[T]:
         """Search for given term, return single object."""
-        query_set = cls.search(term)
-        if query_set.count() == 0:
-            return None
-        elif query_set.count() > 1:
-            if term.isdigit():
-                query_set = query_set.filter(pk=term)
-            else:
-                query_set = query_set.filter(Q(title=term) | Q(jv=term))
-            if query_set.count() != 1:
-                return None
-        return query_set[0]
+        obj = lookup.get_one(
+            cls.objects.filter(citation_key=term), term, Q(citation_key=term)
+        )
+        if obj is not None:
+            return obj
+        return lookup.get_one(
+            cls.search(term), term, Q(citation_key=term) | Q(title=term) | Q(jv=term)
+        )
 
     @classmethod
     def search(
@@ -358,12 +318,22 @@ class Paper(models.Model):
         ).all()
         if has_file is not None:
             query_set = query_set.filter(files__isnull=not has_file)
+
+        ids = fts.search(cls, term)
+        if ids is not None:
+            return query_set.filter(
+                Q(pk=term if term.isdigit() else None)
+                | Q(pk__in=ids)
+                | Q(citation_key=term)
+            ).distinct()
+
         return query_set.filter(
             Q(pk=term if term.isdigit() else None)
             | Q(title__icontains=term)
             | Q(authors__in=persons)
             | Q(jv__icontains=term)
             | Q(doi__icontains=term)
+            | Q(citation_key=term)
         ).distinct()
 
     def delete(self: T) -> Tuple[int, Dict[str, int]]:
@@ -464,8 +434,22 @@ class Paper(models.Model):
             raise ValueError("Combination of field and value not allowed.")
         self.save(*args, **kwargs)
 
-    def print(self: T, file: TextIO = sys.stdout):
+    def print(self: T, file: Optional[TextIO] = None):
         """Print instance info."""
+        file = sys.stdout if file is None else file
+        prefetch_related_objects(
+            [self],
+            "authors",
+            "journal",
+            "proceedings",
+            "publisher",
+            "series",
+            "languages",
+            "files",
+            "links",
+            "acquisitions",
+            "reads",
+        )
         stdout.write([_("Field"), _("Value")], "=", [0.33], file=file)
         stdout.write([_("Id"), self.pk], positions=[0.33], file=file)
         stdout.write([_("Title"), self.title], positions=[0.33], file=file)
@@ -594,11 +578,12 @@ class Paper(models.Model):
     def save(self: T, *args, **kwargs):
         """Save in DB."""
         if not self.slug:
-            self.slug = slugify(self.title)
+            self.slug = unique_slug(Paper, self.title, self.pk)
         else:
             orig = Paper.objects.get(pk=self.pk)
             if orig.title != self.title:
-                self.slug = slugify(self.title)
+                self.slug = unique_slug(Paper, self.title, self.pk)
+        self.citation_key = parse_citation_key(self.bibtex)
         super(Paper, self).save(*args, **kwargs)
         for file in self.files.all():
             path = os.path.join("papers", str(self.pk))
@@ -720,6 +705,9 @@ class Proceedings(models.Model):
         File, related_query_name="proceedings", verbose_name=_("Files")
     )
     bibtex = models.TextField(blank=True, null=True, verbose_name=_("BibTex"))
+    citation_key = models.TextField(
+        blank=True, null=True, db_index=True, verbose_name=_("Citation key")
+    )
 
     links = models.ManyToManyField(
         Link, blank=True, related_name="proceedings", verbose_name=_("Links")
@@ -761,9 +749,12 @@ class Proceedings(models.Model):
         cls: Type[T], bibtex: str, files: List[str] = [], bibfile: Optional[str] = None
     ) -> List[Tuple[T, bool]]:
         """Create from bibtext."""
+        from bibtexparser.bparser import BibTexParser
+
         bib_database = BibTexParser(common_strings=True, homogenize_fields=True).parse(
             bibtex
         )
+        entries = dict(split_entries(bibtex))
 
         if len(files) < len(bib_database.entries):
             for i in range(len(files), len(bib_database.entries)):
@@ -851,7 +842,7 @@ class Proceedings(models.Model):
                         "doi": doi,
                         "isbn": isbn,
                         "links": [url] if url else None,
-                        "bibtex": bibtex,
+                        "bibtex": entries.get(entry["ID"]),
                     }
                 )
             )
@@ -921,17 +912,16 @@ class Proceedings(models.Model):
     @classmethod
     def get(cls: Type[T], term: str) -> Optional[T]:
         """Search for given term, return single object."""
-        query_set = cls.search(term)
-        if query_set.count() == 0:
-            return None
-        elif query_set.count() > 1:
-            if term.isdigit():
-                query_set = query_set.filter(pk=term)
-            else:
-                query_set = query_set.filter(Q(title=term) | Q(isbn=term) | Q(doi=term))
-            if query_set.count() != 1:
-                return None
-        return query_set[0]
+        obj = lookup.get_one(
+            cls.objects.filter(citation_key=term), term, Q(citation_key=term)
+        )
+        if obj is not None:
+            return obj
+        return lookup.get_one(
+            cls.search(term),
+            term,
+            Q(citation_key=term) | Q(title=term) | Q(isbn=term) | Q(doi=term),
+        )
 
     @classmethod
     def search(
@@ -945,11 +935,21 @@ class Proceedings(models.Model):
         query_set = cls.objects.all()
         if has_file is not None:
             query_set = query_set.filter(files__isnull=not has_file)
+
+        ids = fts.search(cls, term)
+        if ids is not None:
+            return query_set.filter(
+                Q(pk=term if term.isdigit() else None)
+                | Q(pk__in=ids)
+                | Q(citation_key=term)
+            ).distinct()
+
         return query_set.filter(
             Q(pk=term if term.isdigit() else None)
             | Q(title__icontains=term)
             | Q(isbn__icontains=term)
             | Q(doi__icontains=term)
+            | Q(citation_key=term)
             | Q(editors__in=persons)
         ).distinct()
 
@@ -1039,8 +1039,20 @@ class Proceedings(models.Model):
             raise ValueError("Combination of field and value not allowed.")
         self.save(*args, **kwargs)
 
-    def print(self: T, file: TextIO = sys.stdout):
+    def print(self: T, file: Optional[TextIO] = None):
         """Print instance info."""
+        file = sys.stdout if file is None else file
+        prefetch_related_objects(
+            [self],
+            "editors",
+            "publisher",
+            "series",
+            "languages",
+            "files",
+            "links",
+            "acquisitions",
+            "reads",
+        )
         stdout.write([_("Field"), _("Value")], "=", [0.33], file=file)
         stdout.write([_("Id"), self.pk], positions=[0.33], file=file)
         stdout.write([_("Title"), self.title], positions=[0.33], file=file)
@@ -1155,11 +1167,12 @@ class Proceedings(models.Model):
         if self.isbn and "-" in self.isbn:
             self.isbn = self.isbn.replace("-", "")
         if not self.slug:
-            self.slug = slugify(self.title)
+            self.slug = unique_slug(Proceedings, self.title, self.pk)
         else:
             orig = Proceedings.objects.get(pk=self.pk)
             if orig.title != self.title:
-                self.slug = slugify(self.title)
+                self.slug = unique_slug(Proceedings, self.title, self.pk)
+        self.citation_key = parse_citation_key(self.bibtex)
         super(Proceedings, self).save(*args, **kwargs)
         for file in self.files.all():
             path = os.path.join("proceedings", str(self.pk))
@@ -29,6 +29,7 @@ from io import StringIO
 from journals.models import Journal
 from languages.models import Language
 from links.models import Link
+from papers.bibtex import split_entries
 from papers.models import Paper, Proceedings
 from pathlib import Path
 from persons.models import Person
@@ -226,6 +227,31 @@ class PaperModelTestCase(TestCase):
             (papers[2][0][0].to_dict(), papers[2][0][1]),
         )
 
+    @override_settings(MEDIA_ROOT=Path(mkdtemp()))
+    def test_from_bibfiles(self):
+        paths = []
+        for bibtex in [PAPERS_BIBTEX[0], "\n\n".join(PAPERS_BIBTEX[1:])]:
+            with NamedTemporaryFile(delete=False) as f:
+                f.write(bibtex.encode("utf8"))
+            paths.append(f.name)
+
+        papers = list(Paper.from_bibfiles(paths, chunk_size=2, max_workers=2))
+        self.assertEquals(3, len(papers))
+        for (paper, created), bibtex in zip(papers, PAPERS_BIBTEX):
+            self.assertTrue(created)
+            self.assertEquals(bibtex, paper.bibtex)
+            self.assertEquals(1, paper.files.count())
+        self.assertEquals(
+            ["arXiv1706.02515", "arXiv1805.08671", "nlpinai22"],
+            [paper.citation_key for paper, created in papers],
+        )
+
+        papers = list(Paper.from_bibfiles(paths[1:]))
+        self.assertEquals(2, len(papers))
+        self.assertFalse(papers[0][1])
+        for path in paths:
+            os.remove(path)
+
     @override_settings(MEDIA_ROOT=Path(mkdtemp()))
     def test_from_bibtex(self):
         papers = []
@@ -322,6 +348,29 @@ class PaperModelTestCase(TestCase):
             (papers[2][0].to_dict(), papers[2][1]),
         )
 
+    def test_from_bibtex_entries(self):
+        bibtex = "\n\n".join(
+            ['@string{note = "Note"}', PAPERS_BIBTEX[0], "@comment{nothing}"]
+            + PAPERS_BIBTEX[1:]
+        )
+        self.assertEquals(
+            [
+                ("arXiv1706.02515", PAPERS_BIBTEX[0]),
+                ("arXiv1805.08671", PAPERS_BIBTEX[1]),
+                ("nlpinai22", PAPERS_BIBTEX[2]),
+            ],
+            list(split_entries(bibtex)),
+        )
+
+        papers = Paper.from_bibtex(bibtex)
+        self.assertEquals(3, len(papers))
+        for (paper, created), entry in zip(papers, PAPERS_BIBTEX):
+            self.assertTrue(created)
+            self.assertEquals(entry, paper.bibtex)
+        self.assertEquals("arXiv1706.02515", papers[0][0].citation_key)
+        self.assertEquals("nlpinai22", papers[2][0].citation_key)
+        self.assertEquals(papers[1][0], Paper.get("arXiv1805.08671"))
+
     def test_by_shelf(self):
         paper, created = Paper.from_dict(
             {
@@ -21,15 +21,17 @@
 import sys
 
 from argparse import _SubParsersAction, Namespace
-from bibliothek import stdout
-from bibliothek.utils import lookahead
+from bibliothek import pagination, stdout
+from django.db import models
+from django.db.models import F, Func, OuterRef, Subquery
 from django.utils.translation import gettext_lazy as _
 from links.models import Link
 from persons.models import Person
 from typing import Optional, TextIO
 
 
-def _person(args: Namespace, file: TextIO = sys.stdout):
+def _person(args: Namespace, file: Optional[TextIO] = None):
+    file = sys.stdout if file is None else file
     person: Optional[Person] = None
     if args.subparser == "add":
         person, created = Person.from_dict(
@@ -84,7 +86,12 @@ def _person(args: Namespace, file: TextIO = sys.stdout):
             persons = Person.search(args.search)
         else:
             persons = Person.objects.all()
-        stdout.write(
+        persons = persons.annotate(
+            num_books=_count(Person.books),
+            num_editions=_count(Person.editions),
+            num_papers=_count(Person.papers),
+        )
+        stdout.table_writer(args.format, [0.05, 0.4, 0.6, 0.8], file).write_table(
             [
                 _("Id"),
                 _("Name"),
@@ -92,17 +99,29 @@ def _person(args: Namespace, file: TextIO = sys.stdout):
                 _("Number of editions"),
                 _("Number of papers"),
             ],
-            "=",
-            [0.05, 0.4, 0.6, 0.8],
-            file=file,
+            (
+                [i.id, i.name, i.num_books, i.num_editions, i.num_papers]
+                for i in pagination.iterate(persons, args.limit, args.after)
+            ),
         )
-        for i, has_next in lookahead(persons):
-            stdout.write(
-                [i.id, i.name, i.books.count(), i.editions.count(), i.papers.count()],
-                "_" if has_next else "=",
-                [0.05, 0.4, 0.6, 0.8],
-                file=file,
-            )
+
+
+def _count(descriptor) -> Subquery:
+    """Number of objects related to a person, as correlated subquery.
+
+    Counts the rows of the many-to-many table, instead of joining all counted
+    relations in one query, which would multiply their rows.
+    """
+    through = descriptor.through
+    return Subquery(
+        through.objects.filter(
+            **{descriptor.field.m2m_reverse_field_name(): OuterRef("pk")}
+        )
+        .order_by()
+        .annotate(count=Func(F("pk"), function="COUNT"))
+        .values("count"),
+        output_field=models.IntegerField(),
+    )
 
 
 def add_subparser(parser: _SubParsersAction):
@@ -135,3 +154,4 @@ def add_subparser(parser: _SubParsersAction):
     # person list
     list_parser = subparser.add_parser("list", help=_("List persons"))
     list_parser.add_argument("--search", help=_("Filter persons by term"))
+    pagination.add_arguments(list_parser)
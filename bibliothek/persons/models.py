@@ -18,14 +18,12 @@
 # along with bibliothek.  If not, see <http://www.gnu.org/licenses/>.
 """Persons Django app models."""
 
-import hashlib
 import sys
 
-from bibliothek import stdout
-from bibliothek.utils import concat, lookahead
+from bibliothek import lookup, stdout
+from bibliothek.utils import concat, lookahead, unique_slug
 from django.db import models
-from django.db.models import F, Func, Q
-from django.template.defaultfilters import slugify
+from django.db.models import F, Func, Q, prefetch_related_objects
 from django.utils.translation import gettext_lazy as _
 from links.models import Link
 from typing import Dict, Optional, TextIO, Tuple, Type, TypeVar
@@ -61,17 +59,7 @@ class Person(models.Model):
     @classmethod
     def get(cls: Type[T], term: str) -> Optional[T]:
         """Search for given term, return single object."""
-        query_set = cls.search(term)
-        if query_set.count() == 0:
-            return None
-        elif query_set.count() > 1:
-            if term.isdigit():
-                query_set = query_set.filter(pk=term)
-            else:
-                query_set = query_set.filter(name=term)
-            if query_set.count() != 1:
-                return None
-        return query_set[0]
+        return lookup.get_one(cls.search(term), term, Q(name=term))
 
     @classmethod
     def get_or_create(cls: Type[T], term: str) -> T:
@@ -112,8 +100,18 @@ class Person(models.Model):
                 self.links.add(link)
         self.save(*args, **kwargs)
 
-    def print(self: T, file: TextIO = sys.stdout):
+    def print(self: T, file: Optional[TextIO] = None):
         """Print info."""
+        file = sys.stdout if file is None else file
+        prefetch_related_objects(
+            [self],
+            "links",
+            "books__authors",
+            "books__series",
+            "editions__book__authors",
+            "editions__book__series",
+            "papers__authors",
+        )
         stdout.write([_("Field"), _("Value")], "=", [0.33], file=file)
         stdout.write([_("Id"), self.id], positions=[0.33], file=file)
         stdout.write([_("Name"), self.name], positions=[0.33], file=file)
@@ -168,19 +166,11 @@ class Person(models.Model):
     def save(self: T, *args, **kwargs):
         """Save."""
         if not self.slug:
-            if Person.objects.filter(slug=slugify(self.name)).exists():
-                self.slug = slugify(f"{self.id}_{self.name}")
-            else:
-                self.slug = slugify(self.name)
+            self.slug = unique_slug(Person, self.name, self.pk)
         else:
             orig = Person.objects.get(pk=self.id)
             if orig.name != self.name:
-                if Person.objects.filter(slug=slugify(self.name)).exists():
-                    self.slug = slugify(f"{self.id}_{self.name}")
-                else:
-                    self.slug = slugify(self.name)
-        if self.slug is None or self.slug == "":
-            self.slug = hashlib.sha512(self.name.encode("utf8")).hexdigest()
+                self.slug = unique_slug(Person, self.name, self.pk)
         super(Person, self).save(*args, **kwargs)
 
     def to_dict(self: T) -> Dict:
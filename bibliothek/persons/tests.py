@@ -17,9 +17,13 @@
 # You should have received a copy of the GNU General Public License
 # along with bibliothek.  If not, see <http://www.gnu.org/licenses/>.
 
+from argparse import ArgumentParser
+from books.models import Book, Edition
 from django.test import TestCase
 from io import StringIO
 from links.models import Link
+from papers.models import Paper
+from persons import argparse
 from persons.models import Person
 
 
@@ -185,3 +189,23 @@ class PersonModelTestCase(TestCase):
         person.save()
         self.assertIsNotNone(person.id)
         self.assertEquals("j-t-do", person.slug)
+
+    def test_list(self):
+        book, created = Book.from_dict(
+            {"title": "Cool", "authors": [{"name": "John Do"}, {"name": "Jane Do"}]}
+        )
+        Book.from_dict({"title": "Cold", "authors": [{"name": "John Do"}]})
+        Edition.from_dict({"persons": [{"name": "John Do"}]}, book)
+        Paper.from_dict({"title": "Hot", "authors": [{"name": "John Do"}]})
+
+        parser = ArgumentParser(prog="bibliothek")
+        parser.add_argument("--format", default="table")
+        argparse.add_subparser(parser.add_subparsers(dest="subparser"))
+        with StringIO() as cout:
+            args = parser.parse_args(["--format", "csv", "person", "list"])
+            with self.assertNumQueries(1):
+                args.func(args, cout)
+            self.assertEquals(
+                ["Jane Do,1,0,0", "John Do,2,1,1"],
+                [line.split(",", 1)[1] for line in cout.getvalue().splitlines()[1:]],
+            )
@@ -21,15 +21,16 @@
 import sys
 
 from argparse import _SubParsersAction, Namespace
-from bibliothek import stdout
-from bibliothek.utils import lookahead
+from bibliothek import pagination, stdout
+from django.db.models import Count
 from django.utils.translation import gettext_lazy as _
 from links.models import Link
 from publishers.models import Publisher
 from typing import Optional, TextIO
 
 
-def _publisher(args: Namespace, file: TextIO = sys.stdout):
+def _publisher(args: Namespace, file: Optional[TextIO] = None):
+    file = sys.stdout if file is None else file
     publisher: Optional[Publisher] = None
     if args.subparser == "add":
         publisher, created = Publisher.from_dict(
@@ -87,16 +88,14 @@ def _publisher(args: Namespace, file: TextIO = sys.stdout):
             publishers = Publisher.search(args.search)
         else:
             publishers = Publisher.objects.all()
-        stdout.write(
-            [_("Id"), _("Name"), _("Number of editions")], "=", [0.05, 0.8], file=file
+        publishers = publishers.annotate(num_editions=Count("editions"))
+        stdout.table_writer(args.format, [0.05, 0.8], file).write_table(
+            [_("Id"), _("Name"), _("Number of editions")],
+            (
+                [i.id, i.name, i.num_editions]
+                for i in pagination.iterate(publishers, args.limit, args.after)
+            ),
         )
-        for i, has_next in lookahead(publishers):
-            stdout.write(
-                [i.id, i.name, i.editions.count()],
-                "_" if has_next else "=",
-                [0.05, 0.8],
-                file=file,
-            )
 
 
 def add_subparser(parser: _SubParsersAction):
@@ -129,3 +128,4 @@ def add_subparser(parser: _SubParsersAction):
     # publisher list
     list_parser = subparser.add_parser("list", help=_("List publishers"))
     list_parser.add_argument("--search", help=_("Filter publishers by term"))
+    pagination.add_arguments(list_parser)
@@ -20,11 +20,11 @@
 
 import sys
 
-from bibliothek import stdout
-from bibliothek.utils import concat, lookahead
+from bibliothek import lookup, stdout
+from bibliothek.utils import concat, lookahead, unique_slug
+from django.apps import apps
 from django.db import models
-from django.db.models import F, Func, Q
-from django.template.defaultfilters import slugify
+from django.db.models import F, Func, Prefetch, Q, prefetch_related_objects
 from django.utils.translation import gettext_lazy as _
 from links.models import Link
 from typing import Dict, Optional, TextIO, Tuple, Type, TypeVar
@@ -60,17 +60,7 @@ class Publisher(models.Model):
     @classmethod
     def get(cls: Type[T], term: str) -> Optional[T]:
         """Search for given term, return single object."""
-        query_set = cls.search(term)
-        if query_set.count() == 0:
-            return None
-        elif query_set.count() > 1:
-            if term.isdigit():
-                query_set = query_set.filter(pk=term)
-            else:
-                query_set = query_set.filter(name=term)
-            if query_set.count() != 1:
-                return None
-        return query_set[0]
+        return lookup.get_one(cls.search(term), term, Q(name=term))
 
     @classmethod
     def get_or_create(cls: Type[T], term: str) -> T:
@@ -109,8 +99,19 @@ class Publisher(models.Model):
                 self.links.add(link)
         self.save(*args, **kwargs)
 
-    def print(self: T, file: TextIO = sys.stdout):
+    def print(self: T, file: Optional[TextIO] = None):
         """Print info."""
+        file = sys.stdout if file is None else file
+        prefetch_related_objects(
+            [self],
+            "links",
+            Prefetch(
+                "editions",
+                apps.get_model("books.Edition").objects.order_by("publishing_date"),
+            ),
+            "editions__book__authors",
+            "editions__book__series",
+        )
         stdout.write([_("Field"), _("Value")], "=", [0.33], file=file)
         stdout.write([_("Id"), self.id], positions=[0.33], file=file)
         stdout.write([_("Name"), self.name], positions=[0.33], file=file)
@@ -127,7 +128,7 @@ class Publisher(models.Model):
             stdout.write(f"{_('Links')}", file=file)
 
         if self.editions.count() > 0:
-            editions = self.editions.all().order_by("publishing_date")
+            editions = self.editions.all()
             for (i, edition), has_next in lookahead(enumerate(editions)):
                 stdout.write(
                     [_("Editions") if i == 0 else "", f"{edition.id}: {edition}"],
@@ -141,11 +142,11 @@ class Publisher(models.Model):
     def save(self: T, *args, **kwargs):
         """Save."""
         if not self.slug:
-            self.slug = slugify(self.name)
+            self.slug = unique_slug(Publisher, self.name, self.pk)
         else:
             orig = Publisher.objects.get(pk=self.id)
             if orig.name != self.name:
-                self.slug = slugify(self.name)
+                self.slug = unique_slug(Publisher, self.name, self.pk)
         super(Publisher, self).save(*args, **kwargs)
 
     def to_dict(self: T) -> Dict:
@@ -21,15 +21,16 @@
 import sys
 
 from argparse import _SubParsersAction, Namespace
-from bibliothek import stdout
-from bibliothek.utils import lookahead
+from bibliothek import pagination, stdout
+from django.db.models import Count
 from django.utils.translation import gettext_lazy as _
 from links.models import Link
 from series.models import Series
 from typing import Optional, TextIO
 
 
-def _series(args: Namespace, file: TextIO = sys.stdout):
+def _series(args: Namespace, file: Optional[TextIO] = None):
+    file = sys.stdout if file is None else file
     series: Optional[Series] = None
     if args.subparser == "add":
         series, created = Series.from_dict(
@@ -84,16 +85,14 @@ def _series(args: Namespace, file: TextIO = sys.stdout):
             series = Series.search(args.search)
         else:
             series = Series.objects.all()
-        stdout.write(
-            [_("Id"), _("Name"), _("Number of books")], "=", [0.05, 0.8], file=file
+        series = series.annotate(num_books=Count("books"))
+        stdout.table_writer(args.format, [0.05, 0.8], file).write_table(
+            [_("Id"), _("Name"), _("Number of books")],
+            (
+                [i.id, i.name, i.num_books]
+                for i in pagination.iterate(series, args.limit, args.after)
+            ),
         )
-        for i, has_next in lookahead(series):
-            stdout.write(
-                [i.id, i.name, i.books.count()],
-                "_" if has_next else "=",
-                [0.05, 0.8],
-                file=file,
-            )
 
 
 def add_subparser(parser: _SubParsersAction):
@@ -126,3 +125,4 @@ def add_subparser(parser: _SubParsersAction):
     # series list
     list_parser = subparser.add_parser("list", help=_("List series"))
     list_parser.add_argument("--search", help=_("Filter series by term"))
+    pagination.add_arguments(list_parser)
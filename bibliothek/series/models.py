@@ -20,11 +20,11 @@
 
 import sys
 
-from bibliothek import stdout
-from bibliothek.utils import concat, lookahead
+from bibliothek import lookup, stdout
+from bibliothek.utils import concat, lookahead, search_key, unique_slug
+from django.apps import apps
 from django.db import models
-from django.db.models import F, Func, Q
-from django.template.defaultfilters import slugify
+from django.db.models import F, Func, Prefetch, Q, prefetch_related_objects
 from django.utils.translation import gettext_lazy as _
 from links.models import Link
 from typing import Dict, Optional, TextIO, Tuple, Type, TypeVar
@@ -60,17 +60,7 @@ class Series(models.Model):
     @classmethod
     def get(cls: Type[T], term: str) -> Optional[T]:
         """Search for given term, return single object."""
-        query_set = cls.search(term)
-        if query_set.count() == 0:
-            return None
-        elif query_set.count() > 1:
-            if term.isdigit():
-                query_set = query_set.filter(pk=term)
-            else:
-                query_set = query_set.filter(name=term)
-            if query_set.count() != 1:
-                return None
-        return query_set[0]
+        return lookup.get_one(cls.search(term), term, Q(name=term))
 
     @classmethod
     def get_or_create(cls: Type[T], term: str) -> T:
@@ -93,6 +83,7 @@ class Series(models.Model):
         for link in self.links.all():
             if link.num_related("series") == 0:
                 deleted = concat(deleted, link.delete())
+        self.books.update(search_key=None)
         return concat(deleted, super(Series, self).delete())
 
     def edit(self: T, field: str, value: str, *args, **kwargs):
@@ -119,8 +110,15 @@ class Series(models.Model):
             ]
         )
 
-    def print(self: T, file: TextIO = sys.stdout):
+    def print(self: T, file: Optional[TextIO] = None):
         """Print instance info."""
+        file = sys.stdout if file is None else file
+        prefetch_related_objects(
+            [self],
+            "links",
+            Prefetch("books", apps.get_model("books.Book").objects.order_by("volume")),
+            "books__authors",
+        )
         stdout.write([_("Field"), _("Value")], "=", [0.33], file=file)
         stdout.write([_("Id"), self.id], positions=[0.33], file=file)
         stdout.write([_("Name"), self.name], positions=[0.33], file=file)
@@ -137,9 +135,7 @@ class Series(models.Model):
             stdout.write(f"{_('Links')}", file=file)
 
         if self.books.count() > 0:
-            for (i, book), has_next in lookahead(
-                enumerate(self.books.all().order_by("volume"))
-            ):
+            for (i, book), has_next in lookahead(enumerate(self.books.all())):
                 stdout.write(
                     [_("Books") if i == 0 else "", f"{book.id}: {book}"],
                     "" if has_next else "_",
@@ -151,13 +147,20 @@ class Series(models.Model):
 
     def save(self: T, *args, **kwargs):
         """Save in DB."""
+        renamed = False
         if not self.slug:
-            self.slug = slugify(self.name)
+            self.slug = unique_slug(Series, self.name, self.pk)
         else:
             orig = Series.objects.get(pk=self.id)
             if orig.name != self.name:
-                self.slug = slugify(self.name)
+                self.slug = unique_slug(Series, self.name, self.pk)
+                renamed = True
         super(Series, self).save(*args, **kwargs)
+        if renamed:
+            books = list(self.books.all())
+            for book in books:
+                book.search_key = search_key(self.name, f"{book.volume:g}")
+            self.books.bulk_update(books, ["search_key"])
 
     def to_dict(self: T) -> Dict:
         """Convert to dict."""
@@ -21,33 +21,25 @@
 import sys
 
 from argparse import _SubParsersAction, Namespace
-from bibliothek import stdout
+from bibliothek import lookup, stdout
 from bibliothek.argparse import valid_date
-from books.models import Edition
 from django.utils.translation import gettext_lazy as _
-from magazines.models import Issue
-from papers.models import Paper
 from shelves.models import Acquisition, Read
 from typing import Optional, TextIO
 
 
-def _acquisition(args: Namespace, file: TextIO = sys.stdout):
+def _acquisition(args: Namespace, file: Optional[TextIO] = None):
+    file = sys.stdout if file is None else file
     acquisition: Optional[Acquisition] = None
     if args.subparser == "add":
-        edition = Edition.get(args.obj)
-        paper = Paper.get(args.obj)
-        issue = Issue.get(args.obj)
+        objs = lookup.resolve(args.obj)
 
         obj = None
-        if edition is None and paper is None and issue is None:
+        if len(objs) == 0:
             stdout.write(_("No edition, issue or paper found."), "", file=file)
             return
-        elif edition is not None and paper is None and issue is None:
-            obj = edition
-        elif edition is None and paper is not None and issue is None:
-            obj = paper
-        elif edition is None and paper is None and issue is not None:
-            obj = issue
+        elif len(objs) == 1:
+            obj = objs[0]
 
         if obj:
             acquisition, created = Acquisition.from_dict(
@@ -98,23 +90,18 @@ def _acquisition(args: Namespace, file: TextIO = sys.stdout):
             stdout.write(_("No acquisition found."), "", file=file)
 
 
-def _read(args: Namespace, file: TextIO = sys.stdout):
+def _read(args: Namespace, file: Optional[TextIO] = None):
+    file = sys.stdout if file is None else file
     read: Optional[Acquisition] = None
     if args.subparser == "add":
-        edition = Edition.get(args.obj)
-        paper = Paper.get(args.obj)
-        issue = Issue.get(args.obj)
+        objs = lookup.resolve(args.obj)
 
         obj = None
-        if edition is None and paper is None and issue is None:
+        if len(objs) == 0:
             stdout.write(_("No edition, issue or paper found."), "", file=file)
             return
-        elif edition is not None and paper is None and issue is None:
-            obj = edition
-        elif edition is None and paper is not None and issue is None:
-            obj = paper
-        elif edition is None and paper is None and issue is not None:
-            obj = issue
+        elif len(objs) == 1:
+            obj = objs[0]
 
         if obj:
             read, created = Read.from_dict(
@@ -0,0 +1,27 @@
+# Generated by Django 4.2.30 on 2026-10-18 20:07
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("shelves", "0003_alter_acquisition_updated_at_alter_read_updated_at"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="acquisition",
+            index=models.Index(
+                fields=["content_type", "object_id"],
+                name="shelves_acq_content_56d629_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="read",
+            index=models.Index(
+                fields=["content_type", "object_id"],
+                name="shelves_rea_content_bd6fa4_idx",
+            ),
+        ),
+    ]
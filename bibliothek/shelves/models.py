@@ -21,7 +21,9 @@
 import datetime
 import sys
 
-from bibliothek import stdout
+from bibliothek import fts, lookup, stdout
+from bibliothek.utils import search_key_filter
+from django.apps import apps
 from django.contrib.contenttypes.fields import GenericForeignKey
 from django.contrib.contenttypes.models import ContentType
 from django.db import models
@@ -31,13 +33,34 @@ from django.utils.translation import gettext_lazy as _
 from typing import Dict, Optional, TextIO, Tuple, Type, TypeVar, Union
 
 
+def _search_fts(term: str) -> Optional[Q]:
+    """Search editions, issues and papers in the full-text index.
+
+    Returns a filter for the acquisitions or reads of the matching editions, issues
+    and papers, None if the full-text index can not be used.
+    """
+    q = Q()
+    for model in [
+        apps.get_model("books.Edition"),
+        apps.get_model("magazines.Issue"),
+        apps.get_model("papers.Paper"),
+    ]:
+        ids = fts.search(model, term)
+        if ids is None:
+            return None
+        q |= Q(content_type=ContentType.objects.get_for_model(model), object_id__in=ids)
+    return q
+
+
 class Acquisition(models.Model):
     """Acquisition Model."""
 
     T = TypeVar("T", bound="Acquisition", covariant=True)
 
     created_at = models.DateTimeField(auto_now_add=True, verbose_name=_("Created at"))
-    updated_at = models.DateTimeField(auto_now=True, verbose_name=_("Updated at"))
+    updated_at = models.DateTimeField(
+        auto_now=True, db_index=True, verbose_name=_("Updated at")
+    )
 
     date = models.DateField(blank=True, null=True, verbose_name=_("Date"))
     price = models.FloatField(default=0, verbose_name=_("Price"))
@@ -74,24 +97,16 @@ class Acquisition(models.Model):
         **kwargs,
     ) -> Optional[T]:
         """Search for given term, return single object."""
-        query_set = cls.search(term, **kwargs)
-        if query_set.count() == 0:
-            return None
-        elif query_set.count() > 1:
-            if term.isdigit():
-                query_set = query_set.filter(pk=term)
-            else:
-                query_set = query_set.filter(
-                    Q(ni=term)
-                    | Q(jv=term)
-                    | Q(editions__isbn=term)
-                    | Q(editions__book__title=term)
-                    | Q(papers__title=term)
-                    | Q(editions__alternate_title=term)
-                )
-            if query_set.count() != 1:
-                return None
-        return query_set[0]
+        return lookup.get_one(
+            cls.search(term, **kwargs),
+            term,
+            Q(ni=term)
+            | Q(jv=term)
+            | Q(editions__isbn=term)
+            | Q(editions__book__title=term)
+            | Q(papers__title=term)
+            | Q(editions__alternate_title=term),
+        )
 
     @classmethod
     def search(
@@ -104,33 +119,40 @@ class Acquisition(models.Model):
             return cls.objects.filter(**kwargs).filter(
                 pk=term if term.isdigit() else None
             )
-        return (
-            cls.objects.annotate(
-                jv=Concat(
-                    "papers__journal__name",
-                    Value(" "),
-                    "papers__volume",
-                    output_field=models.TextField(),
-                ),
-                ni=Concat(
-                    "issues__magazine__name",
-                    Value(" "),
-                    "issues__issue",
-                    output_field=models.TextField(),
-                ),
-            )
-            .filter(
-                Q(pk=term if term.isdigit() else None)
-                | Q(editions__alternate_title__icontains=term)
-                | Q(editions__isbn__icontains=term)
-                | Q(jv__icontains=term)
-                | Q(ni__iregex=term.replace(" ", ".*?"))
-                | Q(papers__title__icontains=term)
-                | Q(editions__book__title__icontains=term)
-            )
-            .distinct()
+
+        query_set = cls.objects.annotate(
+            jv=Concat(
+                "papers__journal__name",
+                Value(" "),
+                "papers__volume",
+                output_field=models.TextField(),
+            ),
+            ni=Concat(
+                "issues__magazine__name",
+                Value(" "),
+                "issues__issue",
+                output_field=models.TextField(),
+            ),
         )
 
+        objs = _search_fts(term)
+        if objs is not None:
+            return query_set.filter(
+                Q(pk=term if term.isdigit() else None)
+                | objs
+                | search_key_filter("issues__search_key", term)
+            ).distinct()
+
+        return query_set.filter(
+            Q(pk=term if term.isdigit() else None)
+            | Q(editions__alternate_title__icontains=term)
+            | Q(editions__isbn__icontains=term)
+            | Q(jv__icontains=term)
+            | search_key_filter("issues__search_key", term, prefix=False)
+            | Q(papers__title__icontains=term)
+            | Q(editions__book__title__icontains=term)
+        ).distinct()
+
     def edit(self: T, field: str, value: Union[float, datetime.date], *args, **kwargs):
         """Change field by given value."""
         assert field in ["date", "price"]
@@ -141,8 +163,9 @@ class Acquisition(models.Model):
             self.price = value
         self.save(*args, **kwargs)
 
-    def print(self: T, file: TextIO = sys.stdout):
+    def print(self: T, file: Optional[TextIO] = None):
         """Print instance info."""
+        file = sys.stdout if file is None else file
         stdout.write([_("Field"), _("Value")], "=", [0.33], file=file)
         stdout.write([_("Id"), self.id], positions=[0.33], file=file)
         stdout.write(
@@ -167,6 +190,7 @@ class Acquisition(models.Model):
     class Meta:
         """Meta."""
 
+        indexes = (models.Index(fields=("content_type", "object_id")),)
         ordering = ("date",)
         verbose_name = _("Acquisition")
         verbose_name_plural = _("Acquisitions")
@@ -178,7 +202,9 @@ class Read(models.Model):
     T = TypeVar("T", bound="Read", covariant=True)
 
     created_at = models.DateTimeField(auto_now_add=True, verbose_name=_("Created at"))
-    updated_at = models.DateTimeField(auto_now=True, verbose_name=_("Updated at"))
+    updated_at = models.DateTimeField(
+        auto_now=True, db_index=True, verbose_name=_("Updated at")
+    )
 
     started = models.DateField(blank=True, null=True, verbose_name=_("Started"))
     finished = models.DateField(blank=True, null=True, verbose_name=_("Finished"))
@@ -220,24 +246,16 @@ class Read(models.Model):
     @classmethod
     def get(cls: Type[T], term: str, **kwargs) -> Optional[T]:
         """Search for given term, return single object."""
-        query_set = cls.search(term, **kwargs)
-        if query_set.count() == 0:
-            return None
-        elif query_set.count() > 1:
-            if term.isdigit():
-                query_set = query_set.filter(pk=term)
-            else:
-                query_set = query_set.filter(
-                    Q(editions__alternate_title=term)
-                    | Q(editions__isbn=term)
-                    | Q(ni=term)
-                    | Q(editions__book__title=term)
-                    | Q(jv=term)
-                    | Q(papers__title=term)
-                )
-            if query_set.count() != 1:
-                return None
-        return query_set[0]
+        return lookup.get_one(
+            cls.search(term, **kwargs),
+            term,
+            Q(editions__alternate_title=term)
+            | Q(editions__isbn=term)
+            | Q(ni=term)
+            | Q(editions__book__title=term)
+            | Q(jv=term)
+            | Q(papers__title=term),
+        )
 
     @classmethod
     def search(cls: Type[T], term: str, **kwargs) -> models.query.QuerySet[T]:
@@ -246,33 +264,40 @@ class Read(models.Model):
             return cls.objects.filter(**kwargs).filter(
                 pk=term if term.isdigit() else None
             )
-        return (
-            cls.objects.annotate(
-                jv=Concat(
-                    "papers__journal__name",
-                    Value(" "),
-                    "papers__volume",
-                    output_field=models.TextField(),
-                ),
-                ni=Concat(
-                    "issues__magazine__name",
-                    Value(" "),
-                    "issues__issue",
-                    output_field=models.TextField(),
-                ),
-            )
-            .filter(
-                Q(pk=term if term.isdigit() else None)
-                | Q(editions__alternate_title__icontains=term)
-                | Q(editions__isbn__icontains=term)
-                | Q(jv__icontains=term)
-                | Q(ni__iregex=term.replace(" ", ".*?"))
-                | Q(papers__title__icontains=term)
-                | Q(editions__book__title__icontains=term)
-            )
-            .distinct()
+
+        query_set = cls.objects.annotate(
+            jv=Concat(
+                "papers__journal__name",
+                Value(" "),
+                "papers__volume",
+                output_field=models.TextField(),
+            ),
+            ni=Concat(
+                "issues__magazine__name",
+                Value(" "),
+                "issues__issue",
+                output_field=models.TextField(),
+            ),
         )
 
+        objs = _search_fts(term)
+        if objs is not None:
+            return query_set.filter(
+                Q(pk=term if term.isdigit() else None)
+                | objs
+                | search_key_filter("issues__search_key", term)
+            ).distinct()
+
+        return query_set.filter(
+            Q(pk=term if term.isdigit() else None)
+            | Q(editions__alternate_title__icontains=term)
+            | Q(editions__isbn__icontains=term)
+            | Q(jv__icontains=term)
+            | search_key_filter("issues__search_key", term, prefix=False)
+            | Q(papers__title__icontains=term)
+            | Q(editions__book__title__icontains=term)
+        ).distinct()
+
     def edit(self: T, field: str, value: datetime.date, *args, **kwargs):
         """Change field by given value."""
         assert field in ["started", "finished"]
@@ -283,8 +308,9 @@ class Read(models.Model):
             self.finished = value
         self.save(*args, **kwargs)
 
-    def print(self: T, file: TextIO = sys.stdout):
+    def print(self: T, file: Optional[TextIO] = None):
         """Print instance info."""
+        file = sys.stdout if file is None else file
         stdout.write([_("Field"), _("Value")], "=", [0.33], file=file)
         stdout.write([_("Id"), self.id], positions=[0.33], file=file)
         stdout.write(
@@ -309,6 +335,7 @@ class Read(models.Model):
     class Meta:
         """Meta."""
 
+        indexes = (models.Index(fields=("content_type", "object_id")),)
         ordering = ("started", "finished")
         verbose_name = _("Read")
         verbose_name_plural = _("Reads")